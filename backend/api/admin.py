@@ -4,6 +4,8 @@ from .models import (
     Funding,
     FundingTask,
     ProjectFunding,
+    ProjectFundingCleanup,
+    ProjectStats,
     Task,
     TaskScope,
     TaskAssignment,
@@ -252,3 +254,25 @@ class TaskAssignmentAdmin(admin.ModelAdmin):
         "user__first_name",
         "user__last_name",
     )
+
+
+@admin.register(ProjectFundingCleanup)
+class ProjectFundingCleanupAdmin(admin.ModelAdmin):
+    list_display = ("id", "label", "status", "deleted", "total", "created_at")
+    list_filter = ("status",)
+    readonly_fields = ("project_funding", "total", "deleted", "error", "finished_at")
+
+
+@admin.register(ProjectStats)
+class ProjectStatsAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "project",
+        "project_funding",
+        "todo_count",
+        "doing_count",
+        "done_count",
+        "overdue_count",
+        "updated_at",
+    )
+    readonly_fields = ("updated_at",)
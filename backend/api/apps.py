@@ -7,3 +7,8 @@ class ApiConfig(AppConfig):
 
     def ready(self):
         from . import signals
+        from .events import check_broker
+        from .response_cache import check_backend
+
+        check_backend()
+        check_broker()
@@ -0,0 +1,110 @@
+"""Hurtowe zmiany przypisań: jeden DELETE i jeden INSERT ON CONFLICT na wywołanie."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Q
+
+from . import events, stats, workload
+from .conditional import touch_tasks
+from .models import TaskAssignment
+from .response_cache import bump_generation
+
+ASSIGN_BATCH_SIZE = 1000
+
+
+def add_assignees(task_ids, user_ids, assigned_by=None):
+    """Przypisuje każdego użytkownika do każdego taska (istniejące pary zostają)."""
+    rows = [
+        TaskAssignment(task_id=task_id, user_id=user_id, assigned_by=assigned_by)
+        for task_id in task_ids
+        for user_id in user_ids
+    ]
+    if rows:
+        with events.batch(task_ids):
+            before = workload.collect(task_ids)
+            TaskAssignment.objects.bulk_create(
+                rows, batch_size=ASSIGN_BATCH_SIZE, ignore_conflicts=True
+            )
+            (workload.collect(task_ids) - before).apply()
+            bump_generation(TaskAssignment)
+            touch_tasks(task_ids)
+
+
+def remove_assignees(task_ids, user_ids) -> int:
+    """Odpina użytkowników od tasków; zwraca liczbę usuniętych wierszy."""
+    if not task_ids or not user_ids:
+        return 0
+    with events.batch(task_ids):
+        deleted = _delete_pairs(Q(task_id__in=task_ids, user_id__in=user_ids))
+        if deleted:
+            bump_generation(TaskAssignment)
+            touch_tasks(task_ids)
+    return deleted
+
+
+def _delete_pairs(condition) -> int:
+    """Jeden DELETE bez sygnałów; wkład usuniętych par schodzi jedną deltą."""
+    with transaction.atomic(savepoint=False):
+        pairs = TaskAssignment.objects.filter(condition)
+        rows = list(
+            pairs.select_for_update(of=("self",)).values(
+                "task_id", *workload.ASSIGNMENT_FIELDS
+            )
+        )
+        if not rows:
+            return 0
+        pairs._raw_delete(DEFAULT_DB_ALIAS)
+        (-workload.delta_of(rows)).apply()
+        worked = defaultdict(Decimal)
+        for row in rows:
+            if row["worked_hours"]:
+                worked[row["task_id"]] += row["worked_hours"]
+        unworked = stats.StatsDelta()
+        for task_id, targets in stats.targets_by_task(worked).items():
+            unworked.add_worked(worked[task_id], targets, -1)
+        unworked.apply()
+    return len(rows)
+
+
+def sync_assignees(assignees_by_task, assigned_by=None):
+    """Ustawia dokładnie podanych przypisanych; `None` pomija taska, `[]` czyści."""
+    targets = {
+        task_id: frozenset(user_ids)
+        for task_id, user_ids in assignees_by_task.items()
+        if user_ids is not None
+    }
+    if not targets:
+        return
+
+    # Tasks that end up with the same user set share one DELETE condition.
+    tasks_by_users = defaultdict(list)
+    for task_id, user_ids in targets.items():
+        tasks_by_users[user_ids].append(task_id)
+
+    stale = Q(pk__in=[])
+    for user_ids, task_ids in tasks_by_users.items():
+        condition = Q(task_id__in=task_ids)
+        if user_ids:
+            condition &= ~Q(user_id__in=user_ids)
+        stale |= condition
+
+    rows = [
+        TaskAssignment(task_id=task_id, user_id=user_id, assigned_by=assigned_by)
+        for task_id, user_ids in targets.items()
+        for user_id in sorted(user_ids)
+    ]
+    with events.batch(targets):
+        deleted = _delete_pairs(stale)
+        if rows:
+            before = workload.collect(targets)
+            TaskAssignment.objects.bulk_create(
+                rows, batch_size=ASSIGN_BATCH_SIZE, ignore_conflicts=True
+            )
+            (workload.collect(targets) - before).apply()
+        if deleted or rows:
+            bump_generation(TaskAssignment)
+        touch_tasks(targets)
@@ -0,0 +1,133 @@
+"""Asynchronowe (ASGI) wersje najczęściej czytanych endpointów, pod `/api/async/`."""
+
+from __future__ import annotations
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse, JsonResponse
+from django.views import View
+from django.views.decorators.http import require_safe
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from .models import ProjectStats
+from .pagination import BoardColumnPagination, KeysetPagination, UserPagination
+from .stats import get_stats
+from .timeline import ato_rows, scheduled_tasks
+from .views import ProjectViewSet, TaskViewSet, UserViewSet
+
+
+@require_safe
+async def health(request):
+    return JsonResponse({"status": "ok"})
+
+
+class AsyncViewsetView(View):
+    """Akcja odczytu `viewset_class` z asynchronicznym pobraniem strony."""
+
+    http_method_names = ["get", "head", "options"]
+    viewset_class = None
+    action = None
+
+    def prepare(self, view):
+        pass
+
+    async def fetch(self, view):
+        raise NotImplementedError
+
+    async def get(self, request, **kwargs):
+        view, response = await sync_to_async(self._start)(request, kwargs)
+        if response is None:
+            try:
+                response = await self.fetch(view)
+            except Exception as exc:
+                response = view.handle_exception(exc)
+        response = view.finalize_response(view.request, response)
+        response.render()
+        # Plain HttpResponse: Django would render a TemplateResponse again in
+        # a thread.
+        plain = HttpResponse(response.content, status=response.status_code)
+        for header, value in response.items():
+            plain[header] = value
+        return plain
+
+    def _start(self, request, kwargs):
+        view = self.viewset_class(
+            action_map={"get": self.action, "head": self.action},
+            renderer_classes=[JSONRenderer],
+        )
+        view.args, view.kwargs = (), kwargs
+        view.request = view.initialize_request(request, **kwargs)
+        view.headers = view.default_response_headers
+        try:
+            view.initial(view.request, **kwargs)
+            self.prepare(view)
+        except Exception as exc:
+            return view, view.handle_exception(exc)
+        return view, None
+
+
+class AsyncListView(AsyncViewsetView):
+    action = "list"
+    pagination_class = KeysetPagination
+
+    def prepare(self, view):
+        self.queryset = view.filter_queryset(view.get_queryset())
+
+    async def fetch(self, view):
+        paginator = self.pagination_class()
+        page = await paginator.apaginate_queryset(self.queryset, view.request, view)
+        serializer = view.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+
+
+class TaskListView(AsyncListView):
+    viewset_class = TaskViewSet
+
+
+class UserListView(AsyncListView):
+    viewset_class = UserViewSet
+    pagination_class = UserPagination
+
+
+class ProjectBoardView(AsyncViewsetView):
+    viewset_class = ProjectViewSet
+    action = "board"
+
+    def prepare(self, view):
+        self.project = view.get_object()
+        self.statuses = view.board_statuses(view.request)
+
+    async def fetch(self, view):
+        request = view.request
+        # Status counters are kept current on every write; only the overdue
+        # counter (not shown here) goes stale, so a missing row is the only
+        # case for the sync get_stats.
+        counts = await ProjectStats.objects.filter(project_id=self.project.pk).afirst()
+        if counts is None:
+            counts = await sync_to_async(get_stats)(project=self.project)
+        columns = []
+        for status_value, label in self.statuses:
+            paginator = BoardColumnPagination(status_value)
+            cards = await paginator.apaginate_queryset(
+                view.board_column_queryset(self.project, status_value), request
+            )
+            columns.append(
+                view.board_column(paginator, status_value, label, counts, cards)
+            )
+        return Response(view.board_data(request, self.project, columns))
+
+
+class ProjectTimelineView(AsyncViewsetView):
+    viewset_class = ProjectViewSet
+    action = "timeline"
+
+    def prepare(self, view):
+        self.project = view.get_object()
+        self.window = view.timeline_window(view.request)
+
+    async def fetch(self, view):
+        start, end = self.window
+        rows = await ato_rows(scheduled_tasks(self.project.pk, start, end))
+        return Response(
+            view.timeline_data(view.request, self.project, start, end, rows)
+        )
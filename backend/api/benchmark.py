@@ -0,0 +1,357 @@
+"""Pomiar endpointów (zapytania, p50/p95, pamięć) i porównanie z bazową linią JSON."""
+
+from __future__ import annotations
+
+import json
+import math
+import tracemalloc
+from dataclasses import dataclass
+from datetime import timedelta
+from time import perf_counter
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .models import (
+    Funding,
+    FundingTask,
+    Project,
+    ProjectFunding,
+    ProjectFundingCleanup,
+    Task,
+    TaskAssignment,
+    UserProfile,
+)
+from .models.user_profile import UserRole
+from .synthetic import SyntheticDataGenerator
+
+SCALES = {
+    "xs": dict(projects=6, tasks_per_project=10, users=8, fundings=3),
+    "s": dict(projects=50, tasks_per_project=40, users=50, fundings=10),
+    "m": dict(projects=500, tasks_per_project=100, users=300, fundings=50),
+    "l": dict(projects=2000, tasks_per_project=250, users=1000, fundings=200),
+}
+SEED = 1234
+
+LATENCY_SLACK_MS = 3.0
+MEMORY_SLACK_KIB = 64
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    url: str
+    method: str = "get"
+    # Callable building the request body from the context.
+    data: object = None
+
+
+def _task_payload(ctx):
+    return {
+        "title": "Benchmark task",
+        "project": ctx["project"],
+        "priority": 2,
+        "assignee_ids": ctx["assignees"],
+    }
+
+
+SCENARIOS = (
+    # tasks
+    Scenario("tasks-list", "/api/tasks/"),
+    Scenario("tasks-list-cursor", "/api/tasks/?pagination=cursor"),
+    Scenario("tasks-filter-project", "/api/tasks/?project={project}"),
+    Scenario(
+        "tasks-filter-funding-status", "/api/tasks/?funding={funding}&status=todo"
+    ),
+    Scenario(
+        "tasks-filter-project-funding", "/api/tasks/?project_funding={project_funding}"
+    ),
+    Scenario("tasks-search", "/api/tasks/?search=raport"),
+    Scenario("tasks-ordering-due", "/api/tasks/?ordering=due_date"),
+    Scenario("tasks-ordering-priority", "/api/tasks/?ordering=-priority"),
+    Scenario("tasks-sparse", "/api/tasks/?fields=id,title,status"),
+    Scenario("tasks-retrieve", "/api/tasks/{task}/"),
+    Scenario("tasks-create", "/api/tasks/", "post", _task_payload),
+    Scenario(
+        "tasks-update",
+        "/api/tasks/{task}/",
+        "patch",
+        lambda ctx: {"title": "Renamed", "assignee_ids": ctx["assignees"]},
+    ),
+    Scenario(
+        "tasks-bulk",
+        "/api/tasks/bulk/",
+        "post",
+        lambda ctx: {
+            "create": [_task_payload(ctx) for _ in range(10)],
+            "update": [{"id": ctx["task"], "status": "doing"}],
+        },
+    ),
+    # projects
+    Scenario("projects-list", "/api/projects/"),
+    Scenario("projects-search", "/api/projects/?search=raport"),
+    Scenario("projects-ordering-name", "/api/projects/?ordering=name"),
+    Scenario("projects-retrieve", "/api/projects/{project}/"),
+    Scenario("projects-stats", "/api/projects/{project}/stats/"),
+    Scenario("projects-board", "/api/projects/{project}/board/"),
+    Scenario(
+        "projects-timeline",
+        "/api/projects/{project}/timeline/?from={today}&to={horizon}",
+    ),
+    Scenario(
+        "projects-timeline-unscheduled",
+        "/api/projects/{project}/timeline/unscheduled/",
+    ),
+    Scenario(
+        "projects-create", "/api/projects/", "post", lambda ctx: {"name": "Benchmark"}
+    ),
+    Scenario(
+        "projects-update",
+        "/api/projects/{project}/",
+        "patch",
+        lambda ctx: {"description": "Benchmark"},
+    ),
+    # fundings
+    Scenario("fundings-list", "/api/fundings/"),
+    Scenario("fundings-search", "/api/fundings/?search=grant"),
+    Scenario("fundings-retrieve", "/api/fundings/{funding}/"),
+    Scenario(
+        "fundings-create", "/api/fundings/", "post", lambda ctx: {"name": "Benchmark"}
+    ),
+    Scenario("funding-tasks-list", "/api/funding-tasks/?ordering=default_priority"),
+    Scenario("funding-tasks-retrieve", "/api/funding-tasks/{funding_task}/"),
+    # project fundings
+    Scenario("project-fundings-list", "/api/project-fundings/"),
+    Scenario("project-fundings-filter", "/api/project-fundings/?project={project}"),
+    Scenario("project-fundings-retrieve", "/api/project-fundings/{project_funding}/"),
+    Scenario(
+        "project-fundings-stats", "/api/project-fundings/{project_funding}/stats/"
+    ),
+    Scenario(
+        "project-fundings-create",
+        "/api/project-fundings/",
+        "post",
+        lambda ctx: {"project": ctx["spare_project"], "funding": ctx["funding"]},
+    ),
+    Scenario("project-funding-cleanups-list", "/api/project-funding-cleanups/"),
+    # assignments
+    Scenario("task-assignments-list", "/api/task-assignments/"),
+    Scenario("task-assignments-filter", "/api/task-assignments/?user={user}"),
+    Scenario(
+        "task-assignments-bulk",
+        "/api/task-assignments/bulk/",
+        "post",
+        lambda ctx: {
+            "tasks": ctx["project_tasks"],
+            "users": ctx["assignees"],
+            "mode": "add",
+        },
+    ),
+    Scenario("task-imports-list", "/api/task-imports/"),
+    # users
+    Scenario("users-list", "/api/users/"),
+    Scenario("users-retrieve", "/api/users/{user}/"),
+    Scenario("users-tasks", "/api/users/{user}/tasks/"),
+    Scenario("users-tasks-filter", "/api/users/{user}/tasks/?status=todo,doing"),
+    # async (ASGI) read path, api.async_views
+    Scenario("async-health", "/api/async/health/"),
+    Scenario("async-tasks-list", "/api/async/tasks/"),
+    Scenario("async-projects-board", "/api/async/projects/{project}/board/"),
+    Scenario(
+        "async-projects-timeline",
+        "/api/async/projects/{project}/timeline/?from={today}&to={horizon}",
+    ),
+    Scenario("async-users-list", "/api/async/users/"),
+)
+
+
+def percentile(values, fraction):
+    """Percentyl metodą najbliższej rangi z niepustej listy."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def seed(scale, seed=SEED):
+    """Generuje jedną skalę plus obiekty potrzebne scenariuszom."""
+    SyntheticDataGenerator(**SCALES[scale], seed=seed).run()
+    funding = Funding.objects.order_by("pk").first()
+    FundingTask.objects.bulk_create(
+        [
+            FundingTask(funding=funding, title=f"Raport {i}", default_due_days=30)
+            for i in range(3)
+        ]
+    )
+
+
+def benchmark_user():
+    User = get_user_model()
+    user, _ = User.objects.get_or_create(
+        username="benchmark", defaults={"is_staff": True, "is_superuser": True}
+    )
+    UserProfile.objects.get_or_create(user=user, defaults={"role": UserRole.ADMIN})
+    return user
+
+
+def scenario_context():
+    """Id podstawiane do scenariuszy; celem jest największy projekt."""
+    today = timezone.localdate()
+    project = (
+        Project.objects.annotate(size=Count("effective_tasks"))
+        .order_by("-size", "pk")
+        .first()
+    )
+    context = {
+        "today": today,
+        "horizon": today + timedelta(days=90),
+        "project": project.pk,
+        "spare_project": Project.objects.create(name="Benchmark spare").pk,
+        "project_tasks": list(
+            Task.objects.filter(effective_project=project)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:20]
+        ),
+    }
+    context["task"] = context["project_tasks"][0]
+    assigned = (
+        TaskAssignment.objects.values("user_id")
+        .annotate(n=Count("pk"))
+        .order_by("-n", "user_id")
+    )
+    context["user"] = assigned[0]["user_id"]
+    context["assignees"] = [row["user_id"] for row in assigned[:3]]
+    for name, queryset in (
+        ("funding", Funding.objects.order_by("pk")),
+        ("funding_task", FundingTask.objects.order_by("pk")),
+        ("project_funding", ProjectFunding.objects.order_by("pk")),
+        ("cleanup", ProjectFundingCleanup.objects.order_by("pk")),
+    ):
+        pk = queryset.values_list("pk", flat=True).first()
+        if pk is not None:
+            context[name] = pk
+    return context
+
+
+def _request(client, scenario, url, body):
+    send = getattr(client, scenario.method)
+    if body is None:
+        return send(url)
+    return send(url, body, format="json")
+
+
+def _rolled_back(client, scenario, url, body, capture=False):
+    with transaction.atomic():
+        if capture:
+            with CaptureQueriesContext(connection) as ctx:
+                response = _request(client, scenario, url, body)
+            queries = len(ctx.captured_queries)
+        else:
+            response, queries = _request(client, scenario, url, body), None
+        transaction.set_rollback(True)
+    return response, queries
+
+
+def measure(client, scenario, context, repeat):
+    """Uruchamia jeden scenariusz; `None`, gdy brakuje potrzebnego id."""
+    try:
+        url = scenario.url.format(**context)
+    except KeyError:
+        return None
+    body = scenario.data(context) if scenario.data else None
+
+    # Warm-up: lazily built serializers, URL resolver and plan caches.
+    _rolled_back(client, scenario, url, body)
+
+    tracemalloc.start()
+    try:
+        response, queries = _rolled_back(client, scenario, url, body, capture=True)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timings = []
+    for _ in range(repeat):
+        start = perf_counter()
+        _rolled_back(client, scenario, url, body)
+        timings.append((perf_counter() - start) * 1000)
+
+    return {
+        "url": url,
+        "status": response.status_code,
+        "queries": queries,
+        "p50_ms": round(percentile(timings, 0.5), 2),
+        "p95_ms": round(percentile(timings, 0.95), 2),
+        "peak_kib": round(peak / 1024),
+    }
+
+
+def run(scale, repeat=10, scenarios=SCENARIOS, log=None):
+    """Generuje `scale`, uruchamia scenariusze i wszystko wycofuje; `{nazwa: wynik}`."""
+    log = log or (lambda name, result: None)
+    dummy_cache = {
+        "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+    }
+    allowed_hosts = [*settings.ALLOWED_HOSTS, "testserver"]
+    results = {}
+    with override_settings(CACHES=dummy_cache, ALLOWED_HOSTS=allowed_hosts):
+        with transaction.atomic():
+            seed(scale)
+            client = APIClient()
+            client.force_authenticate(user=benchmark_user())
+            context = scenario_context()
+            for scenario in scenarios:
+                result = measure(client, scenario, context, repeat)
+                if result is not None:
+                    results[scenario.name] = result
+                    log(scenario.name, result)
+            transaction.set_rollback(True)
+    return results
+
+
+def load_baseline(path):
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+    except FileNotFoundError:
+        return {}
+
+
+def save_baseline(path, baseline):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(baseline, fh, indent=2, sort_keys=True)
+        fh.write("\n")
+
+
+def compare(results, baseline, latency_tolerance=1.5, memory_tolerance=1.5):
+    """Regresje `results` względem bazowej linii jednej skali."""
+    regressions = []
+    for name, current in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if current["status"] != expected["status"]:
+            regressions.append(
+                f"{name}: status {expected['status']} -> {current['status']}"
+            )
+        if current["queries"] > expected["queries"]:
+            regressions.append(
+                f"{name}: queries {expected['queries']} -> {current['queries']}"
+            )
+        if latency_tolerance and current["p50_ms"] > (
+            expected["p50_ms"] * latency_tolerance + LATENCY_SLACK_MS
+        ):
+            regressions.append(
+                f"{name}: p50 {expected['p50_ms']} ms -> {current['p50_ms']} ms"
+            )
+        if memory_tolerance and current["peak_kib"] > (
+            expected["peak_kib"] * memory_tolerance + MEMORY_SLACK_KIB
+        ):
+            regressions.append(
+                f"{name}: peak {expected['peak_kib']} KiB -> {current['peak_kib']} KiB"
+            )
+    return regressions
@@ -0,0 +1,217 @@
+"""Porównanie WSGI i ASGI dla endpointów z `api.async_views`."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from time import perf_counter
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test import Client, RequestFactory
+from django.test.utils import override_settings
+
+from .benchmark import benchmark_user, percentile, scenario_context, seed
+
+
+@dataclass(frozen=True)
+class Pair:
+    name: str
+    wsgi_url: str
+    asgi_url: str
+
+
+_TIMELINE = "timeline/?from={today}&to={horizon}"
+
+PAIRS = (
+    Pair("health", "/api/health/", "/api/async/health/"),
+    Pair("tasks-list", "/api/tasks/?pagination=cursor", "/api/async/tasks/"),
+    Pair(
+        "projects-board",
+        "/api/projects/{project}/board/",
+        "/api/async/projects/{project}/board/",
+    ),
+    Pair(
+        "projects-timeline",
+        "/api/projects/{project}/" + _TIMELINE,
+        "/api/async/projects/{project}/" + _TIMELINE,
+    ),
+    Pair("users-list", "/api/users/", "/api/async/users/"),
+)
+
+
+def session_cookie(user):
+    """Wartość nagłówka `Cookie` świeżej sesji `user`."""
+    client = Client()
+    client.force_login(user)
+    name = settings.SESSION_COOKIE_NAME
+    return f"{name}={client.cookies[name].value}"
+
+
+def summarize(samples, wall):
+    """Podsumowanie próbek `(sekundy, status)` jednego przebiegu."""
+    latencies = [seconds * 1000 for seconds, _ in samples]
+    return {
+        "requests": len(samples),
+        "errors": sum(1 for _, status in samples if status >= 400),
+        "wall_ms": round(wall * 1000, 1),
+        "rps": round(len(samples) / wall, 1) if wall else None,
+        "p50_ms": round(percentile(latencies, 0.5), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+    }
+
+
+# ---------- WSGI ----------
+
+
+def run_wsgi(url, cookie, requests, workers):
+    handler = WSGIHandler()
+    environ = RequestFactory().get(url, HTTP_COOKIE=cookie).environ
+    remaining = iter(range(requests))
+    lock = threading.Lock()
+    samples = []
+
+    def worker():
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    return
+            start = perf_counter()
+            response = handler(dict(environ), lambda status, headers: None)
+            # What the server does once the body is sent: fires
+            # request_finished, which closes the connections.
+            response.close()
+            samples.append((perf_counter() - start, response.status_code))
+
+    start = perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return summarize(samples, perf_counter() - start)
+
+
+# ---------- ASGI ----------
+
+
+def _scope(url, cookie):
+    path, _, query = url.partition("?")
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "query_string": query.encode(),
+        "headers": [(b"host", b"testserver"), (b"cookie", cookie.encode())],
+        "server": ("testserver", 80),
+        "client": ("127.0.0.1", 50000),
+    }
+
+
+async def _asgi_request(handler, scope):
+    received = False
+    status = None
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # The client never disconnects; the handler cancels this wait.
+        await asyncio.Event().wait()
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    start = perf_counter()
+    await handler(dict(scope), receive, send)
+    return perf_counter() - start, status
+
+
+async def _run_asgi(url, cookie, requests, concurrency):
+    handler = ASGIHandler()
+    scope = _scope(url, cookie)
+    limit = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with limit:
+            return await _asgi_request(handler, scope)
+
+    start = perf_counter()
+    samples = await asyncio.gather(*(one() for _ in range(requests)))
+    return summarize(samples, perf_counter() - start)
+
+
+def run_asgi(url, cookie, requests, concurrency):
+    return asyncio.run(_run_asgi(url, cookie, requests, concurrency))
+
+
+# ---------- run ----------
+
+
+def _query_delay(seconds):
+    def wrapper(execute, sql, params, many, context):
+        time.sleep(seconds)
+        return execute(sql, params, many, context)
+
+    def install(sender, connection, **kwargs):
+        connection.execute_wrappers.append(wrapper)
+
+    return install
+
+
+def compare_handlers(
+    pairs, context, cookie, requests=50, workers=4, concurrency=20, log=None
+):
+    """Każda para pod oboma handlerami; `{nazwa: {"wsgi": .., "asgi": ..}}`."""
+    log = log or (lambda name, kind, result: None)
+    results = {}
+    for pair in pairs:
+        try:
+            wsgi_url = pair.wsgi_url.format(**context)
+            asgi_url = pair.asgi_url.format(**context)
+        except KeyError:
+            continue
+        # Warm-up: URL resolver, serializers, middleware chains.
+        run_wsgi(wsgi_url, cookie, 1, 1)
+        run_asgi(asgi_url, cookie, 1, 1)
+
+        results[pair.name] = {
+            "wsgi": run_wsgi(wsgi_url, cookie, requests, workers),
+            "asgi": run_asgi(asgi_url, cookie, requests, concurrency),
+        }
+        for kind, result in results[pair.name].items():
+            log(pair.name, kind, result)
+    return results
+
+
+def run(scale, pairs=PAIRS, query_delay_ms=0, log=None, **options):
+    """Generuje `scale` (z commitem) i porównuje na nim handlery."""
+    dummy_cache = {
+        "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+    }
+    allowed_hosts = [*settings.ALLOWED_HOSTS, "testserver"]
+    with override_settings(CACHES=dummy_cache, ALLOWED_HOSTS=allowed_hosts):
+        seed(scale)
+        cookie = session_cookie(benchmark_user())
+        context = scenario_context()
+        connections.close_all()
+
+        delay = _query_delay(query_delay_ms / 1000) if query_delay_ms else None
+        if delay is not None:
+            connection_created.connect(delay)
+        try:
+            return compare_handlers(pairs, context, cookie, log=log, **options)
+        finally:
+            if delay is not None:
+                connection_created.disconnect(delay)
@@ -0,0 +1,349 @@
+"""Hurtowe tworzenie, zmiana i usuwanie tasków (`POST /api/tasks/bulk/`).
+
+Wszystko w jednej transakcji; liczba zapytań nie zależy od liczby pozycji.
+"""
+
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from .models import (
+    Funding,
+    FundingTask,
+    Project,
+    ProjectFunding,
+    Task,
+    TaskScope,
+)
+from . import events, stats, workload
+from .assignments import sync_assignees
+from .cleanup import delete_tasks
+from .effective_scope import sync_tasks
+from .response_cache import bump_generation
+from .serializers import TaskBulkItemSerializer
+
+User = get_user_model()
+
+BULK_MAX_ITEMS = 1000
+BULK_BATCH_SIZE = 500
+
+SCOPE_MODELS = {
+    "project": Project,
+    "funding": Funding,
+    "project_funding": ProjectFunding,
+}
+SCOPE_FIELDS = tuple(SCOPE_MODELS)
+
+
+def _missing_pk(value):
+    return f'Invalid pk "{value}" - object does not exist.'
+
+
+class TaskBulkWriter:
+    """Walidacja i zapis jednego payloadu `/api/tasks/bulk/`."""
+
+    def __init__(self, data, context=None):
+        self.data = data if isinstance(data, dict) else {}
+        self.context = context or {}
+        self.create_items = []
+        self.update_items = []
+        self.delete_ids = []
+        self.errors = {}
+
+    # ---------- validation ----------
+
+    def is_valid(self):
+        if not self._check_shape():
+            return False
+
+        self.create_errors = [{} for _ in self.create_items]
+        self.update_errors = [{} for _ in self.update_items]
+        self.delete_errors = [{} for _ in self.delete_ids]
+
+        self.creates = self._validate_items(
+            self.create_items, self.create_errors, partial=False
+        )
+        self.updates = self._validate_items(
+            self.update_items, self.update_errors, partial=True
+        )
+        self._check_update_ids()
+        self._check_delete_ids()
+        self._check_references()
+        self._check_dates()
+
+        if any(self.create_errors + self.update_errors + self.delete_errors):
+            self.errors = {
+                "create": self.create_errors,
+                "update": self.update_errors,
+                "delete": self.delete_errors,
+            }
+            return False
+        return True
+
+    def _check_shape(self):
+        lists = {}
+        for key in ("create", "update", "delete"):
+            value = self.data.get(key, [])
+            if not isinstance(value, list):
+                self.errors = {key: ["Expected a list."]}
+                return False
+            lists[key] = value
+        total = sum(len(v) for v in lists.values())
+        if total == 0:
+            self.errors = {"non_field_errors": ["No operations given."]}
+            return False
+        if total > BULK_MAX_ITEMS:
+            self.errors = {
+                "non_field_errors": [
+                    f"At most {BULK_MAX_ITEMS} operations per request (got {total})."
+                ]
+            }
+            return False
+        self.create_items = lists["create"]
+        self.update_items = lists["update"]
+        self.delete_ids = lists["delete"]
+        return True
+
+    def _validate_items(self, items, errors, partial):
+        serializer = TaskBulkItemSerializer(context=self.context, partial=partial)
+        validated = []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                errors[index] = {"non_field_errors": ["Expected an object."]}
+                validated.append(None)
+                continue
+            try:
+                validated.append(serializer.run_validation(item))
+            except serializers.ValidationError as exc:
+                errors[index] = exc.detail
+                validated.append(None)
+        return validated
+
+    def _check_update_ids(self):
+        ids = []
+        for index, item in enumerate(self.update_items):
+            task_id = item.get("id") if isinstance(item, dict) else None
+            if not isinstance(task_id, int) or isinstance(task_id, bool):
+                self.update_errors[index].setdefault("id", []).append(
+                    "This field is required."
+                )
+                ids.append(None)
+                continue
+            if task_id in ids:
+                self.update_errors[index].setdefault("id", []).append(
+                    "Duplicate id in update list."
+                )
+            ids.append(task_id)
+
+        self.update_tasks = Task.objects.select_related("scope").in_bulk(
+            [i for i in ids if i is not None]
+        )
+        self.update_ids = ids
+        for index, task_id in enumerate(ids):
+            if task_id is not None and task_id not in self.update_tasks:
+                self.update_errors[index].setdefault("id", []).append(
+                    _missing_pk(task_id)
+                )
+
+    def _check_delete_ids(self):
+        valid = [
+            i for i in self.delete_ids if isinstance(i, int) and not isinstance(i, bool)
+        ]
+        existing = set(Task.objects.filter(pk__in=valid).values_list("pk", flat=True))
+        seen = set()
+        for index, task_id in enumerate(self.delete_ids):
+            if task_id not in valid or task_id not in existing:
+                self.delete_errors[index] = {"id": [_missing_pk(task_id)]}
+            elif task_id in seen or task_id in self.update_ids:
+                self.delete_errors[index] = {
+                    "id": ["Task is already used by another operation."]
+                }
+            seen.add(task_id)
+
+    def _validated_pairs(self):
+        for items, errors in (
+            (self.creates, self.create_errors),
+            (self.updates, self.update_errors),
+        ):
+            for index, attrs in enumerate(items):
+                if attrs is not None:
+                    yield attrs, errors[index]
+
+    def _check_references(self):
+        wanted = {name: set() for name in SCOPE_FIELDS}
+        templates, users = set(), set()
+        for attrs, _ in self._validated_pairs():
+            for name in SCOPE_FIELDS:
+                if attrs["scope"][name]:
+                    wanted[name].add(attrs["scope"][name])
+            if attrs.get("template_id"):
+                templates.add(attrs["template_id"])
+            users.update(attrs["assignee_ids"] or ())
+
+        def existing(model, ids):
+            if not ids:
+                return set()
+            return set(model.objects.filter(pk__in=ids).values_list("pk", flat=True))
+
+        found = {name: existing(SCOPE_MODELS[name], wanted[name]) for name in wanted}
+        found_templates = existing(FundingTask, templates)
+        found_users = existing(User, users)
+
+        for attrs, errors in self._validated_pairs():
+            for name in SCOPE_FIELDS:
+                value = attrs["scope"][name]
+                if value and value not in found[name]:
+                    errors.setdefault(name, []).append(_missing_pk(value))
+            template_id = attrs.get("template_id")
+            if template_id and template_id not in found_templates:
+                errors.setdefault("template", []).append(_missing_pk(template_id))
+            for user_id in attrs["assignee_ids"] or ():
+                if user_id not in found_users:
+                    errors.setdefault("assignee_ids", []).append(_missing_pk(user_id))
+
+    def _check_dates(self):
+        message = "start_date must not be later than due_date."
+        for attrs, errors in zip(self.creates, self.create_errors):
+            if attrs is not None and not _dates_ok(
+                attrs.get("start_date"), attrs.get("due_date")
+            ):
+                errors.setdefault("non_field_errors", []).append(message)
+        for index, attrs in enumerate(self.updates):
+            task = self.update_tasks.get(self.update_ids[index])
+            if attrs is None or task is None:
+                continue
+            start = attrs.get("start_date", task.start_date)
+            due = attrs.get("due_date", task.due_date)
+            if not _dates_ok(start, due):
+                self.update_errors[index].setdefault("non_field_errors", []).append(
+                    message
+                )
+
+    # ---------- apply ----------
+
+    def save(self, assigned_by=None):
+        request = self.context.get("request")
+        if (
+            assigned_by is None
+            and request is not None
+            and request.user.is_authenticated
+        ):
+            assigned_by = request.user
+
+        changing = [*self.update_ids, *self.delete_ids]
+        with transaction.atomic(), events.batch(changing) as batch:
+            # bulk_create/bulk_update nie wysyłają sygnałów: statystyki
+            # i obciążenie dostają różnicę przed/po.
+            before = stats.collect(self.update_ids)
+            workload_before = workload.collect(self.update_ids)
+            created = self._apply_creates()
+            batch.add(task.pk for task in created)
+            updated = self._apply_updates()
+            (stats.collect([t.pk for t in created + updated]) - before).apply()
+            (workload.collect(self.update_ids) - workload_before).apply()
+            bump_generation(Task, TaskScope)
+            sync_assignees(
+                {
+                    task.pk: attrs["assignee_ids"]
+                    for task, attrs in list(zip(created, self.creates))
+                    + list(zip(updated, self.updates))
+                },
+                assigned_by=assigned_by,
+            )
+            delete_tasks(self.delete_ids)
+
+        return {
+            "create": [
+                {"index": i, "id": task.pk, "status": "created"}
+                for i, task in enumerate(created)
+            ],
+            "update": [
+                {"index": i, "id": task.pk, "status": "updated"}
+                for i, task in enumerate(updated)
+            ],
+            "delete": [
+                {"index": i, "id": task_id, "status": "deleted"}
+                for i, task_id in enumerate(self.delete_ids)
+            ],
+        }
+
+    @staticmethod
+    def _task_fields(attrs):
+        return {
+            key: value
+            for key, value in attrs.items()
+            if key not in ("scope", "assignee_ids")
+        }
+
+    def _apply_creates(self):
+        if not self.creates:
+            return []
+        tasks = Task.objects.bulk_create(
+            [Task(**self._task_fields(attrs)) for attrs in self.creates],
+            batch_size=BULK_BATCH_SIZE,
+        )
+        scopes = [
+            _new_scope(task, attrs["scope"])
+            for task, attrs in zip(tasks, self.creates)
+            if _has_scope(attrs["scope"])
+        ]
+        TaskScope.objects.bulk_create(scopes, batch_size=BULK_BATCH_SIZE)
+        sync_tasks([scope.task_id for scope in scopes])
+        return tasks
+
+    def _apply_updates(self):
+        if not self.updates:
+            return []
+        now = timezone.now()
+        tasks, fields = [], {"updated_at"}
+        scope_updates, scope_creates = [], []
+        for task_id, attrs in zip(self.update_ids, self.updates):
+            task = self.update_tasks[task_id]
+            for key, value in self._task_fields(attrs).items():
+                setattr(task, key, value)
+                fields.add(key)
+            task.updated_at = now
+            tasks.append(task)
+
+            if not _has_scope(attrs["scope"]):
+                continue
+            try:
+                scope = task.scope
+            except ObjectDoesNotExist:
+                scope_creates.append(_new_scope(task, attrs["scope"]))
+                continue
+            scope.project_id = attrs["scope"]["project"] or None
+            scope.funding_id = attrs["scope"]["funding"] or None
+            scope.project_funding_id = attrs["scope"]["project_funding"] or None
+            scope_updates.append(scope)
+
+        Task.objects.bulk_update(tasks, sorted(fields), batch_size=BULK_BATCH_SIZE)
+        if scope_updates:
+            TaskScope.objects.bulk_update(
+                scope_updates, list(SCOPE_FIELDS), batch_size=BULK_BATCH_SIZE
+            )
+        if scope_creates:
+            TaskScope.objects.bulk_create(scope_creates, batch_size=BULK_BATCH_SIZE)
+        sync_tasks([scope.task_id for scope in scope_updates + scope_creates])
+        return tasks
+
+
+def _dates_ok(start, due):
+    return start is None or due is None or start <= due
+
+
+def _has_scope(scope):
+    return any(value is not None for value in scope.values())
+
+
+def _new_scope(task, scope):
+    return TaskScope(
+        task=task,
+        project_id=scope["project"] or None,
+        funding_id=scope["funding"] or None,
+        project_funding_id=scope["project_funding"] or None,
+    )
@@ -0,0 +1,179 @@
+"""Usuwanie tasków wygenerowanych dla ProjectFunding partiami."""
+
+from __future__ import annotations
+
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, transaction
+from django.utils import timezone
+
+from . import events, stats, workload
+from .response_cache import bump_generation
+from .models import (
+    ProjectFunding,
+    ProjectFundingCleanup,
+    Task,
+    TaskAssignment,
+    TaskScope,
+)
+
+CLEANUP_BATCH_SIZE = 500
+
+OPEN_STATUSES = [
+    ProjectFundingCleanup.Status.PENDING,
+    ProjectFundingCleanup.Status.RUNNING,
+    ProjectFundingCleanup.Status.FAILED,
+]
+
+
+class CleanupConflict(Exception):
+    """Inny worker zapisał w międzyczasie partie tego samego zlecenia."""
+
+
+def generated_tasks(project_funding_id):
+    """Taski wygenerowane dla powiązania (te, które usuwa odpięcie)."""
+    return Task.objects.filter(
+        scope__project_funding_id=project_funding_id,
+        scope__funding_scoped=True,
+    )
+
+
+def blocking_tasks_exist(project_funding_id) -> bool:
+    """Czy ręcznie przypisane taski blokują usunięcie powiązania."""
+    return TaskScope.objects.filter(
+        project_funding_id=project_funding_id, funding_scoped=False
+    ).exists()
+
+
+def _raw_delete(queryset, using):
+    # Single DELETE without the collector; safe only for models that nothing
+    # else references (TaskAssignment, TaskScope) or whose dependants were
+    # already removed (Task).
+    return queryset._raw_delete(using)
+
+
+def delete_tasks(task_ids, using=DEFAULT_DB_ALIAS):
+    """Usuwa taski z przypisaniami i scope'ami bez sygnałów (stała liczba zapytań).
+
+    Wołać w transakcji: wkład tasków schodzi ze statystyk i obciążenia jedną
+    deltą, generacja cache i zdarzenia idą raz na całą partię.
+    """
+    task_ids = list(task_ids)
+    if not task_ids:
+        return
+    removed = stats.collect(task_ids)
+    unassigned = workload.collect(task_ids)
+    with events.batch(task_ids):
+        _raw_delete(TaskAssignment.objects.filter(task_id__in=task_ids), using)
+        _raw_delete(TaskScope.objects.filter(task_id__in=task_ids), using)
+        _raw_delete(Task.objects.filter(id__in=task_ids), using)
+    (-removed).apply()
+    (-unassigned).apply()
+    bump_generation(Task, TaskScope, TaskAssignment)
+
+
+def delete_generated_tasks(
+    project_funding_id,
+    batch_size=CLEANUP_BATCH_SIZE,
+    on_progress=None,
+    using=DEFAULT_DB_ALIAS,
+) -> int:
+    """Usuwa wygenerowane taski partiami; `on_progress` woła w transakcji partii."""
+    deleted = 0
+    while True:
+        with transaction.atomic(using=using):
+            # Taski zablokowane przez inną transakcję pomijamy zamiast czekać.
+            ids = list(
+                generated_tasks(project_funding_id)
+                .order_by()
+                .select_for_update(skip_locked=True, of=("self",))
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            delete_tasks(ids, using)
+            if on_progress is not None:
+                on_progress(deleted + len(ids))
+        deleted += len(ids)
+    return deleted
+
+
+def unlink_project_funding(project_funding, batch_size=CLEANUP_BATCH_SIZE) -> int:
+    """Synchronicznie usuwa wygenerowane taski, a potem samo powiązanie."""
+    deleted = delete_generated_tasks(project_funding.pk, batch_size=batch_size)
+    project_funding.delete()
+    return deleted
+
+
+def schedule_cleanup(project_funding) -> ProjectFundingCleanup:
+    """Kolejkuje odpięcie (`run_cleanup_jobs`); otwarte zlecenie jest zwracane."""
+    job = _open_job(project_funding)
+    if job is None:
+        try:
+            with transaction.atomic():
+                return ProjectFundingCleanup.objects.create(
+                    project_funding=project_funding,
+                    label=str(project_funding),
+                    total=generated_tasks(project_funding.pk).count(),
+                )
+        except IntegrityError:
+            # Równoległe zlecenie wygrało wyścig o ``pfcleanup_open_uniq``.
+            job = _open_job(project_funding)
+    if job.status == ProjectFundingCleanup.Status.FAILED:
+        job.status = ProjectFundingCleanup.Status.PENDING
+        job.error = ""
+        job.save(update_fields=["status", "error", "updated_at"])
+    return job
+
+
+def _open_job(project_funding):
+    return ProjectFundingCleanup.objects.filter(
+        project_funding=project_funding, status__in=OPEN_STATUSES
+    ).first()
+
+
+def _lock_progress(job):
+    """Blokuje wiersz zlecenia; ``CleanupConflict``, jeśli postęp się przesunął."""
+    deleted = (
+        ProjectFundingCleanup.objects.select_for_update()
+        .values_list("deleted", flat=True)
+        .get(pk=job.pk)
+    )
+    if deleted != job.deleted:
+        raise CleanupConflict(
+            f"Cleanup #{job.pk} is being processed by another worker "
+            f"({deleted} tasks deleted, expected {job.deleted})."
+        )
+
+
+def run_cleanup(job: ProjectFundingCleanup, batch_size=CLEANUP_BATCH_SIZE):
+    """Wykonuje jedno zlecenie; po awarii kontynuuje od zapisanego postępu."""
+    with transaction.atomic():
+        _lock_progress(job)
+        job.status = ProjectFundingCleanup.Status.RUNNING
+        job.error = ""
+        job.save(update_fields=["status", "error", "updated_at"])
+
+    def progress(done):
+        _lock_progress(job)
+        job.deleted = already + done
+        ProjectFundingCleanup.objects.filter(pk=job.pk).update(
+            deleted=job.deleted, updated_at=timezone.now()
+        )
+
+    already = job.deleted
+    pf_id = job.project_funding_id
+    try:
+        if pf_id is not None:
+            delete_generated_tasks(pf_id, batch_size=batch_size, on_progress=progress)
+            ProjectFunding.objects.filter(pk=pf_id).delete()
+    except CleanupConflict:
+        raise
+    except Exception as exc:
+        job.status = ProjectFundingCleanup.Status.FAILED
+        job.error = str(exc)
+        job.save(update_fields=["status", "error", "updated_at"])
+        raise
+
+    job.status = ProjectFundingCleanup.Status.DONE
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "deleted", "finished_at", "updated_at"])
+    return job
@@ -0,0 +1,103 @@
+"""Warunkowy GET (`ETag` / `Last-Modified`) dla list i szczegółów."""
+
+from __future__ import annotations
+
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from . import response_cache
+from .models import Task
+
+
+def touch_tasks(task_ids):
+    """Podbija `updated_at` tasków, żeby zmieniły się ich walidatory."""
+    task_ids = [pk for pk in task_ids if pk is not None]
+    if task_ids:
+        Task.objects.filter(pk__in=task_ids).update(updated_at=timezone.now())
+
+
+class ConditionalGetMixin:
+    """`ETag` dla `list`/`retrieve` (+ `Last-Modified` dla `retrieve`) i 304."""
+
+    conditional_timestamps = ("updated_at",)
+    conditional_related = {}
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self._conditional(request, queryset) or self._with_validators(
+            super().list(request, *args, **kwargs)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).filter(
+            **{self.lookup_field: kwargs[lookup_url_kwarg]}
+        )
+        return self._conditional(request, queryset) or self._with_validators(
+            super().retrieve(request, *args, **kwargs)
+        )
+
+    # ---------- validator ----------
+
+    def get_conditional_sources(self, queryset):
+        sources = [(queryset, self.conditional_timestamps)]
+        for name, related in self.conditional_related.items():
+            if self.wants_field(name):
+                sources.append((related(queryset), ("updated_at",)))
+        return sources
+
+    def compute_validators(self, queryset):
+        """`(etag, last_modified)` dla przefiltrowanego querysetu."""
+        parts = [self.request.get_full_path(), self.request.user.pk]
+        models = getattr(self, "cache_models", ())
+        replica = getattr(self.request, "_read_route", None) is not None
+        if (
+            self.action == "list"
+            and models
+            and response_cache.is_enabled()
+            and not replica
+        ):
+            # Każdy zapis tych modeli podbija generację — bez zapytań do bazy.
+            # Odpowiedź z repliki może być starsza niż generacja, więc ona
+            # dostaje ETag z agregatu.
+            parts.append(response_cache.generations(models))
+            return hashlib.md5(repr(parts).encode("utf-8")).hexdigest(), None
+        last_modified = None
+        for qs, timestamps in self.get_conditional_sources(queryset):
+            aggregates = {f"last_{i}": Max(name) for i, name in enumerate(timestamps)}
+            row = qs.order_by().aggregate(rows=Count("pk", distinct=True), **aggregates)
+            parts.append(row["rows"])
+            for i in range(len(timestamps)):
+                value = row[f"last_{i}"]
+                parts.append(value.isoformat() if value else None)
+                if value and (last_modified is None or value > last_modified):
+                    last_modified = value
+        etag = hashlib.md5(repr(parts).encode("utf-8")).hexdigest()
+        return etag, last_modified
+
+    def _conditional(self, request, queryset):
+        etag, last_modified = self.compute_validators(queryset)
+        if self.action != "retrieve":
+            last_modified = None
+        self._validators = (
+            quote_etag(etag),
+            int(last_modified.timestamp()) if last_modified else None,
+        )
+        response = get_conditional_response(
+            request, etag=self._validators[0], last_modified=self._validators[1]
+        )
+        return self._with_validators(response) if response is not None else None
+
+    def _with_validators(self, response):
+        etag, last_modified = self._validators
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            if last_modified is not None:
+                response["Last-Modified"] = http_date(last_modified)
+            # Clients may keep the response but must revalidate it every time.
+            response["Cache-Control"] = "private, no-cache"
+        return response
@@ -0,0 +1,41 @@
+"""Zdenormalizowane `Task.effective_project` / `Task.effective_funding`."""
+
+from __future__ import annotations
+
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Task, TaskScope
+from .response_cache import bump_generation
+
+
+def _from_scope(direct, through_link):
+    """Podzapytanie: id bezpośrednie albo osiągnięte przez powiązanie."""
+    return Subquery(
+        TaskScope.objects.filter(task_id=OuterRef("pk"))
+        .annotate(effective=Coalesce(direct, through_link))
+        .values("effective")[:1]
+    )
+
+
+def sync_tasks(task_ids):
+    """Przelicza efektywne id tasków z ich scope'ów (jeden UPDATE, z `updated_at`)."""
+    task_ids = [pk for pk in task_ids if pk is not None]
+    if not task_ids:
+        return
+    Task.objects.filter(pk__in=task_ids).update(
+        effective_project_id=_from_scope("project_id", "project_funding__project_id"),
+        effective_funding_id=_from_scope("funding_id", "project_funding__funding_id"),
+        updated_at=timezone.now(),
+    )
+
+
+def sync_link_tasks(project_funding):
+    """Przepina taski powiązania na jego projekt i finansowanie."""
+    Task.objects.filter(scope__project_funding=project_funding).update(
+        effective_project_id=project_funding.project_id,
+        effective_funding_id=project_funding.funding_id,
+        updated_at=timezone.now(),
+    )
+    bump_generation(Task)
@@ -0,0 +1,463 @@
+"""Zdarzenia tasków na żywo per projekt (SSE pod ASGI, `/api/projects/{id}/events/`)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date, datetime
+from decimal import Decimal
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.postgres.expressions import ArraySubquery
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.db.models import F, OuterRef
+from django.db.models.functions import JSONObject
+from django.http import StreamingHttpResponse
+from django.utils.module_loading import import_string
+from rest_framework import serializers
+from rest_framework.renderers import BaseRenderer
+
+from .models import Task, TaskAssignment
+from .response_cache import LOCAL_BACKENDS
+
+CREATED = "task.created"
+UPDATED = "task.updated"
+DELETED = "task.deleted"
+RESET = "reset"
+
+TASK_FIELDS = (
+    "title",
+    "description",
+    "status",
+    "priority",
+    "start_date",
+    "due_date",
+    "cost_amount",
+    "cost_currency",
+    "receipt_url",
+    "receipt_note",
+    "est_hours",
+    "template",
+)
+SCOPE_FIELDS = {
+    "scope_project": "scope__project_id",
+    "scope_funding": "scope__funding_id",
+    "scope_project_funding": "scope__project_funding_id",
+}
+
+RETRY_MS = 3000
+
+
+def channel_name(project_id):
+    return f"project-{project_id}"
+
+
+# ---------- task state ----------
+
+_datetime_field = serializers.DateTimeField()
+
+
+def _plain(value):
+    if isinstance(value, datetime):
+        return _datetime_field.to_representation(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _state_query(task_ids):
+    assignees = (
+        TaskAssignment.objects.filter(task_id=OuterRef("pk"))
+        .order_by("user_id")
+        .values(json=JSONObject(id="user_id", username="user__username"))
+    )
+    return (
+        Task.objects.filter(pk__in=task_ids)
+        .order_by()
+        .annotate(
+            **{name: F(path) for name, path in SCOPE_FIELDS.items()},
+            event_assignees=ArraySubquery(assignees),
+        )
+        .values(
+            "id",
+            "effective_project_id",
+            "updated_at",
+            *TASK_FIELDS,
+            *SCOPE_FIELDS,
+            "event_assignees",
+        )
+    )
+
+
+def collect(task_ids):
+    """Stan istniejących tasków: `{id: {"project", "version", "fields"}}`."""
+    task_ids = [pk for pk in task_ids if pk is not None]
+    if not task_ids or get_broker() is None:
+        return {}
+    state = {}
+    for row in _state_query(task_ids):
+        fields = {name: _plain(row[name]) for name in (*TASK_FIELDS, *SCOPE_FIELDS)}
+        fields["assignees"] = row["event_assignees"]
+        state[row["id"]] = {
+            "project": row["effective_project_id"],
+            "version": _plain(row["updated_at"]),
+            "fields": fields,
+        }
+    return state
+
+
+def created_state(tasks, **scope):
+    """`collect` tasków z `bulk_create`, bez zapytania."""
+    attnames = {name: Task._meta.get_field(name).attname for name in TASK_FIELDS}
+    return {
+        task.pk: {
+            "project": task.effective_project_id,
+            "version": _plain(task.updated_at),
+            "fields": {
+                **{name: _plain(getattr(task, attnames[name])) for name in TASK_FIELDS},
+                **{name: scope.get(name) for name in SCOPE_FIELDS},
+                "assignees": [],
+            },
+        }
+        for task in tasks
+    }
+
+
+def _event(kind, task_id, project_id, version=None, fields=None):
+    event = {"type": kind, "task": task_id, "project": project_id}
+    if version is not None:
+        event["version"] = version
+    if fields is not None:
+        event["fields"] = fields
+    return event
+
+
+def changes(before, after):
+    """Pary `(id projektu, zdarzenie)` przeprowadzające `before` w `after`."""
+    result = []
+    for task_id in sorted(before.keys() | after.keys()):
+        old, new = before.get(task_id), after.get(task_id)
+        old_project = old["project"] if old else None
+        new_project = new["project"] if new else None
+        if old_project is not None and old_project != new_project:
+            result.append((old_project, _event(DELETED, task_id, old_project)))
+        if new_project is None:
+            continue
+        if old_project != new_project:
+            event = _event(CREATED, task_id, new_project, new["version"], new["fields"])
+            result.append((new_project, event))
+            continue
+        changed = {
+            name: value
+            for name, value in new["fields"].items()
+            if old["fields"].get(name) != value
+        }
+        if changed:
+            event = _event(UPDATED, task_id, new_project, new["version"], changed)
+            result.append((new_project, event))
+    return result
+
+
+def publish(before, after):
+    """Publikuje różnicę po commicie bieżącej transakcji."""
+    broker = get_broker()
+    if broker is None:
+        return
+    by_channel = {}
+    for project_id, event in changes(before, after):
+        by_channel.setdefault(channel_name(project_id), []).append(event)
+    for channel, events in by_channel.items():
+        transaction.on_commit(partial(broker.publish, channel, events))
+
+
+# ---------- batches ----------
+
+
+class _Batch:
+    def __init__(self):
+        self.before = {}
+        self.seen = set()
+
+    def remember(self, task_ids):
+        """Czyta stan tasków, których batch jeszcze nie widział."""
+        if get_broker() is None:
+            return
+        new = {pk for pk in task_ids if pk is not None} - self.seen
+        if new:
+            self.seen |= new
+            self.before.update(collect(new))
+
+    def add(self, task_ids):
+        """Taski utworzone wewnątrz batcha (bez stanu przed)."""
+        self.seen.update(pk for pk in task_ids if pk is not None)
+
+
+_batch: ContextVar[_Batch | None] = ContextVar("api_events_batch", default=None)
+
+
+@contextmanager
+def batch(task_ids=()):
+    """Zbiera zdarzenia bloku w jedną różnicę przed/po (zagnieżdżony dołącza)."""
+    current = _batch.get()
+    if current is not None:
+        current.remember(task_ids)
+        yield current
+        return
+    current = _Batch()
+    current.remember(task_ids)
+    token = _batch.set(current)
+    try:
+        yield current
+    finally:
+        _batch.reset(token)
+    publish(current.before, collect(current.seen))
+
+
+def before(task_ids):
+    """Stan dla `after`; `None` wewnątrz `batch`."""
+    current = _batch.get()
+    if current is not None:
+        current.remember(task_ids)
+        return None
+    return collect(task_ids)
+
+
+def after(state, task_ids):
+    """Publikuje zmianę `task_ids` od stanu zwróconego przez `before`."""
+    current = _batch.get()
+    if current is not None:
+        current.add(task_ids)
+        return
+    task_ids = [pk for pk in task_ids if pk is not None]
+    if task_ids:
+        publish(state or {}, collect(task_ids))
+
+
+# ---------- brokers ----------
+
+
+class StaleCursor(Exception):
+    """Broker nie odtworzy już zdarzeń po danym id."""
+
+
+class EventBroker:
+    """Numerowane zdarzenia per kanał; `StaleCursor`, gdy części już nie ma."""
+
+    poll_interval = 0.5
+    # Czy zdarzenia widzą wszystkie procesy (workery) serwera.
+    shared = False
+
+    def publish(self, channel, events):
+        raise NotImplementedError
+
+    def last_id(self, channel):
+        raise NotImplementedError
+
+    def read(self, channel, after, timeout):
+        raise NotImplementedError
+
+    async def aread(self, channel, after, timeout):
+        """`read` dla strumienia async, odpytywany co `poll_interval` sekund."""
+        read = sync_to_async(self.read, thread_sensitive=False)
+        deadline = time.monotonic() + timeout
+        while True:
+            events = await read(channel, after, 0)
+            remaining = deadline - time.monotonic()
+            if events or remaining <= 0:
+                return events
+            await asyncio.sleep(min(self.poll_interval, remaining))
+
+
+def buffer_size():
+    return getattr(settings, "API_EVENTS_BUFFER", 1000)
+
+
+class InMemoryBroker(EventBroker):
+    poll_interval = 0.1
+
+    def __init__(self):
+        self._changed = threading.Condition()
+        self._events = {}
+        self._last = {}
+
+    def publish(self, channel, events):
+        with self._changed:
+            buffer = self._events.setdefault(channel, deque(maxlen=buffer_size()))
+            last = self._last.get(channel, 0)
+            for event in events:
+                last += 1
+                buffer.append((last, event))
+            self._last[channel] = last
+            self._changed.notify_all()
+
+    def last_id(self, channel):
+        with self._changed:
+            return self._last.get(channel, 0)
+
+    def read(self, channel, after, timeout):
+        with self._changed:
+            self._changed.wait_for(lambda: self._last.get(channel, 0) != after, timeout)
+            last = self._last.get(channel, 0)
+            buffer = self._events.get(channel, ())
+            if after > last or (buffer and after < buffer[0][0] - 1):
+                raise StaleCursor(after)
+            return [(event_id, event) for event_id, event in buffer if event_id > after]
+
+
+class CacheBroker(EventBroker):
+    """Zdarzenia w cache'u Django (`API_EVENTS_CACHE`); licznik przez `incr`."""
+
+    prefix = "api:events:"
+    timeout = 3600
+
+    def __init__(self):
+        alias = getattr(settings, "API_EVENTS_CACHE", "default")
+        self.cache = caches[alias]
+        self.shared = settings.CACHES[alias]["BACKEND"] not in LOCAL_BACKENDS
+
+    def _last_key(self, channel):
+        return f"{self.prefix}{channel}:last"
+
+    def _event_key(self, channel, event_id):
+        return f"{self.prefix}{channel}:{event_id}"
+
+    def publish(self, channel, events):
+        key = self._last_key(channel)
+        try:
+            last = self.cache.incr(key, len(events))
+        except ValueError:
+            self.cache.add(key, 0, None)
+            last = self.cache.incr(key, len(events))
+        first = last - len(events) + 1
+        self.cache.set_many(
+            {
+                self._event_key(channel, event_id): event
+                for event_id, event in enumerate(events, start=first)
+            },
+            self.timeout,
+        )
+
+    def last_id(self, channel):
+        return self.cache.get(self._last_key(channel), 0)
+
+    def read(self, channel, after, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            last = self.last_id(channel)
+            if after > last or last - after > buffer_size():
+                raise StaleCursor(after)
+            if last > after:
+                ids = range(after + 1, last + 1)
+                keys = [self._event_key(channel, event_id) for event_id in ids]
+                found = self.cache.get_many(keys)
+                events = []
+                for event_id, key in zip(ids, keys):
+                    if key not in found:
+                        break
+                    events.append((event_id, found[key]))
+                if not events:
+                    # Expired or evicted (or, rarely, counted but not stored
+                    # yet); either way the client refetches.
+                    raise StaleCursor(after)
+                return events
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return []
+            time.sleep(min(self.poll_interval, remaining))
+
+
+_brokers = {}
+
+
+def get_broker():
+    """Skonfigurowany broker (jeden na proces); `None`, gdy zdarzenia są wyłączone."""
+    path = getattr(settings, "API_EVENTS_BROKER", "")
+    if not path:
+        return None
+    if path not in _brokers:
+        _brokers[path] = import_string(path)()
+    return _brokers[path]
+
+
+def check_broker():
+    """``ImproperlyConfigured`` dla brokera jednego procesu poza DEBUG."""
+    broker = get_broker()
+    if broker is not None and not broker.shared and not settings.DEBUG:
+        raise ImproperlyConfigured(
+            f"{settings.API_EVENTS_BROKER} keeps events in one process; "
+            f"set REDIS_URL or leave API_EVENTS_BROKER empty."
+        )
+
+
+# ---------- stream ----------
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Pozwala DRF przyjąć `text/event-stream`; błędy jako tekst JSON."""
+
+    media_type = "text/event-stream"
+    format = "sse"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data).encode()
+
+
+def _message(event_id, event):
+    return f"id: {event_id}\ndata: {json.dumps(event)}\n\n"
+
+
+def last_event_id(request):
+    """Pozycja wznowienia: nagłówek `Last-Event-ID`, inaczej `?last_event_id=`."""
+    value = request.headers.get("Last-Event-ID") or request.query_params.get(
+        "last_event_id"
+    )
+    try:
+        return max(int(value), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+async def stream(broker, channel, after=None):
+    """Tekst SSE kanału przez `API_EVENTS_STREAM_SECONDS`, z keepalive."""
+    keepalive = getattr(settings, "API_EVENTS_KEEPALIVE_SECONDS", 15)
+    deadline = time.monotonic() + getattr(settings, "API_EVENTS_STREAM_SECONDS", 300)
+    last_id = sync_to_async(broker.last_id, thread_sensitive=False)
+    if after is None:
+        after = await last_id(channel)
+    # An id without data sets EventSource.lastEventId without an event.
+    yield f"retry: {RETRY_MS}\nid: {after}\n\n"
+    while (remaining := deadline - time.monotonic()) > 0:
+        try:
+            events = await broker.aread(channel, after, min(keepalive, remaining))
+        except StaleCursor:
+            after = await last_id(channel)
+            yield _message(after, {"type": RESET})
+            continue
+        if not events:
+            yield ": keepalive\n\n"
+        for event_id, event in events:
+            after = event_id
+            yield _message(event_id, event)
+
+
+def stream_response(broker, channel, after=None):
+    response = StreamingHttpResponse(
+        stream(broker, channel, after),
+        content_type=f"{EventStreamRenderer.media_type}; charset=utf-8",
+    )
+    response["Cache-Control"] = "no-cache"
+    # nginx: pass every event through at once instead of buffering.
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,140 @@
+"""Strumieniowy eksport tasków (`/api/tasks/export/?format=csv|ndjson`)."""
+
+from __future__ import annotations
+
+import csv
+import io
+import json
+
+from django.contrib.postgres.expressions import ArraySubquery
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import DecimalField, OuterRef, Subquery, Sum
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.renderers import BaseRenderer
+
+from .models import TaskAssignment
+
+CHUNK_SIZE = 2000
+FLUSH_BYTES = 64 * 1024
+
+# (column name, queryset expression)
+EXPORT_COLUMNS = (
+    ("id", "id"),
+    ("title", "title"),
+    ("description", "description"),
+    ("status", "status"),
+    ("priority", "priority"),
+    ("start_date", "start_date"),
+    ("due_date", "due_date"),
+    ("project_id", "effective_project_id"),
+    ("project", "effective_project__name"),
+    ("funding_id", "effective_funding_id"),
+    ("funding", "effective_funding__name"),
+    ("project_funding_id", "scope__project_funding_id"),
+    ("cost_amount", "cost_amount"),
+    ("cost_currency", "cost_currency"),
+    ("receipt_url", "receipt_url"),
+    ("receipt_note", "receipt_note"),
+    ("est_hours", "est_hours"),
+    ("worked_hours", "export_worked_hours"),
+    ("assignees", "export_assignees"),
+    ("created_at", "created_at"),
+    ("updated_at", "updated_at"),
+)
+
+
+class CSVRenderer(BaseRenderer):
+    """Pozwala DRF wynegocjować `?format=csv`; błędy jako tekst JSON."""
+
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data, cls=DjangoJSONEncoder).encode()
+
+
+class NDJSONRenderer(CSVRenderer):
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+
+def export_queryset(queryset):
+    """Queryset tasków -> `values_list` w kolejności `EXPORT_COLUMNS`."""
+    assignments = TaskAssignment.objects.filter(task_id=OuterRef("pk"))
+    return (
+        queryset.select_related(None)
+        .prefetch_related(None)
+        .annotate(
+            export_assignees=ArraySubquery(
+                assignments.order_by("user__username").values("user__username")
+            ),
+            export_worked_hours=Subquery(
+                assignments.order_by()
+                .values("task_id")
+                .annotate(total=Sum("worked_hours"))
+                .values("total"),
+                output_field=DecimalField(max_digits=12, decimal_places=2),
+            ),
+        )
+        .values_list(*(expression for _, expression in EXPORT_COLUMNS))
+    )
+
+
+_datetime_field = serializers.DateTimeField()
+
+
+def _plain(value):
+    if hasattr(value, "tzinfo"):  # datetime, same format as the API
+        return _datetime_field.to_representation(value)
+    return value
+
+
+def csv_lines(rows):
+    """CSV w kawałkach `FLUSH_BYTES`, najpierw nagłówek."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([name for name, _ in EXPORT_COLUMNS])
+    for row in rows:
+        writer.writerow(
+            [
+                ", ".join(value) if isinstance(value, list) else _plain(value)
+                for value in row
+            ]
+        )
+        if buffer.tell() >= FLUSH_BYTES:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def ndjson_lines(rows):
+    """Jeden obiekt JSON na linię, w kawałkach `FLUSH_BYTES`."""
+    names = [name for name, _ in EXPORT_COLUMNS]
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    pending, size = [], 0
+    for row in rows:
+        line = encoder.encode(dict(zip(names, map(_plain, row)))) + "\n"
+        pending.append(line)
+        size += len(line)
+        if size >= FLUSH_BYTES:
+            yield "".join(pending)
+            pending, size = [], 0
+    yield "".join(pending)
+
+
+def export_response(queryset, export_format, chunk_size=CHUNK_SIZE):
+    rows = export_queryset(queryset).iterator(chunk_size=chunk_size)
+    if export_format == NDJSONRenderer.format:
+        content, renderer = ndjson_lines(rows), NDJSONRenderer
+    else:
+        content, renderer = csv_lines(rows), CSVRenderer
+    filename = f"tasks-{timezone.localdate():%Y-%m-%d}.{renderer.format}"
+    response = StreamingHttpResponse(
+        content, content_type=f"{renderer.media_type}; charset=utf-8"
+    )
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
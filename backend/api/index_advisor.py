@@ -0,0 +1,158 @@
+"""Odtwarza zapytania API pod EXPLAIN i zgłasza skany sekwencyjne."""
+
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .models import Funding, Project, TaskAssignment
+
+DEFAULT_ENDPOINTS = (
+    "/api/tasks/",
+    "/api/tasks/?status=todo",
+    "/api/tasks/?project={project}",
+    "/api/tasks/?funding={funding}&status=todo",
+    "/api/tasks/?ordering=due_date",
+    "/api/tasks/?pagination=cursor",
+    "/api/tasks/?search=raport",
+    "/api/projects/",
+    "/api/projects/{project}/",
+    "/api/projects/{project}/board/",
+    "/api/projects/{project}/timeline/?from={today}&to={horizon}",
+    "/api/projects/{project}/stats/",
+    "/api/fundings/",
+    "/api/project-fundings/?project={project}",
+    "/api/task-assignments/?user={user}",
+    "/api/users/",
+    "/api/users/{user}/",
+)
+
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+
+
+@dataclass
+class SeqScan:
+    relation: str
+    filter: str
+    rows: int
+    time_ms: float
+    sql: str
+    endpoints: set = field(default_factory=set)
+
+
+def endpoint_context(user):
+    """Id podstawiane do szablonów endpointów (brakujące je pomijają)."""
+    today = timezone.localdate()
+    context = {"today": today, "horizon": today + timedelta(days=90)}
+    for name, model in (("project", Project), ("funding", Funding)):
+        pk = model.objects.order_by("pk").values_list("pk", flat=True).first()
+        if pk is not None:
+            context[name] = pk
+    assigned = (
+        TaskAssignment.objects.order_by("user_id")
+        .values_list("user_id", flat=True)
+        .first()
+    )
+    context["user"] = assigned or user.pk
+    return context
+
+
+def endpoint_urls(context, templates=DEFAULT_ENDPOINTS):
+    """Wypełnia szablony; te wymagające brakującego id są pomijane."""
+    urls = []
+    for template in templates:
+        try:
+            urls.append(template.format(**context))
+        except KeyError:
+            continue
+    return urls
+
+
+def shape(sql):
+    """SQL z podmienionymi literałami, żeby powtarzające się kształty szły raz."""
+    return _LITERAL_RE.sub("?", sql)
+
+
+def capture(client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        response = client.get(url)
+    return response.status_code, [q["sql"] for q in ctx.captured_queries]
+
+
+def explain(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}")
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):  # without a JSON loader the plan arrives as text
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+def seq_scans(plan):
+    """Wszystkie węzły `Seq Scan` drzewa planu."""
+    if plan.get("Node Type") == "Seq Scan":
+        yield plan
+    for child in plan.get("Plans", ()):
+        yield from seq_scans(child)
+
+
+def scanned_rows(node):
+    loops = node.get("Actual Loops", 1) or 1
+    return (node.get("Actual Rows", 0) + node.get("Rows Removed by Filter", 0)) * loops
+
+
+def _explain_shape(sql, min_rows):
+    try:
+        with transaction.atomic():
+            plan = explain(sql)
+    except DatabaseError:
+        return []
+    return [
+        SeqScan(
+            relation=node["Relation Name"],
+            filter=node.get("Filter", ""),
+            rows=scanned_rows(node),
+            time_ms=node.get("Actual Total Time", 0.0),
+            sql=shape(sql),
+        )
+        for node in seq_scans(plan)
+        if scanned_rows(node) >= min_rows
+    ]
+
+
+def replay(user, urls, min_rows):
+    """`(responses, findings)`; nic z tego, co zapisze odtworzenie, nie zostaje."""
+    client = APIClient()
+    client.force_authenticate(user=user)
+    responses = []
+    by_shape = {}
+
+    dummy_cache = {
+        "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+    }
+    allowed_hosts = [*settings.ALLOWED_HOSTS, "testserver"]
+    with override_settings(CACHES=dummy_cache, ALLOWED_HOSTS=allowed_hosts):
+        with transaction.atomic():
+            for url in urls:
+                status, statements = capture(client, url)
+                responses.append((url, status, len(statements)))
+                for sql in statements:
+                    if not sql.lstrip().upper().startswith("SELECT"):
+                        continue
+                    key = shape(sql)
+                    if key not in by_shape:
+                        by_shape[key] = _explain_shape(sql, min_rows)
+                    for scan in by_shape[key]:
+                        scan.endpoints.add(url)
+            transaction.set_rollback(True)
+
+    findings = [scan for scans in by_shape.values() for scan in scans]
+    return responses, sorted(findings, key=lambda scan: -scan.rows)
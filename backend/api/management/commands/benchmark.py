@@ -0,0 +1,149 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from api.benchmark import SCALES, SCENARIOS, compare, load_baseline, run, save_baseline
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / "benchmarks" / "baseline.json"
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark endpointów API: sieje dane w zadanej skali, odpytuje każdy "
+        "endpoint routera i porównuje liczbę zapytań, p50 i pamięć z "
+        "zapisanym baseline'em. Regresja kończy komendę błędem."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            action="append",
+            dest="scales",
+            choices=sorted(SCALES),
+            help="Skala danych (można podać wiele razy; domyślnie xs).",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=10,
+            help="Liczba mierzonych żądań na scenariusz.",
+        )
+        parser.add_argument(
+            "--only",
+            action="append",
+            default=[],
+            help="Uruchom tylko scenariusze, których nazwa zawiera ten tekst.",
+        )
+        parser.add_argument(
+            "--baseline",
+            type=Path,
+            default=DEFAULT_BASELINE,
+            help=f"Plik baseline'u (domyślnie {DEFAULT_BASELINE}).",
+        )
+        parser.add_argument(
+            "--update-baseline",
+            action="store_true",
+            help="Zapisz wyniki jako nowy baseline zamiast porównywać.",
+        )
+        parser.add_argument(
+            "--latency-tolerance",
+            type=float,
+            default=1.5,
+            help="Dopuszczalny wzrost p50 (mnożnik; 0 wyłącza sprawdzanie).",
+        )
+        parser.add_argument(
+            "--memory-tolerance",
+            type=float,
+            default=1.5,
+            help="Dopuszczalny wzrost szczytu pamięci (mnożnik; 0 wyłącza).",
+        )
+        parser.add_argument(
+            "--in-place",
+            action="store_true",
+            help="Mierz na bieżącej bazie zamiast na świeżej bazie testowej "
+            "(wszystko i tak jest wycofywane).",
+        )
+        parser.add_argument(
+            "--keepdb",
+            action="store_true",
+            help="Nie usuwaj bazy testowej po pomiarze.",
+        )
+        parser.add_argument(
+            "--json", action="store_true", help="Wyniki w formacie JSON."
+        )
+
+    def handle(self, *args, **options):
+        scales = options["scales"] or ["xs"]
+        scenarios = [
+            s
+            for s in SCENARIOS
+            if not options["only"] or any(part in s.name for part in options["only"])
+        ]
+        if not scenarios:
+            raise CommandError("Żaden scenariusz nie pasuje do --only.")
+
+        old_name = None
+        if not options["in_place"]:
+            old_name = connection.settings_dict["NAME"]
+            connection.creation.create_test_db(
+                verbosity=0, autoclobber=True, keepdb=options["keepdb"]
+            )
+        try:
+            results = {
+                scale: run(
+                    scale,
+                    repeat=options["repeat"],
+                    scenarios=scenarios,
+                    log=None if options["json"] else self._log,
+                )
+                for scale in scales
+            }
+        finally:
+            if old_name is not None:
+                connection.creation.destroy_test_db(
+                    old_name, verbosity=0, keepdb=options["keepdb"]
+                )
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+
+        baseline = load_baseline(options["baseline"])
+        if options["update_baseline"]:
+            for scale, scale_results in results.items():
+                baseline.setdefault(scale, {}).update(scale_results)
+            save_baseline(options["baseline"], baseline)
+            self.stderr.write(f"Zapisano baseline: {options['baseline']}")
+            return
+
+        regressions = []
+        for scale, scale_results in results.items():
+            if scale not in baseline:
+                self.stderr.write(f"Brak baseline'u dla skali {scale} — pomijam.")
+                continue
+            regressions += [
+                f"[{scale}] {line}"
+                for line in compare(
+                    scale_results,
+                    baseline[scale],
+                    latency_tolerance=options["latency_tolerance"],
+                    memory_tolerance=options["memory_tolerance"],
+                )
+            ]
+        if regressions:
+            raise CommandError(
+                "Regresje względem baseline'u:\n" + "\n".join(regressions)
+            )
+        self.stderr.write(self.style.SUCCESS("Bez regresji względem baseline'u."))
+
+    def _log(self, name, result):
+        style = self.style.SUCCESS if result["status"] < 400 else self.style.ERROR
+        self.stdout.write(
+            style(
+                f"{result['status']} {name}: {result['queries']} zapytań, "
+                f"p50 {result['p50_ms']} ms, p95 {result['p95_ms']} ms, "
+                f"{result['peak_kib']} KiB"
+            )
+        )
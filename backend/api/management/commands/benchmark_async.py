@@ -0,0 +1,109 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from api.benchmark import SCALES
+from api.benchmark_async import PAIRS, run
+
+
+class Command(BaseCommand):
+    help = (
+        "Porównanie ścieżki WSGI i ASGI (api.async_views) dla list i widoków "
+        "do odczytu: te same żądania przy stałej liczbie wątków WSGI i "
+        "współbieżnych żądań ASGI, na świeżej bazie testowej."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            default="xs",
+            choices=sorted(SCALES),
+            help="Skala danych (domyślnie xs).",
+        )
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=50,
+            help="Liczba żądań na endpoint i handler.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Wątki WSGI (jak `gunicorn --threads`).",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=20,
+            help="Maksymalna liczba równoczesnych żądań ASGI.",
+        )
+        parser.add_argument(
+            "--query-delay-ms",
+            type=float,
+            default=0,
+            help="Sztuczne opóźnienie każdego zapytania SQL (wolniejsza baza).",
+        )
+        parser.add_argument(
+            "--only",
+            action="append",
+            default=[],
+            help="Tylko endpointy, których nazwa zawiera ten tekst.",
+        )
+        parser.add_argument(
+            "--keepdb",
+            action="store_true",
+            help="Nie usuwaj bazy testowej po pomiarze.",
+        )
+        parser.add_argument(
+            "--json", action="store_true", help="Wyniki w formacie JSON."
+        )
+
+    def handle(self, *args, **options):
+        pairs = [
+            p
+            for p in PAIRS
+            if not options["only"] or any(part in p.name for part in options["only"])
+        ]
+        if not pairs:
+            raise CommandError("Żaden endpoint nie pasuje do --only.")
+        if min(options["requests"], options["workers"], options["concurrency"]) < 1:
+            raise CommandError(
+                "--requests, --workers i --concurrency muszą być dodatnie."
+            )
+
+        # Dane muszą być zatwierdzone (każdy wątek ma własne połączenie), więc
+        # zawsze na osobnej bazie testowej.
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, keepdb=options["keepdb"]
+        )
+        try:
+            results = run(
+                options["scale"],
+                pairs=pairs,
+                query_delay_ms=options["query_delay_ms"],
+                requests=options["requests"],
+                workers=options["workers"],
+                concurrency=options["concurrency"],
+                log=None if options["json"] else self._log,
+            )
+        finally:
+            connection.creation.destroy_test_db(
+                old_name, verbosity=0, keepdb=options["keepdb"]
+            )
+
+        if options["json"]:
+            self.stdout.write(json.dumps(results, indent=2))
+
+    def _log(self, name, kind, result):
+        style = self.style.ERROR if result["errors"] else self.style.SUCCESS
+        self.stdout.write(
+            style(
+                f"{kind} {name}: {result['requests']} żądań w "
+                f"{result['wall_ms']} ms ({result['rps']}/s), "
+                f"p50 {result['p50_ms']} ms, p95 {result['p95_ms']} ms, "
+                f"błędy {result['errors']}"
+            )
+        )
@@ -0,0 +1,184 @@
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from api.models import TaskImport
+from api.task_import import (
+    IMPORT_BATCH_SIZE,
+    ImportConflict,
+    ImportFormatError,
+    create_import,
+    run_import,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Import tasków z pliku CSV/XLSX partiami, z postępem i błędami per "
+        "wiersz. Przerwany import wznawia się od ostatniej zapisanej partii "
+        "(--job albo --queue --resume)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", nargs="?", help="Plik .csv albo .xlsx.")
+        parser.add_argument(
+            "--user",
+            help="Login użytkownika zapisywanego jako autor importu i przypisań.",
+        )
+        parser.add_argument(
+            "--job", type=int, help="Dokończ istniejący import o tym id."
+        )
+        parser.add_argument(
+            "--queue",
+            action="store_true",
+            help="Przetwarzaj importy zlecone przez API (`?defer=1`).",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help=(
+                "Z --queue: podejmij też importy przerwane (failed oraz running "
+                "bez postępu od --stale-after sekund)."
+            ),
+        )
+        parser.add_argument(
+            "--stale-after",
+            type=float,
+            default=600.0,
+            help=(
+                "Z --resume: po ilu sekundach bez zapisanej partii import "
+                "running uznajemy za porzucony przez worker."
+            ),
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Z --queue: nie kończ po opróżnieniu kolejki.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=5.0,
+            help="Przerwa (s) między sprawdzeniami kolejki w trybie --loop.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=IMPORT_BATCH_SIZE,
+            help="Ile wierszy zapisywać w jednej transakcji.",
+        )
+
+    def handle(self, *args, **options):
+        if sum(bool(options[key]) for key in ("path", "job", "queue")) != 1:
+            raise CommandError("Podaj dokładnie jedno z: ścieżka, --job, --queue.")
+
+        if options["queue"]:
+            self._run_queue(options)
+            return
+
+        if options["job"]:
+            try:
+                job = TaskImport.objects.get(pk=options["job"])
+            except TaskImport.DoesNotExist:
+                raise CommandError(f"Nie ma importu #{options['job']}.")
+        else:
+            job = self._create(options["path"], options["user"])
+        self._run(job, options["batch_size"])
+
+    def _create(self, path, username):
+        user = None
+        if username:
+            User = get_user_model()
+            try:
+                user = User.objects.get(username=username)
+            except User.DoesNotExist:
+                raise CommandError(f"Nie ma użytkownika {username!r}.")
+        path = Path(path)
+        if not path.is_file():
+            raise CommandError(f"Nie ma pliku {path}.")
+        try:
+            with path.open("rb") as fh:
+                return create_import(fh, path.name, created_by=user)
+        except ImportFormatError as exc:
+            raise CommandError(str(exc))
+
+    def _progress(self, job):
+        self.stdout.write(
+            f"{job}: wierszy {job.rows_done}, zaimportowano {job.imported}, "
+            f"błędnych {job.failed}"
+        )
+
+    def _run(self, job, batch_size):
+        try:
+            run_import(job, batch_size=batch_size, on_progress=self._progress)
+        except ImportConflict as exc:
+            raise CommandError(f"{job}: {exc}") from exc
+        except Exception as exc:
+            raise CommandError(
+                f"{job}: {exc} (wznów: import_tasks --job {job.pk})"
+            ) from exc
+        for entry in job.errors:
+            self.stdout.write(
+                self.style.WARNING(f"wiersz {entry['row']}: {entry['errors']}")
+            )
+        if job.failed > len(job.errors):
+            self.stdout.write(
+                self.style.WARNING(
+                    f"... i {job.failed - len(job.errors)} kolejnych błędów."
+                )
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{job}: zaimportowano {job.imported} tasków, "
+                f"błędnych wierszy {job.failed}."
+            )
+        )
+
+    def _claim(self, claimable, seen):
+        with transaction.atomic():
+            job = (
+                TaskImport.objects.select_for_update(skip_locked=True)
+                .filter(claimable)
+                .exclude(pk__in=seen)
+                .order_by("created_at")
+                .first()
+            )
+            if job is not None:
+                job.status = TaskImport.Status.RUNNING
+                job.save(update_fields=["status", "updated_at"])
+            return job
+
+    def _run_queue(self, options):
+        processed = 0
+        seen = set()
+        while True:
+            claimable = Q(status=TaskImport.Status.PENDING)
+            if options["resume"]:
+                # Running import zapisuje `updated_at` z każdą partią; świeży
+                # może wciąż przetwarzać inny worker.
+                stale = timezone.now() - timedelta(seconds=options["stale_after"])
+                claimable |= Q(status=TaskImport.Status.FAILED) | Q(
+                    status=TaskImport.Status.RUNNING, updated_at__lt=stale
+                )
+            job = self._claim(claimable, seen)
+            if job is None:
+                if not options["loop"]:
+                    break
+                time.sleep(options["sleep"])
+                continue
+
+            seen.add(job.pk)
+            try:
+                self._run(job, options["batch_size"])
+            except CommandError as exc:
+                self.stdout.write(self.style.ERROR(str(exc)))
+                continue
+            processed += 1
+
+        self.stdout.write(f"Przetworzono importów: {processed}")
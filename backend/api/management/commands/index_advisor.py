@@ -0,0 +1,110 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from api.index_advisor import endpoint_context, endpoint_urls, replay
+
+
+class Command(BaseCommand):
+    help = (
+        "Odtwarza zapytania endpointów API na bieżącej bazie, uruchamia "
+        "EXPLAIN (ANALYZE, BUFFERS) i wypisuje skany sekwencyjne."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url",
+            action="append",
+            dest="urls",
+            default=[],
+            help="Dodatkowy endpoint do odtworzenia (można podać wiele razy).",
+        )
+        parser.add_argument(
+            "--only",
+            action="store_true",
+            help="Odtwórz tylko endpointy z --url, bez domyślnej listy.",
+        )
+        parser.add_argument(
+            "--min-rows",
+            type=int,
+            default=1000,
+            help="Pomijaj skany czytające mniej wierszy (małe tabele).",
+        )
+        parser.add_argument(
+            "--user",
+            help="Login użytkownika, w imieniu którego idą zapytania "
+            "(domyślnie pierwszy superuser albo pierwszy user).",
+        )
+        parser.add_argument(
+            "--json", action="store_true", help="Raport w formacie JSON."
+        )
+
+    def _user(self, username):
+        User = get_user_model()
+        if username:
+            try:
+                return User.objects.get(username=username)
+            except User.DoesNotExist:
+                raise CommandError(f"Nie ma użytkownika {username!r}.")
+        user = User.objects.order_by("-is_superuser", "pk").first()
+        if user is None:
+            raise CommandError("Baza nie ma żadnego użytkownika — uruchom seed_demo.")
+        return user
+
+    def handle(self, *args, **options):
+        user = self._user(options["user"])
+        urls = [] if options["only"] else endpoint_urls(endpoint_context(user))
+        urls += options["urls"]
+        responses, findings = replay(user, urls, options["min_rows"])
+
+        if options["json"]:
+            self.stdout.write(
+                json.dumps(
+                    {
+                        "endpoints": [
+                            {"url": url, "status": status, "queries": queries}
+                            for url, status, queries in responses
+                        ],
+                        "seq_scans": [
+                            {
+                                "relation": scan.relation,
+                                "filter": scan.filter,
+                                "rows": scan.rows,
+                                "time_ms": scan.time_ms,
+                                "endpoints": sorted(scan.endpoints),
+                                "sql": scan.sql,
+                            }
+                            for scan in findings
+                        ],
+                    },
+                    indent=2,
+                )
+            )
+            return
+
+        for url, status, queries in responses:
+            style = self.style.SUCCESS if status == 200 else self.style.ERROR
+            self.stdout.write(style(f"{status} {url} ({queries} zapytań)"))
+
+        if not findings:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Brak skanów sekwencyjnych >= {options['min_rows']} wierszy."
+                )
+            )
+            return
+        self.stdout.write("")
+        for scan in findings:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"Seq Scan {scan.relation}: {scan.rows} wierszy, "
+                    f"{scan.time_ms:.1f} ms"
+                )
+            )
+            if scan.filter:
+                self.stdout.write(f"  filtr: {scan.filter}")
+            for url in sorted(scan.endpoints):
+                self.stdout.write(f"  {url}")
+            if options["verbosity"] > 1:
+                self.stdout.write(f"  {scan.sql}")
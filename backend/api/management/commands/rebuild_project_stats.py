@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand
+
+from api.models import Project, ProjectFunding
+from api.rebuild import rebuild_in_chunks
+from api.stats import recompute_stats
+
+
+class Command(BaseCommand):
+    help = "Przelicza od zera tabelę ProjectStats (naprawa po imporcie lub błędzie)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--project",
+            type=int,
+            action="append",
+            dest="projects",
+            help="Przelicz tylko ten projekt (można podać wiele razy).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Liczba równoległych wątków (każdy z własnym połączeniem do bazy).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=200,
+            help="Ile projektów przelicza jeden wątek naraz.",
+        )
+
+    def _rebuild(self, project_ids):
+        link_ids = list(
+            ProjectFunding.objects.filter(project_id__in=project_ids).values_list(
+                "pk", flat=True
+            )
+        )
+        recompute_stats(project_ids=project_ids, project_funding_ids=link_ids)
+        return len(project_ids), len(link_ids)
+
+    def handle(self, *args, **options):
+        projects = Project.objects.order_by("pk")
+        if options["projects"]:
+            projects = projects.filter(pk__in=options["projects"])
+        results = rebuild_in_chunks(
+            list(projects.values_list("pk", flat=True)),
+            self._rebuild,
+            chunk_size=options["chunk_size"],
+            workers=options["workers"],
+        )
+        projects_done = sum(r[0] for r in results)
+        links_done = sum(r[1] for r in results)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Przeliczono statystyki: {projects_done} projektów, "
+                f"{links_done} powiązań z finansowaniem."
+            )
+        )
@@ -0,0 +1,53 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from api.rebuild import rebuild_in_chunks
+from api.workload import recompute_workload
+
+
+class Command(BaseCommand):
+    help = (
+        "Przelicza od zera tabelę UserWorkload (liczniki zadań i godzin "
+        "użytkowników) — naprawa po imporcie lub błędzie."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            type=int,
+            action="append",
+            dest="users",
+            help="Przelicz tylko tego użytkownika (id; można podać wiele razy).",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Liczba równoległych wątków (każdy z własnym połączeniem do bazy).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=500,
+            help="Ilu użytkowników przelicza jeden wątek naraz.",
+        )
+
+    def _rebuild(self, user_ids):
+        recompute_workload(user_ids)
+        return len(user_ids)
+
+    def handle(self, *args, **options):
+        users = get_user_model().objects.order_by("pk")
+        if options["users"]:
+            users = users.filter(pk__in=options["users"])
+        done = sum(
+            rebuild_in_chunks(
+                list(users.values_list("pk", flat=True)),
+                self._rebuild,
+                chunk_size=options["chunk_size"],
+                workers=options["workers"],
+            )
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Przeliczono liczniki {done} użytkowników.")
+        )
@@ -0,0 +1,98 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from api.cleanup import CLEANUP_BATCH_SIZE, run_cleanup
+from api.models import ProjectFundingCleanup
+
+
+class Command(BaseCommand):
+    help = "Przetwarza odroczone odpinanie finansowań (ProjectFundingCleanup)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=CLEANUP_BATCH_SIZE,
+            help="Ile tasków usuwać w jednej transakcji.",
+        )
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            help="Nie kończ po opróżnieniu kolejki — czekaj na nowe zlecenia.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=5.0,
+            help="Przerwa (s) między sprawdzeniami kolejki w trybie --loop.",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help=(
+                "Podejmij też zlecenia przerwane (failed oraz running bez "
+                "postępu od --stale-after sekund)."
+            ),
+        )
+        parser.add_argument(
+            "--stale-after",
+            type=float,
+            default=600.0,
+            help=(
+                "Z --resume: po ilu sekundach bez zapisanej partii zlecenie "
+                "running uznajemy za porzucone przez worker."
+            ),
+        )
+
+    def _claim(self, claimable, seen):
+        with transaction.atomic():
+            job = (
+                ProjectFundingCleanup.objects.select_for_update(skip_locked=True)
+                .filter(claimable)
+                .exclude(pk__in=seen)
+                .order_by("created_at")
+                .first()
+            )
+            if job is not None:
+                job.status = ProjectFundingCleanup.Status.RUNNING
+                job.save(update_fields=["status", "updated_at"])
+            return job
+
+    def handle(self, *args, **options):
+        processed = 0
+        seen = set()
+        while True:
+            claimable = Q(status=ProjectFundingCleanup.Status.PENDING)
+            if options["resume"]:
+                # Running zlecenie zapisuje `updated_at` z każdą partią; świeże
+                # może wciąż przetwarzać inny worker.
+                stale = timezone.now() - timedelta(seconds=options["stale_after"])
+                claimable |= Q(status=ProjectFundingCleanup.Status.FAILED) | Q(
+                    status=ProjectFundingCleanup.Status.RUNNING, updated_at__lt=stale
+                )
+            job = self._claim(claimable, seen)
+            if job is None:
+                if not options["loop"]:
+                    break
+                time.sleep(options["sleep"])
+                continue
+
+            # Każde zlecenie podejmujemy raz na przebieg, żeby nieudane nie
+            # kręciło się w kółko.
+            seen.add(job.pk)
+            try:
+                run_cleanup(job, batch_size=options["batch_size"])
+            except Exception as exc:
+                self.stdout.write(self.style.ERROR(f"{job}: {exc}"))
+                continue
+            processed += 1
+            self.stdout.write(
+                self.style.SUCCESS(f"{job}: usunięto {job.deleted} tasków.")
+            )
+
+        self.stdout.write(f"Przetworzono zleceń: {processed}")
@@ -5,6 +5,7 @@ from django.utils import timezone
 from datetime import date, timedelta
 
 from api.models import Project, Funding, FundingTask, ProjectFunding, Task
+from api.synthetic import SyntheticDataGenerator
 
 
 class Command(BaseCommand):
@@ -17,8 +18,62 @@ class Command(BaseCommand):
             help="Usuwa dane demo przed ponownym dodaniem.",
         )
 
-    @transaction.atomic
+        scale = parser.add_argument_group(
+            "dane syntetyczne",
+            "Z --scale zamiast danych demo generuje duży, skośny zbiór do testów "
+            "obciążeniowych (kilka ogromnych projektów, długi ogon małych).",
+        )
+        scale.add_argument(
+            "--scale",
+            action="store_true",
+            help="Generuje dane syntetyczne zamiast danych demo.",
+        )
+        scale.add_argument("--projects", type=int, default=1000)
+        scale.add_argument(
+            "--tasks-per-project",
+            type=int,
+            default=100,
+            help="Średnia liczba tasków na projekt (rozkład Zipfa).",
+        )
+        scale.add_argument("--users", type=int, default=500)
+        scale.add_argument("--fundings", type=int, default=100)
+        scale.add_argument(
+            "--seed",
+            type=int,
+            default=42,
+            help="Ziarno generatora; te same argumenty dają te same dane.",
+        )
+        scale.add_argument(
+            "--batch-size",
+            type=int,
+            default=50_000,
+            help="Liczba tasków na jedną partię COPY.",
+        )
+
     def handle(self, *args, **options):
+        if options["scale"]:
+            self.seed_scale(options)
+        else:
+            self.seed_demo(options)
+
+    def seed_scale(self, options):
+        self.stdout.write(self.style.MIGRATE_HEADING("== SEED SCALE START =="))
+        generator = SyntheticDataGenerator(
+            projects=options["projects"],
+            tasks_per_project=options["tasks_per_project"],
+            users=options["users"],
+            fundings=options["fundings"],
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            log=lambda message: self.stdout.write(f"Taski: {message}"),
+        )
+        summary = generator.run()
+        for name, value in summary.items():
+            self.stdout.write(self.style.HTTP_INFO(f"{name}: {value}"))
+        self.stdout.write(self.style.SUCCESS("== SEED SCALE DONE =="))
+
+    @transaction.atomic
+    def seed_demo(self, options):
         self.stdout.write(self.style.MIGRATE_HEADING("== SEED DEMO START =="))
 
         User = get_user_model()
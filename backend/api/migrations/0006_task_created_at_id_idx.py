@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_taskassignment_alter_task_assignees_userprofile'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['created_at', 'id'], name='task_created_at_id_idx'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:00
+
+from django.db import migrations, models
+
+
+def backfill_template_origins(apps, schema_editor):
+    """Mark existing template-generated tasks so regeneration skips them."""
+    TaskScope = apps.get_model("api", "TaskScope")
+    seen = set()
+    scopes = (
+        TaskScope.objects.filter(
+            project_funding__isnull=False,
+            funding_scoped=True,
+            task__template__isnull=False,
+        )
+        .order_by("task_id")
+        .values_list("id", "project_funding_id", "task__template_id")
+    )
+    for scope_id, pf_id, template_id in scopes.iterator():
+        if (pf_id, template_id) in seen:
+            continue
+        seen.add((pf_id, template_id))
+        TaskScope.objects.filter(pk=scope_id).update(
+            origin_key=f"template:{template_id}"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0006_task_created_at_id_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="taskscope",
+            name="origin_key",
+            field=models.CharField(blank=True, default="", max_length=40),
+        ),
+        migrations.RunPython(backfill_template_origins, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="taskscope",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("origin_key", ""), _negated=True),
+                fields=("project_funding", "origin_key"),
+                name="taskscope_pf_origin_uniq",
+            ),
+        ),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0008_projectfundingcleanup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProjectStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("todo_count", models.IntegerField(default=0)),
+                ("doing_count", models.IntegerField(default=0)),
+                ("done_count", models.IntegerField(default=0)),
+                ("overdue_count", models.IntegerField(default=0)),
+                ("overdue_as_of", models.DateField()),
+                ("cost_by_currency", models.JSONField(blank=True, default=dict)),
+                (
+                    "est_hours",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                (
+                    "worked_hours",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "project",
+                    models.OneToOneField(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stats",
+                        to="api.project",
+                    ),
+                ),
+                (
+                    "project_funding",
+                    models.OneToOneField(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stats",
+                        to="api.projectfunding",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "project stats",
+                "constraints": [
+                    models.CheckConstraint(
+                        condition=models.Q(
+                            models.Q(
+                                ("project__isnull", False),
+                                ("project_funding__isnull", True),
+                            ),
+                            models.Q(
+                                ("project__isnull", True),
+                                ("project_funding__isnull", False),
+                            ),
+                            _connector="OR",
+                        ),
+                        name="projectstats_exactly_one",
+                    )
+                ],
+            },
+        ),
+    ]
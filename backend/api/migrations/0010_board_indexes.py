@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0009_projectstats"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="taskscope",
+            name="api_tasksco_project_232fb5_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="taskscope",
+            name="api_tasksco_project_39ffb7_idx",
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["status", "priority", "id"], name="task_status_priority_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="taskscope",
+            index=models.Index(
+                fields=["project", "task"], name="taskscope_project_task_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="taskscope",
+            index=models.Index(
+                fields=["project_funding", "task"], name="taskscope_pf_task_idx"
+            ),
+        ),
+    ]
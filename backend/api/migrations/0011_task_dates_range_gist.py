@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:27
+
+import django.contrib.postgres.fields.ranges
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0010_board_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=django.contrib.postgres.indexes.GistIndex(
+                models.Func(
+                    models.F("start_date"),
+                    models.F("due_date"),
+                    models.Value("[]"),
+                    function="daterange",
+                    output_field=django.contrib.postgres.fields.ranges.DateRangeField(),
+                ),
+                condition=models.Q(
+                    ("due_date__isnull", False), ("start_date__isnull", False)
+                ),
+                name="task_dates_range_gist",
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0011_task_dates_range_gist"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="funding",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="projectfunding",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
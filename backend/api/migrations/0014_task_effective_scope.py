@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:45
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+BACKFILL = """
+UPDATE api_task AS t
+SET effective_project_id = COALESCE(s.project_id, pf.project_id),
+    effective_funding_id = COALESCE(s.funding_id, pf.funding_id)
+FROM api_taskscope AS s
+LEFT JOIN api_projectfunding AS pf ON pf.id = s.project_funding_id
+WHERE s.task_id = t.id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0013_search_vectors"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="effective_funding",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="effective_tasks",
+                to="api.funding",
+            ),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="effective_project",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="effective_tasks",
+                to="api.project",
+            ),
+        ),
+        migrations.RunSQL(BACKFILL, migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["effective_project", "status", "created_at", "id"],
+                name="task_eff_project_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["effective_funding", "status", "created_at", "id"],
+                name="task_eff_funding_idx",
+            ),
+        ),
+    ]
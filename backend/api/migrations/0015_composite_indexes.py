@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0014_task_effective_scope"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="funding",
+            index=models.Index(fields=["created_at"], name="funding_created_at_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(fields=["created_at"], name="project_created_at_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="projectfunding",
+            index=models.Index(
+                fields=["project", "created_at"], name="projectfunding_project_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["status", "created_at", "id"], name="task_status_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["due_date", "id"], name="task_due_date_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(
+                    ("due_date__isnull", False),
+                    models.Q(("status", "done"), _negated=True),
+                ),
+                fields=["effective_project", "due_date"],
+                name="task_open_due_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="taskassignment",
+            index=models.Index(
+                fields=["user", "assigned_at"], name="taskassignment_user_at_idx"
+            ),
+        ),
+    ]
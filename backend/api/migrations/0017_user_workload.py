@@ -0,0 +1,75 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+BACKFILL = """
+INSERT INTO api_userworkload (
+    user_id, todo_count, doing_count, done_count, overdue_count,
+    overdue_as_of, worked_hours, updated_at
+)
+SELECT u.id,
+       count(t.id) FILTER (WHERE t.status = 'todo'),
+       count(t.id) FILTER (WHERE t.status = 'doing'),
+       count(t.id) FILTER (WHERE t.status = 'done'),
+       count(t.id) FILTER (WHERE t.status <> 'done' AND t.due_date < current_date),
+       current_date,
+       coalesce(sum(a.worked_hours), 0),
+       now()
+FROM auth_user AS u
+LEFT JOIN api_taskassignment AS a ON a.user_id = u.id
+LEFT JOIN api_task AS t ON t.id = a.task_id
+GROUP BY u.id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0016_task_import"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserWorkload",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("todo_count", models.IntegerField(default=0)),
+                ("doing_count", models.IntegerField(default=0)),
+                ("done_count", models.IntegerField(default=0)),
+                ("overdue_count", models.IntegerField(default=0)),
+                ("overdue_as_of", models.DateField()),
+                (
+                    "worked_hours",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=12),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "user",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="workload",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["overdue_as_of"], name="userworkload_as_of_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.RunSQL(BACKFILL, migrations.RunSQL.noop),
+    ]
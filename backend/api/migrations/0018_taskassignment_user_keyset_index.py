@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 00:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0017_user_workload"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="taskassignment",
+            name="taskassignment_user_at_idx",
+        ),
+        migrations.AddIndex(
+            model_name="taskassignment",
+            index=models.Index(
+                fields=["user", "assigned_at", "id"],
+                name="taskassignment_user_at_id_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0018_taskassignment_user_keyset_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="task",
+            name="task_status_priority_idx",
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["effective_project", "status", "priority", "id"],
+                name="task_eff_project_priority_idx",
+            ),
+        ),
+    ]
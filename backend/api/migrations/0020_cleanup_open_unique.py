@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 01:42
+
+from django.db import migrations, models
+
+OPEN = ["pending", "running", "failed"]
+
+
+def drop_duplicate_jobs(apps, schema_editor):
+    # Zostaje najstarsze otwarte zlecenie danego powiązania.
+    Cleanup = apps.get_model("api", "ProjectFundingCleanup")
+    kept = set()
+    for job in Cleanup.objects.filter(
+        status__in=OPEN, project_funding__isnull=False
+    ).order_by("created_at", "pk"):
+        if job.project_funding_id in kept:
+            job.delete()
+        else:
+            kept.add(job.project_funding_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0019_board_project_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_jobs, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="projectfundingcleanup",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("status__in", ["pending", "running", "failed"])),
+                fields=("project_funding",),
+                name="pfcleanup_open_uniq",
+            ),
+        ),
+    ]
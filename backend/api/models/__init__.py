@@ -4,6 +4,10 @@ from .task import Task
 from .task_scope import TaskScope
 from .user_profile import UserProfile
 from .task_assignment import TaskAssignment
+from .cleanup_job import ProjectFundingCleanup
+from .task_import import TaskImport
+from .project_stats import ProjectStats
+from .user_workload import UserWorkload
 
 __all__ = [
     "Funding",
@@ -14,4 +18,8 @@ __all__ = [
     "TaskScope",
     "UserProfile",
     "TaskAssignment",
+    "ProjectFundingCleanup",
+    "TaskImport",
+    "ProjectStats",
+    "UserWorkload",
 ]
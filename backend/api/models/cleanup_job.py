@@ -0,0 +1,51 @@
+from django.db import models
+from django.db.models import Q
+
+
+class ProjectFundingCleanup(models.Model):
+    """
+    Deferred unlink of a ProjectFunding: deletes its generated (funding-scoped)
+    tasks in bounded batches and finally the ProjectFunding itself. Progress is
+    committed after every batch, so a crashed job can simply be picked up again.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    project_funding = models.ForeignKey(
+        "api.ProjectFunding",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="cleanups",
+    )
+    label = models.CharField(max_length=255, blank=True)
+
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.PENDING
+    )
+    total = models.PositiveIntegerField(default=0)
+    deleted = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["status", "created_at"])]
+        constraints = [
+            # Jedno otwarte zlecenie na powiązanie; nieudane wznawiamy.
+            models.UniqueConstraint(
+                fields=["project_funding"],
+                condition=Q(status__in=["pending", "running", "failed"]),
+                name="pfcleanup_open_uniq",
+            ),
+        ]
+
+    def __str__(self):
+        return f"cleanup #{self.pk} {self.label} ({self.status})"
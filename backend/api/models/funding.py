@@ -2,6 +2,8 @@ from django.db import models
 from django.core.validators import MinValueValidator
 from django.db.models import Q, F
 
+from .search import search_vector_field, search_vector_index, trigram_index
+
 
 class Funding(models.Model):
     class Type(models.TextChoices):
@@ -30,6 +32,11 @@ class Funding(models.Model):
     description = models.TextField(blank=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    search_vector = search_vector_field(
+        name="A", funder="B", program="B", agreement_number="B", description="C"
+    )
 
     class Meta:
         constraints = [
@@ -42,6 +49,12 @@ class Funding(models.Model):
                 name="funding_dates_ok",
             ),
         ]
+        indexes = [
+            models.Index(fields=["created_at"], name="funding_created_at_idx"),
+            search_vector_index("funding_search_vector_gin"),
+            trigram_index("name", "funding_name_trgm"),
+            trigram_index("agreement_number", "funding_agreement_trgm"),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.get_type_display()})"
@@ -61,6 +74,7 @@ class ProjectFunding(models.Model):
     note = models.TextField(blank=True)
 
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ("project", "funding")
@@ -74,6 +88,12 @@ class ProjectFunding(models.Model):
                 name="projectfunding_dates_ok",
             ),
         ]
+        indexes = [
+            # ?project= lists, newest link first.
+            models.Index(
+                fields=["project", "created_at"], name="projectfunding_project_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.project.name} ↔ {self.funding.name}"
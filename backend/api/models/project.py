@@ -2,6 +2,8 @@ from django.db import models
 from django.db.models import Q, F
 from django.conf import settings
 
+from .search import search_vector_field, search_vector_index, trigram_index
+
 
 class Project(models.Model):
     class Status(models.TextChoices):
@@ -31,6 +33,8 @@ class Project(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    search_vector = search_vector_field(name="A", description="B")
+
     class Meta:
         constraints = [
             models.CheckConstraint(
@@ -42,6 +46,11 @@ class Project(models.Model):
                 name="project_dates_ok",
             ),
         ]
+        indexes = [
+            models.Index(fields=["created_at"], name="project_created_at_idx"),
+            search_vector_index("project_search_vector_gin"),
+            trigram_index("name", "project_name_trgm"),
+        ]
 
     def __str__(self):
         return self.name
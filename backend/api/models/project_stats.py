@@ -0,0 +1,74 @@
+from django.db import models
+from django.db.models import Q
+
+
+class ProjectStats(models.Model):
+    """
+    Precomputed task statistics for a project or a project-funding link.
+
+    Exactly one of ``project`` / ``project_funding`` is set. A project row
+    covers the same tasks as ``/api/tasks/?project=`` (tasks scoped to the
+    project and to any of its funding links); a link row covers the tasks
+    scoped to that link. Rows are kept current by ``api.stats`` and can be
+    rebuilt with ``manage.py rebuild_project_stats``.
+
+    ``overdue_count`` is only exact for ``overdue_as_of``; readers go through
+    ``api.stats.get_stats`` which recounts it once the date has passed.
+    ``cost_by_currency`` maps a currency code to the summed ``cost_amount``
+    as a decimal string.
+    """
+
+    project = models.OneToOneField(
+        "api.Project",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="stats",
+    )
+    project_funding = models.OneToOneField(
+        "api.ProjectFunding",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="stats",
+    )
+
+    todo_count = models.IntegerField(default=0)
+    doing_count = models.IntegerField(default=0)
+    done_count = models.IntegerField(default=0)
+    overdue_count = models.IntegerField(default=0)
+    overdue_as_of = models.DateField()
+
+    cost_by_currency = models.JSONField(default=dict, blank=True)
+    est_hours = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    worked_hours = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "project stats"
+        constraints = [
+            models.CheckConstraint(
+                name="projectstats_exactly_one",
+                condition=(
+                    (Q(project__isnull=False) & Q(project_funding__isnull=True))
+                    | (Q(project__isnull=True) & Q(project_funding__isnull=False))
+                ),
+            ),
+        ]
+
+    @property
+    def target(self):
+        """``(kind, pk)`` key used by ``api.stats``."""
+        if self.project_id:
+            return ("project", self.project_id)
+        return ("project_funding", self.project_funding_id)
+
+    @property
+    def task_count(self) -> int:
+        return self.todo_count + self.doing_count + self.done_count
+
+    def __str__(self):
+        if self.project_id:
+            return f"stats:project={self.project_id}"
+        return f"stats:PF={self.project_funding_id}"
@@ -0,0 +1,35 @@
+"""Kolumny `search_vector` i indeksy trigramowe pod wyszukiwanie (`api.search`)."""
+
+from __future__ import annotations
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db import models
+from django.db.models.functions import Upper
+
+SEARCH_CONFIG = "simple"
+
+
+def search_vector_field(**weights):
+    """Składowana kolumna `tsvector`; `weights` mapuje pole na A/B/C/D."""
+    vectors = [
+        SearchVector(name, weight=weight, config=SEARCH_CONFIG)
+        for name, weight in weights.items()
+    ]
+    expression = vectors[0]
+    for vector in vectors[1:]:
+        expression = expression + vector
+    return models.GeneratedField(
+        expression=expression,
+        output_field=SearchVectorField(),
+        db_persist=True,
+        editable=False,
+    )
+
+
+def search_vector_index(name):
+    return GinIndex(fields=["search_vector"], name=name)
+
+
+def trigram_index(field, name):
+    return GinIndex(OpClass(Upper(field), name="gin_trgm_ops"), name=name)
@@ -7,8 +7,15 @@ belongs (project, funding, or a project-funding relation).
 from __future__ import annotations
 
 from django.conf import settings
+from django.contrib.postgres.fields import DateRangeField
+from django.contrib.postgres.indexes import GistIndex
 from django.db import models
-from django.db.models import F, Q
+from django.db.models import F, Func, Q, Value
+
+from .search import search_vector_field, search_vector_index, trigram_index
+
+# Written only by api.effective_scope (see Task.save).
+SYNCED_FIELDS = ("effective_project", "effective_funding")
 
 
 class Task(models.Model):
@@ -33,6 +40,11 @@ class Task(models.Model):
         template: Optional reference to a FundingTask template.
         created_at: Timestamp when the task was created.
         updated_at: Timestamp when the task was last updated.
+        effective_project: Project the task belongs to, directly or through a
+            project-funding link (denormalized from TaskScope).
+        effective_funding: Funding the task belongs to, directly or through a
+            project-funding link (denormalized from TaskScope).
+        search_vector: Generated full-text vector (title > description).
     """
 
     class Status(models.TextChoices):
@@ -101,6 +113,26 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Denormalized from TaskScope; see SYNCED_FIELDS.
+    effective_project = models.ForeignKey(
+        "api.Project",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="effective_tasks",
+    )
+    effective_funding = models.ForeignKey(
+        "api.Funding",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        editable=False,
+        related_name="effective_tasks",
+    )
+
+    search_vector = search_vector_field(title="A", description="B")
+
     class Meta:
         """Meta options for Task."""
 
@@ -115,6 +147,76 @@ class Task(models.Model):
             ),
         ]
 
+        indexes = [
+            # Keyset pagination walks (created_at, id) in both directions.
+            models.Index(fields=["created_at", "id"], name="task_created_at_id_idx"),
+            # Kanban columns: one project and status, highest priority first,
+            # id as the keyset tie-breaker (scanned backwards).
+            models.Index(
+                fields=["effective_project", "status", "priority", "id"],
+                name="task_eff_project_priority_idx",
+            ),
+            # Timeline window queries: daterange(start, due) && daterange(from, to).
+            GistIndex(
+                Func(
+                    F("start_date"),
+                    F("due_date"),
+                    Value("[]"),
+                    function="daterange",
+                    output_field=DateRangeField(),
+                ),
+                name="task_dates_range_gist",
+                condition=Q(start_date__isnull=False, due_date__isnull=False),
+            ),
+            # ?project= / ?funding= (optionally with ?status=) as one range
+            # scan, newest first.
+            models.Index(
+                fields=["effective_project", "status", "created_at", "id"],
+                name="task_eff_project_idx",
+            ),
+            models.Index(
+                fields=["effective_funding", "status", "created_at", "id"],
+                name="task_eff_funding_idx",
+            ),
+            # Default list filter/order: ?status= newest first.
+            models.Index(
+                fields=["status", "created_at", "id"], name="task_status_created_idx"
+            ),
+            models.Index(fields=["due_date", "id"], name="task_due_date_idx"),
+            # Overdue counts per project only ever look at open tasks.
+            models.Index(
+                fields=["effective_project", "due_date"],
+                name="task_open_due_idx",
+                condition=Q(due_date__isnull=False) & ~Q(status="done"),
+            ),
+            search_vector_index("task_search_vector_gin"),
+            trigram_index("title", "task_title_trgm"),
+        ]
+
     def __str__(self) -> str:
         """Return a human-readable representation of the task."""
         return self.title
+
+    def save(self, *args, **kwargs):
+        """Save the task without writing back the denormalized scope columns.
+
+        ``effective_project``/``effective_funding`` are maintained with
+        queryset updates (api.effective_scope), so an instance loaded before
+        its scope changed holds stale values. A plain ``save()`` of an
+        existing task therefore lists every other loaded field explicitly.
+        """
+        if (
+            kwargs.get("update_fields") is None
+            and not kwargs.get("force_insert")
+            and not self._state.adding
+        ):
+            deferred = self.get_deferred_fields()
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and not field.generated
+                and field.name not in SYNCED_FIELDS
+                and field.attname not in deferred
+            ]
+        super().save(*args, **kwargs)
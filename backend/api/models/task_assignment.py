@@ -41,6 +41,14 @@ class TaskAssignment(models.Model):
     class Meta:
         unique_together = ("task", "user")
         ordering = ["-assigned_at"]
+        indexes = [
+            # ?user= lists and /api/users/{id}/tasks/ (keyset on assigned_at,
+            # id), newest assignment first.
+            models.Index(
+                fields=["user", "assigned_at", "id"],
+                name="taskassignment_user_at_id_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user} -> {self.task}"
@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.db import models
+
+
+class TaskImport(models.Model):
+    """
+    Import of tasks from an uploaded CSV/XLSX file. The file is read as a
+    stream and written in chunks; ``rows_done`` (data rows consumed so far) is
+    committed together with every chunk, so an interrupted import resumes
+    after the last committed chunk instead of starting over.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        RUNNING = "running", "Running"
+        DONE = "done", "Done"
+        FAILED = "failed", "Failed"
+
+    class Format(models.TextChoices):
+        CSV = "csv", "CSV"
+        XLSX = "xlsx", "XLSX"
+
+    file = models.FileField(upload_to="imports/%Y/%m/")
+    format = models.CharField(max_length=4, choices=Format.choices)
+    label = models.CharField(max_length=255, blank=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="task_imports",
+    )
+
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.PENDING
+    )
+    rows_done = models.PositiveIntegerField(default=0)
+    imported = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    # Per-row errors, ``[{"row": 7, "errors": {...}}, ...]``, capped.
+    errors = models.JSONField(default=list, blank=True)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [models.Index(fields=["status", "created_at"])]
+
+    def __str__(self):
+        return f"import #{self.pk} {self.label} ({self.status})"
@@ -20,6 +20,9 @@ class TaskScope(models.Model):
             belongs.
         funding_scoped: Flag indicating that this scope originated from a
             funding context (via ProjectFunding).
+        origin_key: For tasks generated from a funding context, what they were
+            generated from (``template:<FundingTask id>`` or ``task:<Task id>``).
+            Unique per project_funding, so generation is idempotent.
         created_at: Timestamp when this scope record was created.
     """
 
@@ -52,6 +55,7 @@ class TaskScope(models.Model):
     )
 
     funding_scoped = models.BooleanField(default=False)
+    origin_key = models.CharField(max_length=40, blank=True, default="")
 
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -79,12 +83,21 @@ class TaskScope(models.Model):
                     )
                 ),
             ),
+            models.UniqueConstraint(
+                fields=["project_funding", "origin_key"],
+                condition=~Q(origin_key=""),
+                name="taskscope_pf_origin_uniq",
+            ),
         ]
 
         indexes = [
-            models.Index(fields=["project"]),
+            # (scope, task) lets "tasks of a project" be answered from the
+            # index alone before joining Task on its primary key.
+            models.Index(fields=["project", "task"], name="taskscope_project_task_idx"),
             models.Index(fields=["funding"]),
-            models.Index(fields=["project_funding"]),
+            models.Index(
+                fields=["project_funding", "task"], name="taskscope_pf_task_idx"
+            ),
             models.Index(fields=["funding_scoped"]),
         ]
 
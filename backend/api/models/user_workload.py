@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.db import models
+
+
+class UserWorkload(models.Model):
+    """
+    Precomputed task counters of a user, over the tasks they are assigned to.
+
+    Kept current by ``api.workload`` (signal receivers plus the bulk paths) and
+    rebuilt with ``manage.py rebuild_user_workload``, so listing users reads
+    one row per user instead of aggregating ``TaskAssignment``.
+
+    As in ProjectStats, ``overdue_count`` is only exact for ``overdue_as_of``;
+    ``api.workload.refresh_overdue`` recounts rows once the date has passed.
+    """
+
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="workload",
+    )
+
+    todo_count = models.IntegerField(default=0)
+    doing_count = models.IntegerField(default=0)
+    done_count = models.IntegerField(default=0)
+    overdue_count = models.IntegerField(default=0)
+    overdue_as_of = models.DateField()
+
+    worked_hours = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Stale rows for refresh_overdue.
+            models.Index(fields=["overdue_as_of"], name="userworkload_as_of_idx"),
+        ]
+
+    @property
+    def task_count(self) -> int:
+        return self.todo_count + self.doing_count + self.done_count
+
+    @property
+    def open_count(self) -> int:
+        return self.todo_count + self.doing_count
+
+    def __str__(self):
+        return f"workload:user={self.user_id}"
@@ -0,0 +1,285 @@
+"""Klasy paginacji używane przez viewsety API."""
+
+from __future__ import annotations
+
+import base64
+import json
+from dataclasses import dataclass
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class StandardPageNumberPagination(PageNumberPagination):
+    """Domyślna paginacja stronami z `?page_size=` wybieranym przez klienta."""
+
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+@dataclass(frozen=True)
+class Cursor:
+    """Zdekodowany kursor: klucze sortowania, ich wartości i kierunek."""
+
+    ordering: tuple[str, ...]
+    values: tuple
+    reverse: bool = False
+
+
+class KeysetPagination(BasePagination):
+    """Paginacja keyset po sortowaniu widoku plus unikalny klucz rozstrzygający."""
+
+    cursor_query_param = "cursor"
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("-created_at",)
+    tie_breaker = "id"
+    invalid_cursor_message = "Invalid cursor"
+
+    # ---------- public API (DRF) ----------
+
+    def paginate_queryset(self, queryset, request, view=None):
+        qs = self._page_queryset(queryset, request, view)
+        return self._set_page(list(qs[: self.page_size + 1]))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """`paginate_queryset` dla widoków async."""
+        qs = self._page_queryset(queryset, request, view)
+        return self._set_page([row async for row in qs[: self.page_size + 1]])
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            raw = request.query_params.get(self.page_size_query_param)
+            try:
+                size = int(raw)
+            except (TypeError, ValueError):
+                size = 0
+            if size > 0:
+                return min(size, self.max_page_size) if self.max_page_size else size
+        return self.page_size
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self._row_values(self.page[-1]), reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self._row_values(self.page[0]), reverse=True)
+
+    # ---------- page ----------
+
+    def _page_queryset(self, queryset, request, view):
+        """Posortowany i przefiltrowany po pozycji queryset strony (leniwy)."""
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.keys = self.get_ordering(request, queryset, view)
+        self.model = queryset.model
+
+        self.cursor = self.decode_cursor(request)
+        self.reverse = self.cursor.reverse if self.cursor else False
+
+        qs = queryset.order_by(*self._order_by(self.reverse))
+        if self.cursor is not None:
+            try:
+                qs = qs.filter(self._position_filter(self.cursor.values, self.reverse))
+            except (TypeError, ValueError, ValidationError):
+                raise NotFound(self.invalid_cursor_message)
+        return qs
+
+    def _set_page(self, rows):
+        """Przycina pobrane `page_size + 1` wierszy do strony."""
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if self.reverse:
+            rows.reverse()
+            self.has_next = self.cursor is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+
+        self.page = rows
+        return rows
+
+    # ---------- ordering ----------
+
+    def get_ordering(self, request, queryset, view):
+        """`[(pole, malejąco), ...]` zakończone kluczem rozstrzygającym."""
+        ordering = None
+        for backend in getattr(view, "filter_backends", None) or ():
+            if isinstance(backend, type) and issubclass(backend, OrderingFilter):
+                ordering = backend().get_ordering(request, queryset, view)
+                break
+        if not ordering:
+            ordering = self.ordering
+
+        keys = []
+        for item in ordering:
+            if not isinstance(item, str):
+                continue
+            name = item.lstrip("-")
+            if name in (self.tie_breaker, "pk") or "__" in name:
+                continue
+            keys.append((name, item.startswith("-")))
+
+        if keys:
+            first_desc = keys[0][1]
+        else:
+            # Ordered by the tie-breaker alone: keep its direction.
+            first_desc = next(
+                (i.startswith("-") for i in ordering if isinstance(i, str)), True
+            )
+        keys.append((self.tie_breaker, first_desc))
+        return keys
+
+    def _is_nullable(self, name):
+        try:
+            return self.model._meta.get_field(name).null
+        except FieldDoesNotExist:
+            return False
+
+    def _order_by(self, reverse):
+        nulls = {"nulls_first": True} if reverse else {"nulls_last": True}
+        exprs = []
+        for name, desc in self.keys:
+            if desc != reverse:
+                exprs.append(F(name).desc(**nulls))
+            else:
+                exprs.append(F(name).asc(**nulls))
+        return exprs
+
+    def _position_filter(self, values, reverse):
+        """`WHERE` dla wierszy ściśle za (lub przed) `values`, z NULLS LAST."""
+        if len(values) != len(self.keys):
+            raise ValueError("cursor length mismatch")
+
+        condition = Q(pk__in=[])
+        equal_so_far = Q()
+        for (name, desc), value in zip(self.keys, values):
+            condition |= equal_so_far & self._strictly_beyond(
+                name, desc, value, reverse
+            )
+            if value is None:
+                equal_so_far &= Q(**{f"{name}__isnull": True})
+            else:
+                equal_so_far &= Q(**{name: value})
+        return condition
+
+    def _strictly_beyond(self, name, desc, value, reverse):
+        nullable = self._is_nullable(name)
+        if value is None:
+            # NULLs sort last: nothing follows them, every non-NULL precedes.
+            return Q(**{f"{name}__isnull": False}) if reverse else Q(pk__in=[])
+
+        lookup = "lt" if desc != reverse else "gt"
+        cond = Q(**{f"{name}__{lookup}": value})
+        if nullable and not reverse:
+            cond |= Q(**{f"{name}__isnull": True})
+        return cond
+
+    # ---------- cursor encoding ----------
+
+    def _row_values(self, row):
+        return tuple(getattr(row, name) for name, _ in self.keys)
+
+    def _ordering_signature(self):
+        return tuple(("-" if desc else "") + name for name, desc in self.keys)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            cursor = Cursor(
+                ordering=tuple(payload["o"]),
+                values=tuple(payload["v"]),
+                reverse=bool(payload.get("r")),
+            )
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if cursor.ordering != self._ordering_signature():
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def encode_cursor(self, values, reverse):
+        payload = {
+            "o": list(self._ordering_signature()),
+            "v": [_json_value(v) for v in values],
+        }
+        if reverse:
+            payload["r"] = 1
+        raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        encoded = base64.urlsafe_b64encode(raw).decode("ascii")
+        url = remove_query_param(self.base_url, "page")
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+
+def _json_value(value):
+    if value is None or isinstance(value, (bool, int, str)):
+        return value
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+class BoardColumnPagination(KeysetPagination):
+    """Keyset jednej kolumny Kanbana; kolumnę kursora wskazuje `?column=`."""
+
+    ordering = ("-priority",)
+    column_query_param = "column"
+
+    def __init__(self, column):
+        self.column = column
+
+    def decode_cursor(self, request):
+        if request.query_params.get(self.column_query_param) != self.column:
+            return None
+        return super().decode_cursor(request)
+
+    def encode_cursor(self, values, reverse):
+        url = super().encode_cursor(values, reverse)
+        return replace_query_param(url, self.column_query_param, self.column)
+
+
+class UserTaskPagination(KeysetPagination):
+    """Keyset przypisań użytkownika, od najnowszych."""
+
+    ordering = ("-assigned_at",)
+
+
+class UserPagination(KeysetPagination):
+    """Keyset użytkowników po kluczu głównym."""
+
+    ordering = ("id",)
@@ -0,0 +1,26 @@
+"""Przeliczanie tabel zdenormalizowanych porcjami, opcjonalnie na wątkach."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+
+
+def rebuild_in_chunks(ids, rebuild, chunk_size, workers):
+    """Woła `rebuild(chunk)` dla kolejnych porcji `ids`; zwraca wyniki."""
+    size = max(1, chunk_size)
+    chunks = [ids[i : i + size] for i in range(0, len(ids), size)]
+    workers = max(1, workers)
+
+    if workers == 1 or len(chunks) <= 1:
+        return [rebuild(chunk) for chunk in chunks]
+
+    def run(chunk):
+        try:
+            return rebuild(chunk)
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run, chunks))
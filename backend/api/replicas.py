@@ -0,0 +1,175 @@
+"""Kierowanie odczytów API na repliki (`settings.API_READ_REPLICAS`)."""
+
+from __future__ import annotations
+
+import logging
+import random
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.viewsets import ViewSetMixin
+
+logger = logging.getLogger("api.replicas")
+
+ROUTE_HEADER = "X-Read-Database"
+
+
+@dataclass(frozen=True)
+class _Route:
+    alias: str
+    # Depth of `default`'s atomic blocks when the request started (test
+    # cases run inside one); deeper means the view opened a transaction.
+    base_atomic_depth: int
+
+
+_route = ContextVar("api_read_route", default=None)
+_down_until = {}  # replica alias -> time.monotonic() until which it is skipped
+
+
+def replica_aliases():
+    return list(getattr(settings, "API_READ_REPLICAS", ()))
+
+
+def _healthy(alias) -> bool:
+    if _down_until.get(alias, 0) > time.monotonic():
+        return False
+    try:
+        connections[alias].ensure_connection()
+    except DatabaseError as exc:
+        retry = getattr(settings, "API_REPLICA_RETRY_SECONDS", 30)
+        _down_until[alias] = time.monotonic() + retry
+        logger.warning(
+            "Replica %s unavailable, skipping for %ss: %s", alias, retry, exc
+        )
+        return False
+    return True
+
+
+def choose_replica():
+    """Alias dostępnej repliki albo None (odczyt z `default`)."""
+    candidates = replica_aliases()
+    random.shuffle(candidates)
+    for alias in candidates:
+        if _healthy(alias):
+            return alias
+    return None
+
+
+def is_pinned(request) -> bool:
+    raw = request.COOKIES.get(settings.API_REPLICA_PIN_COOKIE)
+    try:
+        return raw is not None and float(raw) > time.time()
+    except ValueError:
+        return False
+
+
+def _is_api_viewset(view_func) -> bool:
+    cls = getattr(view_func, "cls", None)
+    return (
+        isinstance(cls, type)
+        and issubclass(cls, ViewSetMixin)
+        and cls.__module__.split(".")[0] == "api"
+    )
+
+
+class ReplicaMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        request._read_route = None
+        request._read_pinned = False
+        try:
+            response = self.get_response(request)
+        finally:
+            self._reset(request)
+        return self._finish(request, response)
+
+    async def __acall__(self, request):
+        request._read_route = None
+        request._read_pinned = False
+        try:
+            response = await self.get_response(request)
+        finally:
+            self._reset(request)
+        return self._finish(request, response)
+
+    def _reset(self, request):
+        # Not a token reset: under ASGI process_view runs in sync_to_async,
+        # whose context changes are copied back into a different context.
+        if request._read_route is not None:
+            _route.set(None)
+
+    def _finish(self, request, response):
+        if request._read_route is not None:
+            response[ROUTE_HEADER] = request._read_route.alias
+        elif request.method not in SAFE_METHODS and response.status_code < 400:
+            self._pin(response)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if (
+            request.method not in SAFE_METHODS
+            or not replica_aliases()
+            or not _is_api_viewset(view_func)
+        ):
+            return None
+        if is_pinned(request):
+            request._read_pinned = True
+            return None
+        alias = choose_replica()
+        if alias is None:
+            return None
+        depth = len(connections[DEFAULT_DB_ALIAS].atomic_blocks)
+        request._read_route = _Route(alias, depth)
+        _route.set(request._read_route)
+        return None
+
+    def _pin(self, response):
+        seconds = settings.API_REPLICA_STICKY_SECONDS
+        if seconds <= 0:
+            return
+        response.set_cookie(
+            settings.API_REPLICA_PIN_COOKIE,
+            str(int(time.time() + seconds)),
+            max_age=seconds,
+            httponly=True,
+            samesite=settings.SESSION_COOKIE_SAMESITE,
+            secure=settings.SESSION_COOKIE_SECURE,
+        )
+
+
+class ReplicaRouter:
+    """Kieruje odczyty na replikę wybraną przez `ReplicaMiddleware`."""
+
+    def db_for_read(self, model, **hints):
+        route = _route.get()
+        if route is None:
+            return None
+        if len(connections[DEFAULT_DB_ALIAS].atomic_blocks) > route.base_atomic_depth:
+            return DEFAULT_DB_ALIAS
+        return route.alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in replica_aliases():
+            return False
+        return None
@@ -0,0 +1,162 @@
+"""Wersjonowany cache odpowiedzi endpointów do odczytu.
+
+Zapisy podbijają generację modelu zamiast kasować wpisy.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from rest_framework.response import Response
+
+GENERATION_PREFIX = "api:gen:"
+RESPONSE_PREFIX = "api:resp:"
+
+# Backendy, które trzymają dane w pamięci jednego procesu.
+LOCAL_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+def cache_alias():
+    return getattr(settings, "API_CACHE_ALIAS", "default")
+
+
+def get_cache():
+    return caches[cache_alias()]
+
+
+def is_enabled():
+    return getattr(settings, "API_RESPONSE_CACHE", True)
+
+
+def check_backend():
+    """``ImproperlyConfigured`` dla cache'u odpowiedzi na backendzie jednego procesu."""
+    backend = settings.CACHES[cache_alias()]["BACKEND"]
+    if is_enabled() and backend in LOCAL_BACKENDS and not settings.DEBUG:
+        raise ImproperlyConfigured(
+            f"API_RESPONSE_CACHE needs a cache shared by all workers, "
+            f"not {backend}; set REDIS_URL or API_RESPONSE_CACHE=False."
+        )
+
+
+def cache_timeout():
+    return getattr(settings, "API_CACHE_TIMEOUT", 300)
+
+
+def _generation_key(model):
+    return f"{GENERATION_PREFIX}{model._meta.label_lower}"
+
+
+def _incr(keys):
+    cache = get_cache()
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.add(key, time.time_ns(), None)
+
+
+def bump_generation(*models):
+    """Unieważnia odpowiedzi zależne od któregoś z `models`."""
+    if not is_enabled():
+        return
+    keys = [_generation_key(m) for m in models]
+    _incr(keys)
+    # Reads racing the open transaction may cache the old rows under the new
+    # generation; bump once more when the writes become visible.
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: _incr(keys))
+
+
+def generations(models):
+    """Bieżąca generacja każdego modelu; brakujące liczniki są inicjowane."""
+    cache = get_cache()
+    keys = [_generation_key(m) for m in models]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, time.time_ns(), None)
+            found[key] = cache.get(key)
+    return [found[key] for key in keys]
+
+
+def permission_scope(user):
+    """Co użytkownik może zobaczyć; w obrębie zakresu odpowiedzi są wspólne."""
+    if not getattr(user, "is_authenticated", False):
+        return "anon"
+    if user.is_superuser:
+        return "superuser"
+    return "staff" if user.is_staff else "user"
+
+
+def normalized_params(query_params):
+    """Posortowane pary `(nazwa, wartości)`; puste wartości pomijane."""
+    params = []
+    for name in query_params:
+        values = sorted(v for v in query_params.getlist(name) if v != "")
+        if values:
+            params.append((name, values))
+    return sorted(params)
+
+
+def response_key(request, models):
+    parts = [
+        request.get_host(),
+        request.path,
+        normalized_params(request.query_params),
+        permission_scope(request.user),
+        generations(models),
+    ]
+    digest = hashlib.md5(repr(parts).encode("utf-8")).hexdigest()
+    return f"{RESPONSE_PREFIX}{digest}"
+
+
+class CachedResponseMixin:
+    """Serwuje `cached_actions` z cache'u, dopóki `cache_models` się nie zmienią."""
+
+    cache_models = ()
+    cached_actions = ("list", "retrieve")
+
+    def list(self, request, *args, **kwargs):
+        return self._cached(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached(super().retrieve, request, *args, **kwargs)
+
+    def _cached(self, handler, request, *args, **kwargs):
+        if (
+            not is_enabled()
+            or self.action not in self.cached_actions
+            or not self.cache_models
+        ):
+            return handler(request, *args, **kwargs)
+
+        cache = get_cache()
+        key = response_key(request, self.cache_models)
+        # Klient przypięty do primary po zapisie (api.replicas) musi go widzieć,
+        # więc pomija trafienia.
+        if not getattr(request, "_read_pinned", False):
+            data = cache.get(key)
+            if data is not None:
+                return Response(data, headers={"X-Cache": "hit"})
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(key, response.data, self._cache_timeout(request))
+            response["X-Cache"] = "miss"
+        return response
+
+    @staticmethod
+    def _cache_timeout(request):
+        # Replika może jeszcze nie mieć zapisu sprzed podbicia generacji;
+        # taka odpowiedź żyje najwyżej tyle, ile zakładamy opóźnienie repliki.
+        if getattr(request, "_read_route", None) is None:
+            return cache_timeout()
+        return min(cache_timeout(), settings.API_REPLICA_STICKY_SECONDS)
@@ -0,0 +1,61 @@
+"""Wyszukiwanie pełnotekstowe z rankingiem dla list (`?search=`)."""
+
+from __future__ import annotations
+
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, Q
+from rest_framework.filters import OrderingFilter, SearchFilter
+
+from .models.search import SEARCH_CONFIG
+
+SEARCH_RANK = "search_rank"
+
+WORD_RE = re.compile(r"\w+")
+
+
+def prefix_query(text):
+    """`słowo1:* & słowo2:*` dla słów z `text` (`None`, gdy brak słów)."""
+    words = WORD_RE.findall(text)
+    if not words:
+        return None
+    raw = " & ".join(f"{word}:*" for word in words)
+    return SearchQuery(raw, search_type="raw", config=SEARCH_CONFIG)
+
+
+class RankedSearchFilter(SearchFilter):
+    def filter_queryset(self, request, queryset, view):
+        vector_field = getattr(view, "search_vector_field", None)
+        terms = self.get_search_terms(request)
+        if not vector_field or not terms:
+            return super().filter_queryset(request, queryset, view)
+
+        substring_fields = getattr(view, "search_fields", None) or ()
+        for term in terms:
+            condition = Q()
+            query = prefix_query(term)
+            if query is not None:
+                condition |= Q(**{vector_field: query})
+            for name in substring_fields:
+                condition |= Q(**{f"{name}__icontains": term})
+            queryset = queryset.filter(condition)
+
+        query = prefix_query(" ".join(terms))
+        if query is not None:
+            queryset = queryset.annotate(
+                **{SEARCH_RANK: SearchRank(F(vector_field), query)}
+            )
+        return queryset
+
+
+class RankedOrderingFilter(OrderingFilter):
+    """Przy wyszukiwaniu bez `?ordering=` najlepsze trafienia idą pierwsze."""
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if SEARCH_RANK in queryset.query.annotations and not request.query_params.get(
+            self.ordering_param
+        ):
+            return [f"-{SEARCH_RANK}", *(ordering or ())]
+        return ordering
@@ -1,23 +1,146 @@
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
 from django.db import transaction
 from .models import (
     Project,
     Funding,
     ProjectFunding,
+    ProjectFundingCleanup,
+    ProjectStats,
     FundingTask,
     Task,
     TaskScope,
     TaskAssignment,
+    TaskImport,
     UserProfile,
 )
-from django.db.models import Q
+from django.db.models import Prefetch, prefetch_related_objects
+from .assignments import sync_assignees
+from . import events
+from .stats import STATUS_FIELDS
+from .timing import TimedRepresentationMixin
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
 
+def scoped_task_titles_prefetch(lookup):
+    """
+    Prefetch scope'ów z tytułem taska w jednym zapytaniu (JOIN na task).
+    Używane przez viewsety dla całej strony i przez serializery jako fallback.
+    """
+    return Prefetch(
+        lookup,
+        queryset=TaskScope.objects.select_related("task")
+        .only(
+            "id",
+            "project_id",
+            "funding_id",
+            "project_funding_id",
+            "task__id",
+            "task__title",
+        )
+        .order_by("task_id"),
+    )
+
+
+# ---------- SPARSE FIELDSETS / EXPAND ----------
+def split_query_list(value):
+    """`"id, name,,tasks"` -> `{"id", "name", "tasks"}`; brak wartości -> None."""
+    if value is None:
+        return None
+    return {part.strip() for part in value.split(",") if part.strip()}
+
+
+def _query_params(request):
+    return getattr(request, "query_params", None) or getattr(request, "GET", {})
+
+
+def requested_fields(request):
+    """Pola z `?fields=` (tylko dla odczytów) albo None, gdy klient nie zawęża."""
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    return split_query_list(_query_params(request).get("fields"))
+
+
+def requested_expand(request):
+    """Pola z `?expand=` (tylko dla odczytów; zawsze zbiór, pusty gdy brak).
+
+    Przy zapisie rozwinięcie podmieniłoby zapisywalne FK na zagnieżdżone
+    serializery tylko do odczytu i wartość z body by przepadła.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return set()
+    return split_query_list(_query_params(request).get("expand")) or set()
+
+
+class DynamicFieldsMixin(TimedRepresentationMixin):
+    """
+    Serializer z zawężaniem pól i rozwijaniem relacji.
+
+    - `fields=[...]` (kwarg) albo `?fields=a,b` (tylko serializer główny,
+      tylko GET) -> zwracamy wyłącznie te pola,
+    - `expand=[...]` (kwarg) albo `?expand=x` (tylko GET) -> pola z
+      `Meta.expandable_fields` są podmieniane na zagnieżdżone serializery.
+
+    `Meta.expandable_fields` to słownik
+    `nazwa -> {"serializer": klasa|nazwa, "many": bool, "source": ...,
+    "fields": [...], "select_related": [...], "prefetch_related": [...]}`.
+    Klucze `select_related`/`prefetch_related` czyta viewset, żeby dociągnąć
+    relacje tylko wtedy, gdy pole jest rozwijane.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._fields_override = kwargs.pop("fields", None)
+        self._expand_override = kwargs.pop("expand", None)
+        super().__init__(*args, **kwargs)
+
+    def _is_root(self):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    def _field_params(self):
+        only = self._fields_override
+        expand = self._expand_override
+        if self._is_root():
+            request = self.context.get("request")
+            if only is None:
+                only = requested_fields(request)
+            if expand is None:
+                expand = requested_expand(request)
+        only = set(only) if only is not None else None
+        return only, set(expand or ())
+
+    def get_fields(self):
+        fields = super().get_fields()
+        only, expand = self._field_params()
+
+        expandable = getattr(self.Meta, "expandable_fields", {})
+        for name in expand & set(expandable):
+            fields[name] = build_expanded_field(name, expandable[name])
+
+        if only is not None:
+            for name in set(fields) - only:
+                fields.pop(name)
+        return fields
+
+
+def build_expanded_field(name, spec):
+    serializer_class = spec["serializer"]
+    if isinstance(serializer_class, str):
+        serializer_class = globals()[serializer_class]
+    kwargs = {"read_only": True, "many": spec.get("many", False)}
+    if spec.get("source", name) != name:
+        kwargs["source"] = spec["source"]
+    if "fields" in spec:
+        kwargs["fields"] = spec["fields"]
+    return serializer_class(**kwargs)
+
+
 # ---------- FUNDING ---------
-class FundingSerializer(serializers.ModelSerializer):
+class FundingSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     tasks = serializers.SerializerMethodField()
 
     class Meta:
@@ -34,13 +157,17 @@ class FundingSerializer(serializers.ModelSerializer):
             "type",
         ]
 
+    @staticmethod
+    def task_prefetches():
+        return [scoped_task_titles_prefetch("task_scopes")]
+
     def get_tasks(self, obj):
         """Zwróć taski przypisane bezpośrednio do fundingu."""
-        qs = Task.objects.filter(scope__funding=obj)
-        return [t.title for t in qs]
+        prefetch_related_objects([obj], *self.task_prefetches())
+        return [s.task.title for s in obj.task_scopes.all()]
 
 
-class FundingTaskSerializer(serializers.ModelSerializer):
+class FundingTaskSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     funding_name = serializers.ReadOnlyField(source="funding.name")
 
     class Meta:
@@ -57,10 +184,17 @@ class FundingTaskSerializer(serializers.ModelSerializer):
             "default_due_days",
             "mandatory",
         ]
+        expandable_fields = {
+            "funding": {
+                "serializer": "FundingSerializer",
+                "fields": ["id", "name", "type", "funder", "program"],
+                "select_related": ["funding"],
+            },
+        }
 
 
 # ---------- PROJECT ----------
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     tasks = serializers.SerializerMethodField()
 
     class Meta:
@@ -75,16 +209,34 @@ class ProjectSerializer(serializers.ModelSerializer):
             "end_date",
             "tasks",
         ]
+        expandable_fields = {
+            "owner": {
+                "serializer": "UserSerializer",
+                "fields": ["id", "username", "first_name", "last_name", "email"],
+                "select_related": ["owner"],
+            },
+        }
+
+    @staticmethod
+    def task_prefetches():
+        # `effective_project` obejmuje taski projektowe i grantowe, więc
+        # wystarcza jedno zapytanie po indeksie zamiast dwóch ścieżek scope'ów.
+        return [
+            Prefetch(
+                "effective_tasks",
+                queryset=Task.objects.only(
+                    "id", "title", "effective_project_id"
+                ).order_by("id"),
+            )
+        ]
 
     def get_tasks(self, obj):
         """Zwróć taski projektowe i grantowe (przez ProjectFunding)."""
-        qs = Task.objects.filter(
-            Q(scope__project=obj) | Q(scope__project_funding__project=obj)
-        )
-        return [t.title for t in qs]
+        prefetch_related_objects([obj], *self.task_prefetches())
+        return [t.title for t in obj.effective_tasks.all()]
 
 
-class ProjectFundingSerializer(serializers.ModelSerializer):
+class ProjectFundingSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     tasks = serializers.SerializerMethodField()
 
     class Meta:
@@ -98,14 +250,96 @@ class ProjectFundingSerializer(serializers.ModelSerializer):
             "is_primary",
             "tasks",
         ]
+        expandable_fields = {
+            "project": {
+                "serializer": "ProjectSerializer",
+                "fields": ["id", "name", "status", "start_date", "end_date"],
+                "select_related": ["project"],
+            },
+            "funding": {
+                "serializer": "FundingSerializer",
+                "fields": ["id", "name", "type", "funder", "program"],
+                "select_related": ["funding"],
+            },
+        }
+
+    @staticmethod
+    def task_prefetches():
+        return [scoped_task_titles_prefetch("task_scopes")]
 
     def get_tasks(self, obj):
-        qs = Task.objects.filter(scope__project_funding=obj)
-        return [t.title for t in qs]
+        prefetch_related_objects([obj], *self.task_prefetches())
+        return [s.task.title for s in obj.task_scopes.all()]
+
+
+class ProjectFundingCleanupSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ProjectFundingCleanup
+        fields = [
+            "id",
+            "project_funding",
+            "label",
+            "status",
+            "total",
+            "deleted",
+            "error",
+            "created_at",
+            "updated_at",
+            "finished_at",
+        ]
+        read_only_fields = fields
+
+
+class TaskImportSerializer(serializers.ModelSerializer):
+    file = serializers.FileField(write_only=True)
+
+    class Meta:
+        model = TaskImport
+        fields = [
+            "id",
+            "file",
+            "label",
+            "format",
+            "status",
+            "rows_done",
+            "imported",
+            "failed",
+            "errors",
+            "error",
+            "created_by",
+            "created_at",
+            "updated_at",
+            "finished_at",
+        ]
+        read_only_fields = [name for name in fields if name != "file"]
+
+
+class ProjectStatsSerializer(TimedRepresentationMixin, serializers.ModelSerializer):
+    task_count = serializers.IntegerField(read_only=True)
+    status_counts = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ProjectStats
+        fields = [
+            "project",
+            "project_funding",
+            "task_count",
+            "status_counts",
+            "overdue_count",
+            "overdue_as_of",
+            "cost_by_currency",
+            "est_hours",
+            "worked_hours",
+            "updated_at",
+        ]
+        read_only_fields = fields
+
+    def get_status_counts(self, obj):
+        return {status: getattr(obj, field) for status, field in STATUS_FIELDS.items()}
 
 
 # ---------- TASK ----------
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     project = serializers.IntegerField(required=False, allow_null=True, write_only=True)
     funding = serializers.IntegerField(required=False, allow_null=True, write_only=True)
     project_funding = serializers.IntegerField(
@@ -170,6 +404,26 @@ class TaskSerializer(serializers.ModelSerializer):
             "funding_name",
             "assignees",
         ]
+        expandable_fields = {
+            "template": {
+                "serializer": "FundingTaskSerializer",
+                "select_related": ["template__funding"],
+            },
+            "assignments": {
+                "serializer": "TaskAssignmentSerializer",
+                "many": True,
+                "fields": [
+                    "id",
+                    "user",
+                    "assigned_by",
+                    "assigned_at",
+                    "started_at",
+                    "finished_at",
+                    "worked_hours",
+                ],
+                "prefetch_related": ["assignments"],
+            },
+        }
 
     def get_assignees(self, obj):
         """
@@ -189,7 +443,9 @@ class TaskSerializer(serializers.ModelSerializer):
             for u in users
         ]
 
-    def validate(self, attrs):
+    @staticmethod
+    def pop_scope(attrs):
+        """Wyjmuje project/funding/project_funding z attrs i sprawdza, że podano max jeden."""
         p = attrs.pop("project", None) if "project" in attrs else None
         f = attrs.pop("funding", None) if "funding" in attrs else None
         pf = attrs.pop("project_funding", None) if "project_funding" in attrs else None
@@ -199,11 +455,16 @@ class TaskSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(
                 "Provide exactly one of: project, funding, project_funding."
             )
+        return {"project": p, "funding": f, "project_funding": pf}
+
+    def validate(self, attrs):
+        scope = self.pop_scope(attrs)
+        pf = scope["project_funding"]
 
         if pf is not None and not ProjectFunding.objects.filter(pk=pf).exists():
             raise serializers.ValidationError("ProjectFunding does not exist.")
 
-        self._incoming_scope = {"project": p, "funding": f, "project_funding": pf}
+        self._incoming_scope = scope
 
         assignee_ids = (
             attrs.pop("assignee_ids", None) if "assignee_ids" in attrs else None
@@ -220,57 +481,38 @@ class TaskSerializer(serializers.ModelSerializer):
         - []    -> czyścimy wszystkie
         - [..]  -> ustawiamy dokładnie taką listę (dodajemy/odejmujemy różnice)
         """
-        from .models import (
-            TaskAssignment,
-        )
-
         if assignee_ids is None:
             return
 
-        existing_qs = TaskAssignment.objects.filter(task=task)
-        existing_ids = set(existing_qs.values_list("user_id", flat=True))
-
-        new_ids = set(assignee_ids)
-
-        to_remove = existing_ids - new_ids
-        if to_remove:
-            existing_qs.filter(user_id__in=to_remove).delete()
-
-        to_add = new_ids - existing_ids
-        if to_add:
-            users = User.objects.filter(id__in=to_add)
-            user_map = {u.id: u for u in users}
-
-            request = self.context.get("request")
-            assigned_by = (
-                request.user if request and request.user.is_authenticated else None
-            )
+        # Nieistniejące id userów pomijamy (jak wcześniej) — jedno zapytanie.
+        user_ids = set(
+            User.objects.filter(id__in=set(assignee_ids)).values_list("id", flat=True)
+        )
 
-            for uid in to_add:
-                user = user_map.get(uid)
-                if user:
-                    TaskAssignment.objects.create(
-                        task=task,
-                        user=user,
-                        assigned_by=assigned_by,
-                    )
+        request = self.context.get("request")
+        assigned_by = (
+            request.user if request and request.user.is_authenticated else None
+        )
+        sync_assignees({task.pk: user_ids}, assigned_by=assigned_by)
 
     def create(self, validated_data):
-        task = Task.objects.create(**validated_data)
+        # Task, scope i przypisania -> jedno zdarzenie `task.created`.
+        with events.batch():
+            task = Task.objects.create(**validated_data)
 
-        p = self._incoming_scope["project"]
-        f = self._incoming_scope["funding"]
-        pf = self._incoming_scope["project_funding"]
+            p = self._incoming_scope["project"]
+            f = self._incoming_scope["funding"]
+            pf = self._incoming_scope["project_funding"]
 
-        if any(x is not None for x in (p, f, pf)):
-            TaskScope.objects.create(
-                task=task,
-                project_id=p or None,
-                funding_id=f or None,
-                project_funding_id=pf or None,
-            )
+            if any(x is not None for x in (p, f, pf)):
+                TaskScope.objects.create(
+                    task=task,
+                    project_id=p or None,
+                    funding_id=f or None,
+                    project_funding_id=pf or None,
+                )
 
-        self._apply_assignees(task, self._incoming_assignee_ids)
+            self._apply_assignees(task, self._incoming_assignee_ids)
 
         return task
 
@@ -279,24 +521,75 @@ class TaskSerializer(serializers.ModelSerializer):
         f = self._incoming_scope["funding"]
         pf = self._incoming_scope["project_funding"]
 
-        for k, v in validated_data.items():
-            setattr(instance, k, v)
-        instance.save()
+        with events.batch([instance.pk]):
+            for k, v in validated_data.items():
+                setattr(instance, k, v)
+            instance.save()
 
-        if any(x is not None for x in (p, f, pf)):
-            scope, _ = TaskScope.objects.get_or_create(task=instance)
-            scope.project_id = p or None
-            scope.funding_id = f or None
-            scope.project_funding_id = pf or None
-            scope.save()
+            if any(x is not None for x in (p, f, pf)):
+                scope, _ = TaskScope.objects.get_or_create(task=instance)
+                scope.project_id = p or None
+                scope.funding_id = f or None
+                scope.project_funding_id = pf or None
+                scope.save()
 
-        self._apply_assignees(instance, self._incoming_assignee_ids)
+            self._apply_assignees(instance, self._incoming_assignee_ids)
 
         return instance
 
 
+class TaskCardSerializer(TimedRepresentationMixin, serializers.ModelSerializer):
+    """
+    Lekka karta taska na tablicę Kanban: bez kosztów, scope i pełnego opisu
+    (`description` to skrót z adnotacji `description_excerpt`).
+    """
+
+    description = serializers.CharField(source="description_excerpt", read_only=True)
+    assignees = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Task
+        fields = [
+            "id",
+            "title",
+            "description",
+            "status",
+            "priority",
+            "due_date",
+            "est_hours",
+            "assignees",
+        ]
+        read_only_fields = fields
+
+    def get_assignees(self, obj):
+        return [{"id": u.id, "username": u.username} for u in obj.assignees.all()]
+
+
+class TaskBulkItemSerializer(TaskSerializer):
+    """
+    Pozycja w `POST /api/tasks/bulk/`.
+
+    Walidacja pól bez zapytań do bazy — istnienie project/funding/
+    project_funding/template/userów sprawdza hurtowo `api.bulk.TaskBulkWriter`.
+    Scope i assignee_ids zostają w validated_data pod kluczami `scope` /
+    `assignee_ids`, bo jedna instancja serializera waliduje wiele pozycji.
+    """
+
+    template = serializers.IntegerField(
+        source="template_id", required=False, allow_null=True
+    )
+
+    class Meta(TaskSerializer.Meta):
+        expandable_fields = {}
+
+    def validate(self, attrs):
+        attrs["scope"] = self.pop_scope(attrs)
+        attrs["assignee_ids"] = attrs.pop("assignee_ids", None)
+        return attrs
+
+
 # ---------- USER PROFILE ----------
-class UserProfileSerializer(serializers.ModelSerializer):
+class UserProfileSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = UserProfile
         fields = [
@@ -307,10 +600,15 @@ class UserProfileSerializer(serializers.ModelSerializer):
 
 
 # ---------- USER ----------
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     profile = UserProfileSerializer(read_only=True)
     tasks_count = serializers.IntegerField(read_only=True)
     done_tasks_count = serializers.IntegerField(read_only=True)
+    open_tasks_count = serializers.IntegerField(read_only=True)
+    overdue_tasks_count = serializers.IntegerField(read_only=True)
+    worked_hours = serializers.DecimalField(
+        max_digits=12, decimal_places=2, read_only=True
+    )
 
     class Meta:
         model = User
@@ -323,51 +621,62 @@ class UserSerializer(serializers.ModelSerializer):
             "profile",
             "tasks_count",
             "done_tasks_count",
+            "open_tasks_count",
+            "overdue_tasks_count",
+            "worked_hours",
         ]
 
 
 class UserDetailSerializer(UserSerializer):
-    tasks = serializers.SerializerMethodField()
+    """
+    Karta usera: same liczniki (z UserWorkload) i link do stronicowanej listy
+    jego zadań (`/api/users/{id}/tasks/`), bez samych zadań.
+    """
+
+    tasks_url = serializers.HyperlinkedIdentityField(view_name="user-tasks")
 
     class Meta(UserSerializer.Meta):
-        fields = UserSerializer.Meta.fields + ["tasks"]
+        fields = UserSerializer.Meta.fields + ["tasks_url"]
+
+
+class UserTaskSerializer(TimedRepresentationMixin, serializers.ModelSerializer):
+    """
+    Wiersz listy zadań usera, zbudowany z przypisania: pola taska plus scope
+    (adnotacje z LEFT JOIN, więc taski bez scope dają po prostu null).
+    """
+
+    id = serializers.IntegerField(source="task_id", read_only=True)
+    title = serializers.CharField(source="task.title", read_only=True)
+    status = serializers.CharField(source="task.status", read_only=True)
+    priority = serializers.IntegerField(source="task.priority", read_only=True)
+    start_date = serializers.DateField(source="task.start_date", read_only=True)
+    due_date = serializers.DateField(source="task.due_date", read_only=True)
+    project_id = serializers.IntegerField(source="scope_project_id", read_only=True)
+    funding_id = serializers.IntegerField(source="scope_funding_id", read_only=True)
+    project_funding_id = serializers.IntegerField(
+        source="scope_project_funding_id", read_only=True
+    )
 
-    def get_tasks(self, obj):
-        """
-        Lekka lista zadań usera — idealna pod kartę „zadania użytkownika”.
-        Tutaj możesz dobrać, jakie pola chcesz.
-        """
-        user_tasks = obj.tasks.all().select_related("scope")
-        return [
-            {
-                "id": t.id,
-                "title": t.title,
-                "status": t.status,
-                "priority": t.priority,
-                "start_date": t.start_date,
-                "due_date": t.due_date,
-                "project_id": (
-                    getattr(t.scope, "project_id", None)
-                    if hasattr(t, "scope")
-                    else None
-                ),
-                "funding_id": (
-                    getattr(t.scope, "funding_id", None)
-                    if hasattr(t, "scope")
-                    else None
-                ),
-                "project_funding_id": (
-                    getattr(t.scope, "project_funding_id", None)
-                    if hasattr(t, "scope")
-                    else None
-                ),
-            }
-            for t in user_tasks
+    class Meta:
+        model = TaskAssignment
+        fields = [
+            "id",
+            "title",
+            "status",
+            "priority",
+            "start_date",
+            "due_date",
+            "project_id",
+            "funding_id",
+            "project_funding_id",
+            "assigned_at",
+            "worked_hours",
         ]
+        read_only_fields = fields
 
 
 # ---------- TASK ASSIGNMENT ----------
-class TaskAssignmentSerializer(serializers.ModelSerializer):
+class TaskAssignmentSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     user_detail = UserSerializer(source="user", read_only=True)
     assigned_by_username = serializers.CharField(
         source="assigned_by.username",
@@ -389,6 +698,13 @@ class TaskAssignmentSerializer(serializers.ModelSerializer):
             "worked_hours",
         ]
         read_only_fields = ["assigned_by", "assigned_at"]
+        expandable_fields = {
+            "task": {
+                "serializer": "TaskSerializer",
+                "fields": ["id", "title", "status", "priority", "due_date"],
+                "select_related": ["task"],
+            },
+        }
 
     def create(self, validated_data):
         """
@@ -398,3 +714,45 @@ class TaskAssignmentSerializer(serializers.ModelSerializer):
         if request and request.user.is_authenticated:
             validated_data["assigned_by"] = request.user
         return super().create(validated_data)
+
+
+class TaskAssignmentBulkSerializer(serializers.Serializer):
+    """
+    Wejście `POST /api/task-assignments/bulk/`: wiele tasków × wielu userów.
+    - add    -> przypisz wszystkich userów do wszystkich tasków,
+    - remove -> odepnij ich,
+    - set    -> każdy task ma dokładnie tych userów.
+    """
+
+    MAX_PAIRS = 10000
+
+    tasks = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
+    users = serializers.ListField(child=serializers.IntegerField(), allow_empty=True)
+    mode = serializers.ChoiceField(choices=["add", "remove", "set"], default="add")
+
+    def _check_exist(self, model, ids, field):
+        ids = set(ids)
+        found = set(model.objects.filter(pk__in=ids).values_list("pk", flat=True))
+        missing = sorted(ids - found)
+        if missing:
+            raise serializers.ValidationError(
+                {
+                    field: [
+                        f'Invalid pk "{pk}" - object does not exist.' for pk in missing
+                    ]
+                }
+            )
+        return sorted(ids)
+
+    def validate(self, attrs):
+        if attrs["mode"] != "set" and not attrs["users"]:
+            raise serializers.ValidationError(
+                {"users": ["This list may not be empty."]}
+            )
+        if len(set(attrs["tasks"])) * max(len(set(attrs["users"])), 1) > self.MAX_PAIRS:
+            raise serializers.ValidationError(
+                f"At most {self.MAX_PAIRS} task/user pairs per request."
+            )
+        attrs["tasks"] = self._check_exist(Task, attrs["tasks"], "tasks")
+        attrs["users"] = self._check_exist(User, attrs["users"], "users")
+        return attrs
@@ -1,9 +1,27 @@
-from django.db import transaction
-from django.db.models.signals import post_save, post_delete
+from django.contrib.auth import get_user_model
+from django.contrib.postgres.expressions import ArraySubquery
+from django.db import IntegrityError, transaction
+from django.db.models import OuterRef
+from django.db.models.signals import post_save, post_delete, pre_delete, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
 from datetime import timedelta
-from .models import ProjectFunding, FundingTask, Task, TaskScope
+from decimal import Decimal
+from .models import (
+    Funding,
+    Project,
+    ProjectFunding,
+    FundingTask,
+    Task,
+    TaskAssignment,
+    TaskScope,
+    UserProfile,
+)
+from .cleanup import delete_generated_tasks
+from .conditional import touch_tasks
+from .response_cache import bump_generation
+from .timing import measured
+from . import effective_scope, events, response_cache, stats, workload
 
 
 def _due(base_date, delta_days):
@@ -29,62 +47,566 @@ def _clone_task_fields(src: Task) -> dict:
         receipt_url=src.receipt_url,
         receipt_note=src.receipt_note,
         est_hours=src.est_hours,
-        template=src.template,
+        template_id=src.template_id,
     )
 
 
+GENERATE_BATCH_SIZE = 500
+
+
+def template_origin(template_id) -> str:
+    return f"template:{template_id}"
+
+
+def task_origin(task_id) -> str:
+    return f"task:{task_id}"
+
+
+def _plan_project_funding_tasks(instance: ProjectFunding) -> list:
+    """
+    Zwraca listę (origin_key, Task) do utworzenia — bez zapisu do bazy.
+    Jedno zapytanie o już wygenerowane originy, jedno o szablony, jedno o
+    taski fundingu.
+    """
+    existing = set(
+        TaskScope.objects.filter(project_funding=instance)
+        .exclude(origin_key="")
+        .values_list("origin_key", flat=True)
+    )
+
+    base = instance.allocation_start
+    if base is None:
+        base = instance.project.start_date or timezone.now().date()
+
+    planned = []
+    for tmpl in FundingTask.objects.filter(funding_id=instance.funding_id).order_by(
+        "id"
+    ):
+        origin = template_origin(tmpl.pk)
+        if origin in existing:
+            continue
+        planned.append(
+            (
+                origin,
+                Task(
+                    template=tmpl,
+                    title=tmpl.title,
+                    description=tmpl.description or "",
+                    status=tmpl.default_status,
+                    priority=tmpl.default_priority,
+                    due_date=_due(base, tmpl.default_due_days),
+                ),
+            )
+        )
+
+    funding_tasks_qs = Task.objects.filter(
+        scope__funding_id=instance.funding_id
+    ).order_by("id")
+    for src in funding_tasks_qs:
+        origin = task_origin(src.pk)
+        if origin in existing:
+            continue
+        planned.append((origin, Task(**_clone_task_fields(src))))
+
+    return planned
+
+
+def generate_project_funding_tasks(instance: ProjectFunding) -> list:
+    """
+    Tworzy taski grantowe dla powiązania projekt ↔ finansowanie.
+
+    Idempotentne: każdy wygenerowany task ma w scope `origin_key`
+    (szablon albo task fundingu), unikalny w obrębie ProjectFunding. Taski i
+    scope'y zapisujemy przez `bulk_create`. Jeśli równoległe wywołanie zdąży
+    pierwsze, constraint rzuci IntegrityError — wtedy liczymy plan jeszcze raz
+    i tworzymy tylko brakujące.
+    """
+    for attempt in range(2):
+        try:
+            with transaction.atomic():
+                planned = _plan_project_funding_tasks(instance)
+                if not planned:
+                    return []
+                for _, task in planned:
+                    task.effective_project_id = instance.project_id
+                    task.effective_funding_id = instance.funding_id
+                tasks = Task.objects.bulk_create(
+                    [task for _, task in planned], batch_size=GENERATE_BATCH_SIZE
+                )
+                TaskScope.objects.bulk_create(
+                    [
+                        TaskScope(
+                            task=task,
+                            project_funding=instance,
+                            funding_scoped=True,
+                            origin_key=origin,
+                        )
+                        for (origin, _), task in zip(planned, tasks)
+                    ],
+                    batch_size=GENERATE_BATCH_SIZE,
+                )
+                delta = stats.StatsDelta()
+                targets = stats.scope_targets(None, instance.pk, instance.project_id)
+                for task in tasks:
+                    delta.add_task(stats.values_of(task), targets)
+                delta.apply()
+                bump_generation(Task, TaskScope)
+                events.publish(
+                    {},
+                    events.created_state(tasks, scope_project_funding=instance.pk),
+                )
+                return tasks
+        except IntegrityError:
+            if attempt:
+                raise
+    return []
+
+
 @receiver(post_save, sender=ProjectFunding)
+@measured("sig")
 def create_tasks_for_project_funding(
     sender, instance: ProjectFunding, created, **kwargs
 ):
     if not created:
         return
-
-    project = instance.project
-    funding = instance.funding
-    base = instance.allocation_start or project.start_date or timezone.now().date()
-
-    with transaction.atomic():
-        for tmpl in FundingTask.objects.filter(funding=funding).order_by("id"):
-            if Task.objects.filter(
-                template=tmpl, scope__project_funding=instance
-            ).exists():
-                continue
-
-            task = Task.objects.create(
-                template=tmpl,
-                title=tmpl.title,
-                description=tmpl.description or "",
-                status=tmpl.default_status,
-                priority=tmpl.default_priority,
-                due_date=_due(base, tmpl.default_due_days),
-            )
-            TaskScope.objects.create(
-                task=task,
-                project_funding=instance,
-                funding_scoped=True,
-            )
-
-        funding_tasks_qs = Task.objects.filter(scope__funding=funding)
-        for src in funding_tasks_qs:
-            if Task.objects.filter(
-                scope__project_funding=instance,
-                title=src.title,
-                template=src.template,
-            ).exists():
-                continue
-
-            cloned = Task.objects.create(**_clone_task_fields(src))
-            TaskScope.objects.create(
-                task=cloned,
-                project_funding=instance,
-                funding_scoped=True,
-            )
+    if not kwargs.get("raw"):
+        stats.create_empty_stats(project_funding=instance)
+    generate_project_funding_tasks(instance)
 
 
 @receiver(post_delete, sender=ProjectFunding)
+@measured("sig")
 def delete_scoped_tasks_on_unlink(sender, instance: ProjectFunding, **kwargs):
-    Task.objects.filter(
-        scope__project_funding=instance,
-        scope__funding_scoped=True,
-    ).delete()
+    delete_generated_tasks(instance.pk)
+
+
+# ─── Efektywny projekt / finansowanie ─────────────────────────────────────────
+# Task.effective_project / effective_funding (api.effective_scope). Receivery
+# są zarejestrowane przed statystykami, bo przeliczenie statystyk filtruje już
+# po tych kolumnach.
+
+
+@receiver(post_save, sender=TaskScope)
+@receiver(post_delete, sender=TaskScope)
+@measured("sig")
+def sync_effective_scope(sender, instance: TaskScope, raw=False, **kwargs):
+    if not raw:
+        effective_scope.sync_tasks([instance.task_id])
+
+
+@receiver(pre_save, sender=ProjectFunding)
+@measured("sig")
+def remember_link_ends(sender, instance: ProjectFunding, raw=False, **kwargs):
+    old = None
+    if instance.pk and not raw:
+        old = (
+            ProjectFunding.objects.filter(pk=instance.pk)
+            .values_list("project_id", "funding_id")
+            .first()
+        )
+    instance._old_link = old
+    instance._stats_project_id = old[0] if old else None
+
+
+@receiver(post_save, sender=ProjectFunding)
+@measured("sig")
+def sync_effective_scope_on_link_move(
+    sender, instance: ProjectFunding, created, raw=False, **kwargs
+):
+    old = getattr(instance, "_old_link", None)
+    if created or raw or old is None:
+        return
+    if old != (instance.project_id, instance.funding_id):
+        task_ids = TaskScope.objects.filter(project_funding=instance).values_list(
+            "task_id", flat=True
+        )
+        with events.batch(task_ids):
+            effective_scope.sync_link_tasks(instance)
+
+
+# ─── ProjectStats ─────────────────────────────────────────────────────────────
+# Receivery liczą różnicę między starym i nowym wkładem obiektu i nakładają ją
+# na wiersze statystyk (api.stats). Stan "przed" czytamy z bazy w pre_save, bo
+# instancja mogła zostać zmieniona w pamięci; w transakcji pod blokadą wiersza,
+# żeby równoległy zapis nie policzył tej samej zmiany drugi raz. Zapisy z
+# `raw=True` (loaddata) pomijamy — po nich trzeba uruchomić
+# `rebuild_project_stats`.
+
+
+def _hours(value):
+    return Decimal(str(value)) if value is not None else None
+
+
+def _for_update(queryset):
+    # Poza transakcją (autocommit) select_for_update rzuca błąd.
+    if transaction.get_connection().in_atomic_block:
+        return queryset.select_for_update(of=("self",))
+    return queryset
+
+
+def _task_row(instance, task_id):
+    """Wartości i wiersze statystyk taska — jeden odczyt na zapis ``instance``."""
+    rows = instance.__dict__.setdefault("_task_rows", {})
+    if task_id not in rows:
+        row = (
+            Task.objects.filter(pk=task_id)
+            .values(*stats.TASK_FIELDS, *stats.SCOPE_FIELDS)
+            .first()
+        )
+        rows[task_id] = (None, []) if row is None else _split_task_row(row)
+    return rows[task_id]
+
+
+def _split_task_row(row):
+    values = {field: row[field] for field in stats.TASK_FIELDS}
+    return values, stats.scope_targets(*(row[f] for f in stats.SCOPE_FIELDS))
+
+
+@receiver(post_save, sender=Project)
+@measured("sig")
+def create_project_stats(sender, instance: Project, created, raw=False, **kwargs):
+    if created and not raw:
+        stats.create_empty_stats(project=instance)
+
+
+@receiver(pre_save, sender=Task)
+@measured("sig")
+def remember_task_stats(sender, instance: Task, raw=False, **kwargs):
+    # Jeden odczyt na zapis: wartości, scope i przypisani (dla UserWorkload).
+    instance._stats_before, instance._stats_targets = None, []
+    instance._workload_users = []
+    if not instance.pk or raw:
+        return
+    assignees = TaskAssignment.objects.filter(task_id=OuterRef("pk")).values("user_id")
+    row = (
+        _for_update(Task.objects.filter(pk=instance.pk))
+        .values(
+            *stats.TASK_FIELDS,
+            *stats.SCOPE_FIELDS,
+            assignee_ids=ArraySubquery(assignees),
+        )
+        .first()
+    )
+    if row is not None:
+        instance._stats_before, instance._stats_targets = _split_task_row(row)
+        instance._workload_users = row["assignee_ids"]
+
+
+def _task_after(instance: Task, before, update_fields):
+    # Pola spoza `update_fields` nie trafiły do bazy — zostają stare.
+    fields = [f for f in stats.TASK_FIELDS if not update_fields or f in update_fields]
+    return {**before, **stats.values_of(instance, fields)}
+
+
+@receiver(post_save, sender=Task)
+@measured("sig")
+def update_stats_on_task_save(
+    sender, instance: Task, created, raw=False, update_fields=None, **kwargs
+):
+    before = getattr(instance, "_stats_before", None)
+    targets = getattr(instance, "_stats_targets", [])
+    if created or raw or before is None or not targets:
+        # Nowy task nie ma jeszcze scope, więc do niczego się nie liczy.
+        return
+    after = _task_after(instance, before, update_fields)
+    if after == before:
+        return
+    delta = stats.StatsDelta()
+    delta.add_task(before, targets, -1)
+    delta.add_task(after, targets)
+    delta.apply()
+
+
+@receiver(pre_save, sender=TaskScope)
+@measured("sig")
+def remember_scope_stats(sender, instance: TaskScope, raw=False, **kwargs):
+    old = None
+    if instance.pk and not raw:
+        old = (
+            _for_update(TaskScope.objects.filter(pk=instance.pk))
+            .values("project_id", "project_funding_id", "project_funding__project_id")
+            .first()
+        )
+    instance._stats_targets = stats.scope_targets(*old.values()) if old else []
+
+
+@receiver(post_save, sender=TaskScope)
+@measured("sig")
+def update_stats_on_scope_save(sender, instance: TaskScope, raw=False, **kwargs):
+    if raw:
+        return
+    old = getattr(instance, "_stats_targets", [])
+    new = stats.scope_targets(
+        instance.project_id,
+        instance.project_funding_id,
+        stats.project_of_link(instance.project_funding_id),
+    )
+    if old == new:
+        return
+    entry = stats.contributions([instance.task_id]).get(instance.task_id)
+    if entry is None:
+        return
+    values, _, worked = entry
+    delta = stats.StatsDelta()
+    delta.add_task(values, old, -1)
+    delta.add_worked(worked, old, -1)
+    delta.add_task(values, new)
+    delta.add_worked(worked, new)
+    delta.apply()
+
+
+@receiver(post_delete, sender=TaskScope)
+@measured("sig")
+def update_stats_on_scope_delete(sender, instance: TaskScope, **kwargs):
+    # Przy kaskadzie z Task wiersz taska jeszcze istnieje, a przepracowane
+    # godziny liczymy z przypisań, które zostały w bazie — te usunięte
+    # wcześniej odjął już receiver TaskAssignment.
+    targets = stats.scope_targets(
+        instance.project_id,
+        instance.project_funding_id,
+        stats.project_of_link(instance.project_funding_id),
+    )
+    entry = stats.contributions([instance.task_id]).get(instance.task_id)
+    if not targets or entry is None:
+        return
+    values, _, worked = entry
+    delta = stats.StatsDelta()
+    delta.add_task(values, targets, -1)
+    delta.add_worked(worked, targets, -1)
+    delta.apply()
+
+
+@receiver(pre_save, sender=TaskAssignment)
+@measured("sig")
+def remember_assignment_stats(sender, instance: TaskAssignment, raw=False, **kwargs):
+    instance._stats_before = instance._workload_before = None
+    instance._task_rows = {}
+    if instance.pk and not raw:
+        row = (
+            _for_update(TaskAssignment.objects.filter(pk=instance.pk))
+            .values_list("task_id", "worked_hours", "user_id")
+            .first()
+        )
+        if row is not None:
+            instance._stats_before = row[:2]
+            instance._workload_before = row
+
+
+@receiver(post_save, sender=TaskAssignment)
+@measured("sig")
+def update_stats_on_assignment_save(
+    sender, instance: TaskAssignment, raw=False, **kwargs
+):
+    if raw:
+        return
+    before = getattr(instance, "_stats_before", None) or (None, None)
+    after = (instance.task_id, _hours(instance.worked_hours))
+    if before == after:
+        return
+    delta = stats.StatsDelta()
+    if before[1]:
+        delta.add_worked(before[1], _task_row(instance, before[0])[1], -1)
+    if after[1]:
+        delta.add_worked(after[1], _task_row(instance, after[0])[1])
+    delta.apply()
+
+
+@receiver(pre_delete, sender=TaskAssignment)
+@measured("sig")
+def forget_assignment_task_rows(sender, instance: TaskAssignment, **kwargs):
+    instance._task_rows = {}
+
+
+@receiver(post_delete, sender=TaskAssignment)
+@measured("sig")
+def update_stats_on_assignment_delete(sender, instance: TaskAssignment, **kwargs):
+    if not instance.worked_hours:
+        return
+    delta = stats.StatsDelta()
+    delta.add_worked(
+        instance.worked_hours, _task_row(instance, instance.task_id)[1], -1
+    )
+    delta.apply()
+
+
+@receiver(post_save, sender=ProjectFunding)
+@measured("sig")
+def update_stats_on_link_move(sender, instance: ProjectFunding, created, **kwargs):
+    old = getattr(instance, "_stats_project_id", None)
+    if created or old is None or old == instance.project_id:
+        return
+    stats.recompute_stats(project_ids=[old, instance.project_id])
+
+
+# ─── UserWorkload ─────────────────────────────────────────────────────────────
+# Liczniki per użytkownik (api.workload): przypisanie wnosi status i termin
+# taska oraz własne godziny. Stan "przed" taska i jego przypisanych bierzemy z
+# odczytu w pre_save statystyk, przypisania — z `_workload_before`.
+
+
+@receiver(post_save, sender=get_user_model())
+@measured("sig")
+def create_user_workload(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        workload.create_empty_workload(instance)
+
+
+def _workload_values(values):
+    return {"status": values["status"], "due_date": values["due_date"]}
+
+
+@receiver(post_save, sender=Task)
+@measured("sig")
+def update_workload_on_task_save(
+    sender, instance: Task, created, raw=False, update_fields=None, **kwargs
+):
+    before = getattr(instance, "_stats_before", None)
+    user_ids = getattr(instance, "_workload_users", [])
+    if created or raw or before is None or not user_ids:
+        # Nowy task nie ma jeszcze przypisań.
+        return
+    after = _workload_values(_task_after(instance, before, update_fields))
+    before = _workload_values(before)
+    if after == before:
+        return
+    delta = workload.WorkloadDelta()
+    delta.add_task(user_ids, before, -1)
+    delta.add_task(user_ids, after)
+    delta.apply()
+
+
+@receiver(post_save, sender=TaskAssignment)
+@measured("sig")
+def update_workload_on_assignment_save(
+    sender, instance: TaskAssignment, raw=False, **kwargs
+):
+    if raw:
+        return
+    before = getattr(instance, "_workload_before", None)
+    delta = workload.WorkloadDelta()
+    if before is not None and before[::2] == (instance.task_id, instance.user_id):
+        # Ten sam task i użytkownik — zmieniły się tylko godziny.
+        delta.add_worked(instance.user_id, before[1], -1)
+        delta.add_worked(instance.user_id, _hours(instance.worked_hours))
+    else:
+        values = _task_row(instance, instance.task_id)[0]
+        if before is not None:
+            old = _task_row(instance, before[0])[0]
+            delta.add_task([before[2]], old, -1)
+            delta.add_worked(before[2], before[1], -1)
+        delta.add_task([instance.user_id], values)
+        delta.add_worked(instance.user_id, _hours(instance.worked_hours))
+    delta.apply()
+
+
+@receiver(post_delete, sender=TaskAssignment)
+@measured("sig")
+def update_workload_on_assignment_delete(
+    sender, instance: TaskAssignment, origin=None, **kwargs
+):
+    if getattr(origin, "model", type(origin)) is get_user_model():
+        # Kaskada z usuwanego użytkownika (instancja albo queryset) — jego
+        # wiersz UserWorkload znika razem z nim.
+        return
+    # Przy kaskadzie z Task wiersz taska jeszcze istnieje.
+    delta = workload.WorkloadDelta()
+    delta.add_task([instance.user_id], _task_row(instance, instance.task_id)[0], -1)
+    delta.add_worked(instance.user_id, _hours(instance.worked_hours), -1)
+    delta.apply()
+
+
+# ─── ETag ─────────────────────────────────────────────────────────────────────
+# Przypisania są częścią reprezentacji taska, więc ich zmiana musi zmienić
+# `Task.updated_at` (z niego liczony jest ETag list i detali). Zmiany scope'u
+# dotyka już `effective_scope.sync_tasks`.
+
+
+@receiver(post_save, sender=TaskAssignment)
+@receiver(post_delete, sender=TaskAssignment)
+@measured("sig")
+def touch_task_on_related_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        touch_tasks([instance.task_id])
+
+
+# ─── Zdarzenia na żywo ────────────────────────────────────────────────────────
+# Stan taska przed zmianą czytamy w pre_save/pre_delete, po zmianie — na końcu
+# post_save/post_delete (po synchronizacji scope i `touch_tasks`, więc wersja
+# jest już nowa); różnica idzie do brokera po commicie (api.events). Wewnątrz
+# `events.batch()` receivery tylko zapisują id tasków.
+
+
+def _events_skip(origin):
+    # Kaskada z usuwanego taska — jego zdarzenie wysyła receiver Task.
+    return getattr(origin, "model", type(origin)) is Task
+
+
+@receiver(pre_save, sender=Task)
+@receiver(pre_delete, sender=Task)
+@measured("sig")
+def remember_task_events(sender, instance: Task, raw=False, **kwargs):
+    instance._events_before = None if raw else events.before([instance.pk])
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_delete, sender=Task)
+@measured("sig")
+def publish_task_events(sender, instance: Task, raw=False, **kwargs):
+    if not raw:
+        events.after(getattr(instance, "_events_before", None), [instance.pk])
+
+
+@receiver(pre_save, sender=TaskScope)
+@receiver(pre_delete, sender=TaskScope)
+@receiver(pre_save, sender=TaskAssignment)
+@receiver(pre_delete, sender=TaskAssignment)
+@measured("sig")
+def remember_related_events(sender, instance, raw=False, origin=None, **kwargs):
+    instance._events_before = None
+    if not raw and not _events_skip(origin):
+        instance._events_before = events.before([instance.task_id])
+
+
+@receiver(post_save, sender=TaskScope)
+@receiver(post_delete, sender=TaskScope)
+@receiver(post_save, sender=TaskAssignment)
+@receiver(post_delete, sender=TaskAssignment)
+@measured("sig")
+def publish_related_events(sender, instance, raw=False, origin=None, **kwargs):
+    if not raw and not _events_skip(origin):
+        events.after(getattr(instance, "_events_before", None), [instance.task_id])
+
+
+# ─── Cache odpowiedzi ─────────────────────────────────────────────────────────
+# Każdy zapis podbija generację modelu; odpowiedzi zbudowane na starej
+# generacji przestają być trafiane i wygasają same (TTL / limit rozmiaru).
+# Bez cache'u odpowiedzi (API_RESPONSE_CACHE) receivery nie są podpinane.
+
+CACHED_MODELS = (
+    Task,
+    TaskScope,
+    TaskAssignment,
+    Project,
+    Funding,
+    ProjectFunding,
+    get_user_model(),
+    UserProfile,
+)
+
+
+@measured("sig")
+def bump_cache_generation(sender, **kwargs):
+    bump_generation(sender)
+
+
+for _model in CACHED_MODELS if response_cache.is_enabled() else ():
+    post_save.connect(
+        bump_cache_generation,
+        sender=_model,
+        dispatch_uid=f"cache-save-{_model._meta.label_lower}",
+    )
+    post_delete.connect(
+        bump_cache_generation,
+        sender=_model,
+        dispatch_uid=f"cache-delete-{_model._meta.label_lower}",
+    )
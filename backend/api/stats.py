@@ -0,0 +1,380 @@
+"""Przyrostowe utrzymanie ProjectStats."""
+
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from .models import Project, ProjectFunding, ProjectStats, Task, TaskAssignment
+
+ZERO = Decimal("0")
+
+PROJECT = "project"
+PROJECT_FUNDING = "project_funding"
+
+STATUS_FIELDS = {
+    Task.Status.TODO: "todo_count",
+    Task.Status.DOING: "doing_count",
+    Task.Status.DONE: "done_count",
+}
+
+TASK_FIELDS = ("status", "due_date", "cost_amount", "cost_currency", "est_hours")
+SCOPE_FIELDS = (
+    "scope__project_id",
+    "scope__project_funding_id",
+    "scope__project_funding__project_id",
+)
+
+
+def scope_targets(project_id=None, project_funding_id=None, pf_project_id=None):
+    """Wiersze statystyk, do których wlicza się task o danym scope."""
+    targets = []
+    if project_id:
+        targets.append((PROJECT, project_id))
+    if project_funding_id:
+        targets.append((PROJECT_FUNDING, project_funding_id))
+        if pf_project_id:
+            targets.append((PROJECT, pf_project_id))
+    return targets
+
+
+def _row_targets(row):
+    return scope_targets(*(row[field] for field in SCOPE_FIELDS))
+
+
+def targets_by_task(task_ids):
+    """``{task_id: targets}`` dla wielu tasków jednym zapytaniem."""
+    if not task_ids:
+        return {}
+    return {
+        row["pk"]: _row_targets(row)
+        for row in Task.objects.filter(
+            pk__in=list(task_ids), scope__isnull=False
+        ).values("pk", *SCOPE_FIELDS)
+    }
+
+
+def project_of_link(project_funding_id):
+    if not project_funding_id:
+        return None
+    return (
+        ProjectFunding.objects.filter(pk=project_funding_id)
+        .values_list("project_id", flat=True)
+        .first()
+    )
+
+
+def values_of(task: Task, fields=TASK_FIELDS):
+    """Pola taska z pamięci istotne dla statystyk, w postaci jak po zapisie."""
+    return {
+        field: Task._meta.get_field(field).to_python(getattr(task, field))
+        for field in fields
+    }
+
+
+def contributions(task_ids):
+    """`{task_id: (values, targets, worked_hours)}` odczytane z bazy."""
+    if not task_ids:
+        return {}
+    result = {}
+    for row in Task.objects.filter(pk__in=task_ids).values(
+        "pk", *TASK_FIELDS, *SCOPE_FIELDS
+    ):
+        result[row["pk"]] = [row, _row_targets(row), ZERO]
+    worked = (
+        TaskAssignment.objects.filter(task_id__in=result, worked_hours__isnull=False)
+        .order_by()
+        .values("task_id")
+        .annotate(total=Sum("worked_hours"))
+    )
+    for row in worked:
+        result[row["task_id"]][2] = row["total"]
+    return {task_id: tuple(entry) for task_id, entry in result.items()}
+
+
+def collect(task_ids) -> StatsDelta:
+    """Wkład podanych tasków we wszystkie ich wiersze statystyk."""
+    delta = StatsDelta()
+    for values, targets, worked in contributions(task_ids).values():
+        delta.add_task(values, targets)
+        delta.add_worked(worked, targets)
+    return delta
+
+
+class _Bucket:
+    """Oczekująca zmiana jednego wiersza statystyk."""
+
+    def __init__(self):
+        self.counts = Counter()
+        self.due_dates = []  # (due_date, sign) of open tasks
+        self.costs = defaultdict(Decimal)
+        self.est_hours = ZERO
+        self.worked_hours = ZERO
+
+    def add_task(self, values, sign):
+        status = values["status"]
+        self.counts[status] += sign
+        if status != Task.Status.DONE and values["due_date"]:
+            self.due_dates.append((values["due_date"], sign))
+        if values["cost_amount"] is not None:
+            self.costs[values["cost_currency"]] += sign * values["cost_amount"]
+        if values["est_hours"] is not None:
+            self.est_hours += sign * values["est_hours"]
+
+    def merge(self, other, sign):
+        for status, count in other.counts.items():
+            self.counts[status] += sign * count
+        self.due_dates += [(due, sign * s) for due, s in other.due_dates]
+        for currency, amount in other.costs.items():
+            self.costs[currency] += sign * amount
+        self.est_hours += sign * other.est_hours
+        self.worked_hours += sign * other.worked_hours
+
+    def is_empty(self):
+        due = Counter()
+        for date, sign in self.due_dates:
+            due[date] += sign
+        return (
+            not any(self.counts.values())
+            and not any(due.values())
+            and not any(self.costs.values())
+            and not self.est_hours
+            and not self.worked_hours
+        )
+
+    def apply_to(self, row: ProjectStats):
+        for status, count in self.counts.items():
+            field = STATUS_FIELDS.get(status)
+            if field:
+                setattr(row, field, getattr(row, field) + count)
+        for due, sign in self.due_dates:
+            if due < row.overdue_as_of:
+                row.overdue_count += sign
+        costs = {k: Decimal(v) for k, v in row.cost_by_currency.items()}
+        for currency, amount in self.costs.items():
+            costs[currency] = costs.get(currency, ZERO) + amount
+        row.cost_by_currency = _cost_dict(costs)
+        row.est_hours += self.est_hours
+        row.worked_hours += self.worked_hours
+
+
+class StatsDelta:
+    """Zebrane zmiany dowolnej liczby wierszy statystyk."""
+
+    def __init__(self):
+        self.buckets = defaultdict(_Bucket)
+
+    def add_task(self, values, targets, sign=1):
+        if values is None:
+            return
+        for target in targets:
+            self.buckets[target].add_task(values, sign)
+
+    def add_worked(self, hours, targets, sign=1):
+        if not hours:
+            return
+        for target in targets:
+            self.buckets[target].worked_hours += sign * Decimal(hours)
+
+    def __sub__(self, other: StatsDelta) -> StatsDelta:
+        result = StatsDelta()
+        for target, bucket in self.buckets.items():
+            result.buckets[target].merge(bucket, 1)
+        for target, bucket in other.buckets.items():
+            result.buckets[target].merge(bucket, -1)
+        return result
+
+    def __neg__(self) -> StatsDelta:
+        return StatsDelta() - self
+
+    def apply(self):
+        """Zapisuje zmiany; brakujące wiersze są przeliczane."""
+        pending = {
+            target: bucket
+            for target, bucket in self.buckets.items()
+            if not bucket.is_empty()
+        }
+        if not pending:
+            return
+        wanted = defaultdict(list)
+        for kind, pk in pending:
+            wanted[f"{kind}_id__in"].append(pk)
+        lookup = Q()
+        for field, ids in wanted.items():
+            lookup |= Q(**{field: ids})
+
+        # Bez savepointu: błąd i tak wycofuje transakcję wołającego.
+        with transaction.atomic(savepoint=False):
+            rows = {
+                row.target: row
+                for row in ProjectStats.objects.select_for_update()
+                .filter(lookup)
+                .order_by("pk")
+            }
+            for target, bucket in sorted(pending.items()):
+                row = rows.get(target)
+                if row is None:
+                    # Called after the write, so a rebuild already includes it.
+                    kind, pk = target
+                    recompute_stats(**{f"{kind}_ids": [pk]})
+                    continue
+                bucket.apply_to(row)
+                row.save()
+
+
+def _cost_dict(costs):
+    return {
+        currency: str(amount.quantize(Decimal("0.01")))
+        for currency, amount in sorted(costs.items())
+        if amount
+    }
+
+
+# ---------- rebuild ----------
+
+
+def create_empty_stats(project=None, project_funding=None):
+    """Zeroed row for a project or link that has just been created."""
+    return ProjectStats.objects.create(
+        project=project,
+        project_funding=project_funding,
+        overdue_as_of=timezone.localdate(),
+    )
+
+
+def _scope_filter(kind, ids, prefix=""):
+    if kind == PROJECT:
+        return Q(**{f"{prefix}effective_project_id__in": ids})
+    return Q(**{f"{prefix}scope__project_funding_id__in": ids})
+
+
+def _scope_key(kind, prefix=""):
+    if kind == PROJECT:
+        return F(f"{prefix}effective_project_id")
+    return F(f"{prefix}scope__project_funding_id")
+
+
+def _overdue_q(today):
+    return ~Q(status=Task.Status.DONE) & Q(due_date__lt=today)
+
+
+def _aggregate(kind, ids, today):
+    totals = {
+        pk: {
+            **{field: 0 for field in STATUS_FIELDS.values()},
+            "overdue_count": 0,
+            "overdue_as_of": today,
+            "cost_by_currency": {},
+            "est_hours": ZERO,
+            "worked_hours": ZERO,
+        }
+        for pk in ids
+    }
+    tasks = Task.objects.filter(_scope_filter(kind, ids)).annotate(
+        stats_key=_scope_key(kind)
+    )
+
+    counts = {
+        field: Count("pk", filter=Q(status=status))
+        for status, field in STATUS_FIELDS.items()
+    }
+    for row in (
+        tasks.order_by()
+        .values("stats_key")
+        .annotate(
+            **counts,
+            overdue_count=Count("pk", filter=_overdue_q(today)),
+            est_total=Sum("est_hours"),
+        )
+    ):
+        entry = totals[row["stats_key"]]
+        for field in (*STATUS_FIELDS.values(), "overdue_count"):
+            entry[field] = row[field]
+        entry["est_hours"] = row["est_total"] or ZERO
+
+    costs = defaultdict(dict)
+    for row in (
+        tasks.filter(cost_amount__isnull=False)
+        .order_by()
+        .values("stats_key", "cost_currency")
+        .annotate(total=Sum("cost_amount"))
+    ):
+        costs[row["stats_key"]][row["cost_currency"]] = row["total"]
+    for pk, by_currency in costs.items():
+        totals[pk]["cost_by_currency"] = _cost_dict(by_currency)
+
+    for row in (
+        TaskAssignment.objects.filter(
+            _scope_filter(kind, ids, "task__"), worked_hours__isnull=False
+        )
+        .annotate(stats_key=_scope_key(kind, "task__"))
+        .order_by()
+        .values("stats_key")
+        .annotate(total=Sum("worked_hours"))
+    ):
+        totals[row["stats_key"]]["worked_hours"] = row["total"]
+    return totals
+
+
+def recompute_stats(project_ids=(), project_funding_ids=()):
+    """Przelicza od zera statystyki podanych projektów i powiązań."""
+    today = timezone.localdate()
+    for kind, model, ids in (
+        (PROJECT, Project, project_ids),
+        (PROJECT_FUNDING, ProjectFunding, project_funding_ids),
+    ):
+        ids = list(model.objects.filter(pk__in=list(ids)).values_list("pk", flat=True))
+        if not ids:
+            continue
+        totals = _aggregate(kind, ids, today)
+        fields = list(next(iter(totals.values())))
+        ProjectStats.objects.bulk_create(
+            [
+                ProjectStats(**{f"{kind}_id": pk}, **values)
+                for pk, values in totals.items()
+            ],
+            update_conflicts=True,
+            unique_fields=[kind],
+            update_fields=[*fields, "updated_at"],
+        )
+
+
+# ---------- read ----------
+
+
+def get_stats(project=None, project_funding=None) -> ProjectStats:
+    """Statystyki projektu lub powiązania; tworzone albo odświeżane w razie potrzeby."""
+    kind, obj = (
+        (PROJECT, project)
+        if project is not None
+        else (
+            PROJECT_FUNDING,
+            project_funding,
+        )
+    )
+    lookup = {f"{kind}_id": obj.pk}
+    row = ProjectStats.objects.filter(**lookup).first()
+    if row is None:
+        # W transakcji router czyta z primary (api.replicas); replika może
+        # jeszcze nie mieć ani tasków, ani przeliczonego wiersza.
+        with transaction.atomic():
+            recompute_stats(**{f"{kind}_ids": [obj.pk]})
+            return ProjectStats.objects.get(**lookup)
+
+    today = timezone.localdate()
+    if row.overdue_as_of < today:
+        with transaction.atomic():
+            row = ProjectStats.objects.select_for_update().get(**lookup)
+            if row.overdue_as_of < today:
+                row.overdue_count = (
+                    Task.objects.filter(_scope_filter(kind, [obj.pk]))
+                    .filter(_overdue_q(today))
+                    .count()
+                )
+                row.overdue_as_of = today
+                row.save(update_fields=["overdue_count", "overdue_as_of", "updated_at"])
+    return row
@@ -0,0 +1,360 @@
+"""Syntetyczne dane do testów obciążenia (`seed_demo --scale`)."""
+
+from __future__ import annotations
+
+import itertools
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import (
+    Funding,
+    Project,
+    ProjectFunding,
+    Task,
+    TaskAssignment,
+    TaskScope,
+    UserProfile,
+)
+from .response_cache import bump_generation
+from .stats import recompute_stats
+from .workload import recompute_workload
+
+TASK_COLUMNS = (
+    "id",
+    "title",
+    "description",
+    "status",
+    "priority",
+    "start_date",
+    "due_date",
+    "cost_amount",
+    "cost_currency",
+    "receipt_url",
+    "receipt_note",
+    "est_hours",
+    "created_at",
+    "updated_at",
+    "effective_project_id",
+    "effective_funding_id",
+)
+SCOPE_COLUMNS = (
+    "task_id",
+    "project_id",
+    "funding_id",
+    "project_funding_id",
+    "funding_scoped",
+    "origin_key",
+    "created_at",
+)
+ASSIGNMENT_COLUMNS = ("task_id", "user_id", "assigned_at", "worked_hours")
+
+ZIPF_EXPONENT = 1.1
+HISTORY_DAYS = 730
+STATS_CHUNK = 200
+
+VERBS = (
+    "Przygotować",
+    "Rozliczyć",
+    "Zamówić",
+    "Sprawdzić",
+    "Wysłać",
+    "Opisać",
+    "Zebrać",
+    "Nagrać",
+    "Zaplanować",
+    "Podpisać",
+)
+NOUNS = (
+    "raport",
+    "faktury",
+    "umowę",
+    "plakat",
+    "nagłośnienie",
+    "transport",
+    "próbę",
+    "wniosek",
+    "budżet",
+    "harmonogram",
+    "materiały",
+    "zaproszenia",
+)
+PLACES = ("Kraków", "Gdańsk", "Poznań", "Wrocław", "Lublin", "Łódź", "Katowice")
+
+
+def zipf_sizes(rng, count, total):
+    """Dzieli `total` na `count` rozmiarów według Zipfa (w losowej kolejności)."""
+    weights = [1 / (rank**ZIPF_EXPONENT) for rank in range(1, count + 1)]
+    scale = total / sum(weights)
+    sizes = [int(w * scale) for w in weights]
+    for i in range(total - sum(sizes)):
+        sizes[i % count] += 1
+    rng.shuffle(sizes)
+    return sizes
+
+
+def _reserve_ids(model, count):
+    """Rezerwuje `count` kolejnych id z sekwencji modelu."""
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT setval(pg_get_serial_sequence(%s, 'id'), "
+            "nextval(pg_get_serial_sequence(%s, 'id')) + %s - 1)",
+            [table, table, count],
+        )
+        last = cursor.fetchone()[0]
+    return last - count + 1
+
+
+def _copy(model, columns, rows):
+    sql = "COPY {} ({}) FROM STDIN".format(
+        connection.ops.quote_name(model._meta.db_table),
+        ", ".join(connection.ops.quote_name(c) for c in columns),
+    )
+    with connection.cursor() as cursor:
+        with cursor.copy(sql) as copy:
+            for row in rows:
+                copy.write_row(row)
+
+
+class SyntheticDataGenerator:
+    def __init__(
+        self,
+        *,
+        projects,
+        tasks_per_project,
+        users,
+        fundings,
+        seed=0,
+        batch_size=50_000,
+        log=None,
+    ):
+        self.projects = projects
+        self.tasks_per_project = tasks_per_project
+        self.users = users
+        self.fundings = fundings
+        self.seed = seed
+        self.batch_size = batch_size
+        self.rng = random.Random(seed)
+        self.now = timezone.now()
+        self.log = log or (lambda message: None)
+
+    # ---------- small tables ----------
+
+    def _create_users(self):
+        User = get_user_model()
+        password = make_password(None)
+        prefix = f"load{self.seed}_"
+        User.objects.bulk_create(
+            [
+                User(username=f"{prefix}{i:06d}", password=password, is_active=True)
+                for i in range(self.users)
+            ],
+            ignore_conflicts=True,
+        )
+        users = list(
+            User.objects.filter(username__startswith=prefix)
+            .order_by("username")
+            .values_list("pk", flat=True)
+        )
+        UserProfile.objects.bulk_create(
+            [UserProfile(user_id=pk) for pk in users], ignore_conflicts=True
+        )
+        return users
+
+    def _create_fundings(self):
+        rng = self.rng
+        start = self.now.date() - timedelta(days=HISTORY_DAYS)
+        fundings = Funding.objects.bulk_create(
+            [
+                Funding(
+                    type=rng.choice(Funding.Type.values),
+                    name=f"Grant {rng.choice(PLACES)} {i}",
+                    funder=f"Instytucja {i % 17}",
+                    program=f"Program {i % 5}",
+                    agreement_number=f"UM/{2024 + i % 3}/{i:05d}",
+                    amount_total=Decimal(rng.randrange(10_000, 2_000_000)),
+                    start_date=start + timedelta(days=rng.randrange(365)),
+                )
+                for i in range(self.fundings)
+            ]
+        )
+        return fundings
+
+    def _create_projects(self, owners):
+        rng = self.rng
+        start = self.now.date() - timedelta(days=HISTORY_DAYS)
+        return Project.objects.bulk_create(
+            [
+                Project(
+                    name=f"{rng.choice(NOUNS).capitalize()} {rng.choice(PLACES)} {i}",
+                    description=" ".join(rng.sample(NOUNS, 4)),
+                    status=rng.choice(Project.Status.values),
+                    owner_id=rng.choice(owners) if owners else None,
+                    start_date=start + timedelta(days=rng.randrange(HISTORY_DAYS)),
+                )
+                for i in range(self.projects)
+            ]
+        )
+
+    def _create_links(self, projects, fundings):
+        """Każdy projekt dostaje 0–2 finansowania; zwraca `{project_id: [links]}`."""
+        if not fundings:
+            return {}
+        rng = self.rng
+        links = []
+        for project in projects:
+            for funding in rng.sample(
+                fundings, min(len(fundings), rng.choice((0, 1, 1, 2)))
+            ):
+                links.append(ProjectFunding(project=project, funding=funding))
+        links = ProjectFunding.objects.bulk_create(links)
+        by_project = {}
+        for link in links:
+            by_project.setdefault(link.project_id, []).append(link)
+        return by_project
+
+    # ---------- tasks ----------
+
+    def _task_rows(self, first_id, sizes, projects, links, fundings, users):
+        """Krotki wierszy `(task, scope, assignments)`."""
+        rng = self.rng
+        now = self.now
+        statuses = Task.Status.values
+        priorities = Task.Priority.values
+        user_weights = list(
+            itertools.accumulate(
+                1 / (r**ZIPF_EXPONENT) for r in range(1, len(users) + 1)
+            )
+        )
+        task_id = first_id
+        for project, size in zip(projects, sizes):
+            project_links = links.get(project.pk, ())
+            for _ in range(size):
+                created = now - timedelta(seconds=rng.randrange(HISTORY_DAYS * 86400))
+                due = start = None
+                if rng.random() < 0.8:
+                    due = (created + timedelta(days=rng.randrange(-10, 120))).date()
+                    if rng.random() < 0.6:
+                        start = due - timedelta(days=rng.randrange(0, 30))
+                status = rng.choices(statuses, (3, 2, 5))[0]
+                cost = None
+                if rng.random() < 0.2:
+                    cost = Decimal(rng.randrange(1_000, 500_000)) / 100
+                currency = "EUR" if rng.random() < 0.1 else "PLN"
+
+                roll = rng.random()
+                if project_links and roll < 0.25:
+                    link = rng.choice(project_links)
+                    scope = (None, None, link.pk, True)
+                    effective = (project.pk, link.funding_id)
+                elif fundings and roll > 0.97:
+                    funding = rng.choice(fundings)
+                    scope = (None, funding.pk, None, False)
+                    effective = (None, funding.pk)
+                else:
+                    scope = (project.pk, None, None, False)
+                    effective = (project.pk, None)
+
+                task = (
+                    task_id,
+                    f"{rng.choice(VERBS)} {rng.choice(NOUNS)} {rng.choice(PLACES)}",
+                    " ".join(rng.choices(NOUNS, k=rng.randrange(0, 12))),
+                    status,
+                    rng.choice(priorities),
+                    start,
+                    due,
+                    cost,
+                    currency,
+                    "",
+                    "",
+                    Decimal(rng.randrange(1, 80)) if rng.random() < 0.5 else None,
+                    created,
+                    created,
+                    *effective,
+                )
+                scope_row = (task_id, *scope, "", created)
+                assignments = []
+                if users:
+                    picked = set(
+                        rng.choices(
+                            users, cum_weights=user_weights, k=rng.choice((0, 1, 1, 2))
+                        )
+                    )
+                    for user_id in picked:
+                        worked = None
+                        if status == Task.Status.DONE:
+                            worked = Decimal(rng.randrange(1, 400)) / 10
+                        assignments.append((task_id, user_id, created, worked))
+                yield task, scope_row, assignments
+                task_id += 1
+
+    def _write_tasks(self, sizes, projects, links, fundings, users):
+        total = sum(sizes)
+        if not total:
+            return 0
+        first_id = _reserve_ids(Task, total)
+        rows = self._task_rows(first_id, sizes, projects, links, fundings, users)
+        written = 0
+        while True:
+            batch = list(itertools.islice(rows, self.batch_size))
+            if not batch:
+                break
+            with transaction.atomic():
+                _copy(Task, TASK_COLUMNS, (task for task, _, _ in batch))
+                _copy(TaskScope, SCOPE_COLUMNS, (scope for _, scope, _ in batch))
+                _copy(
+                    TaskAssignment,
+                    ASSIGNMENT_COLUMNS,
+                    (row for _, _, assignments in batch for row in assignments),
+                )
+            written += len(batch)
+            self.log(f"{written}/{total}")
+        return written
+
+    # ---------- entry point ----------
+
+    def run(self):
+        with transaction.atomic():
+            users = self._create_users()
+            fundings = self._create_fundings()
+            projects = self._create_projects(users)
+            links = self._create_links(projects, fundings)
+        sizes = zipf_sizes(
+            self.rng, len(projects), len(projects) * self.tasks_per_project
+        )
+
+        tasks = self._write_tasks(sizes, projects, links, fundings, users)
+
+        project_ids = [p.pk for p in projects]
+        for i in range(0, len(project_ids), STATS_CHUNK):
+            chunk = project_ids[i : i + STATS_CHUNK]
+            recompute_stats(
+                project_ids=chunk,
+                project_funding_ids=[
+                    link.pk for pk in chunk for link in links.get(pk, ())
+                ],
+            )
+        for i in range(0, len(users), STATS_CHUNK):
+            recompute_workload(users[i : i + STATS_CHUNK])
+        bump_generation(
+            Task, TaskScope, TaskAssignment, Project, Funding, ProjectFunding
+        )
+        with connection.cursor() as cursor:
+            for model in (Task, TaskScope, TaskAssignment):
+                cursor.execute(
+                    f"ANALYZE {connection.ops.quote_name(model._meta.db_table)}"
+                )
+        return {
+            "users": len(users),
+            "fundings": len(fundings),
+            "projects": len(projects),
+            "links": sum(len(v) for v in links.values()),
+            "tasks": tasks,
+            "largest_project": max(sizes, default=0),
+        }
@@ -0,0 +1,338 @@
+"""Strumieniowy import tasków z plików CSV/XLSX (`api.TaskImport`)."""
+
+from __future__ import annotations
+
+import csv
+import io
+import itertools
+import re
+from datetime import date, datetime
+from pathlib import PurePath
+
+from django.contrib.auth import get_user_model
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+
+from .bulk import BULK_MAX_ITEMS, TaskBulkWriter
+from .models import Funding, Project, ProjectFunding, TaskImport
+
+User = get_user_model()
+
+IMPORT_BATCH_SIZE = 500
+MAX_STORED_ERRORS = 1000
+
+# Columns copied as they are into the bulk item; ``project``, ``funding`` and
+# ``assignees`` are resolved first. Unknown columns are ignored.
+PLAIN_COLUMNS = (
+    "title",
+    "description",
+    "status",
+    "priority",
+    "start_date",
+    "due_date",
+    "cost_amount",
+    "cost_currency",
+    "receipt_url",
+    "receipt_note",
+    "est_hours",
+)
+
+_USERNAMES_RE = re.compile(r"[\s,;]+")
+
+
+class ImportFormatError(Exception):
+    """Pliku nie da się odczytać (zły format, brak nagłówka...)."""
+
+
+class ImportConflict(Exception):
+    """Inny worker zapisał w międzyczasie partie tego samego importu."""
+
+
+def detect_format(filename):
+    suffix = PurePath(filename or "").suffix.lower().lstrip(".")
+    if suffix not in TaskImport.Format.values:
+        raise ImportFormatError("Expected a .csv or .xlsx file.")
+    if suffix == TaskImport.Format.XLSX:
+        _openpyxl()
+    return suffix
+
+
+def _openpyxl():
+    try:
+        import openpyxl
+    except ImportError:
+        raise ImportFormatError("XLSX import requires the openpyxl package.") from None
+    return openpyxl
+
+
+# ---------- reading ----------
+
+
+def _header(cells):
+    return [str(cell or "").strip().lower() for cell in cells]
+
+
+def _csv_rows(fh):
+    text = io.TextIOWrapper(fh, encoding="utf-8-sig", newline="")
+    sample = text.read(4096)
+    text.seek(0)
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+    reader = csv.reader(text, dialect)
+    header = _header(next(reader, []))
+    for cells in reader:
+        yield dict(zip(header, cells))
+
+
+def _xlsx_rows(fh):
+    workbook = _openpyxl().load_workbook(fh, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = _header(next(rows, ()))
+        for cells in rows:
+            yield dict(zip(header, cells))
+    finally:
+        workbook.close()
+
+
+def read_rows(fh, file_format):
+    """Zwraca `(numer wiersza, {kolumna: wartość})`; wiersz 1 to nagłówek."""
+    rows = _xlsx_rows(fh) if file_format == TaskImport.Format.XLSX else _csv_rows(fh)
+    first = next(rows, None)
+    if first is None:
+        return
+    if "title" not in first:
+        raise ImportFormatError('The header must contain a "title" column.')
+    for number, row in enumerate(itertools.chain([first], rows), start=2):
+        yield number, row
+
+
+# ---------- one batch ----------
+
+
+def _cell(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    value = str(value).strip()
+    return value or None
+
+
+def _reference(value):
+    """`("id", 12)` dla komórek liczbowych, `("name", "...")` dla pozostałych."""
+    if value is None:
+        return None
+    if value.isdigit():
+        return ("id", int(value))
+    return ("name", value)
+
+
+def _names_to_ids(model, names):
+    """`{nazwa: pk}` dla unikalnych nazw, `{nazwa: None}` dla niejednoznacznych."""
+    found = {}
+    for name, pk in model.objects.filter(name__in=names).values_list("name", "pk"):
+        found[name] = None if name in found else pk
+    return found
+
+
+class _Batch:
+    def __init__(self, rows):
+        self.rows = []
+        for number, row in rows:
+            cells = {key: _cell(value) for key, value in row.items() if key}
+            if any(value is not None for value in cells.values()):  # blank lines
+                self.rows.append((number, cells))
+        self.errors = {}
+
+    def _error(self, number, field, message):
+        self.errors.setdefault(number, {}).setdefault(field, []).append(message)
+
+    def resolve(self):
+        """Rozwiązuje nazwy, loginy i powiązania projekt+finansowanie."""
+        refs = {"project": set(), "funding": set()}
+        usernames = set()
+        for _, row in self.rows:
+            for name in refs:
+                ref = _reference(row.get(name))
+                if ref and ref[0] == "name":
+                    refs[name].add(ref[1])
+            usernames.update(_USERNAMES_RE.split(row.get("assignees") or ""))
+        usernames.discard("")
+
+        by_name = {
+            "project": _names_to_ids(Project, refs["project"]),
+            "funding": _names_to_ids(Funding, refs["funding"]),
+        }
+        users = dict(
+            User.objects.filter(username__in=usernames).values_list("username", "pk")
+        )
+
+        resolved = []
+        for number, row in self.rows:
+            ids = {}
+            for name in refs:
+                ref = _reference(row.get(name))
+                if ref is None:
+                    ids[name] = None
+                elif ref[0] == "id":
+                    ids[name] = ref[1]
+                elif by_name[name].get(ref[1]) is not None:
+                    ids[name] = by_name[name][ref[1]]
+                else:
+                    problem = "ambiguous" if ref[1] in by_name[name] else "unknown"
+                    self._error(
+                        number, name, f'{problem.capitalize()} name "{ref[1]}".'
+                    )
+            assignees = []
+            for username in _USERNAMES_RE.split(row.get("assignees") or ""):
+                if not username:
+                    continue
+                if username in users:
+                    assignees.append(users[username])
+                else:
+                    self._error(number, "assignees", f'Unknown user "{username}".')
+            resolved.append((number, row, ids, assignees))
+
+        pairs = {
+            (ids["project"], ids["funding"])
+            for _, _, ids, _ in resolved
+            if ids.get("project") and ids.get("funding")
+        }
+        links = {}
+        if pairs:
+            project_ids = {p for p, _ in pairs}
+            funding_ids = {f for _, f in pairs}
+            for pk, project_id, funding_id in ProjectFunding.objects.filter(
+                project_id__in=project_ids, funding_id__in=funding_ids
+            ).values_list("pk", "project_id", "funding_id"):
+                links[(project_id, funding_id)] = pk
+
+        self.items = []
+        for number, row, ids, assignees in resolved:
+            if number in self.errors:
+                continue
+            item = {c: row[c] for c in PLAIN_COLUMNS if row.get(c) is not None}
+            project_id, funding_id = ids.get("project"), ids.get("funding")
+            if project_id and funding_id:
+                link = links.get((project_id, funding_id))
+                if link is None:
+                    self._error(
+                        number, "funding", "Funding is not linked to the project."
+                    )
+                    continue
+                item["project_funding"] = link
+            elif project_id:
+                item["project"] = project_id
+            elif funding_id:
+                item["funding"] = funding_id
+            if assignees:
+                item["assignee_ids"] = assignees
+            self.items.append((number, item))
+
+    def write(self, assigned_by):
+        """Zapisuje poprawne pozycje; zwraca liczbę utworzonych tasków."""
+        writer = TaskBulkWriter({"create": [item for _, item in self.items]})
+        if self.items and not writer.is_valid():
+            valid = []
+            for (number, item), errors in zip(self.items, writer.errors["create"]):
+                if errors:
+                    self.errors[number] = errors
+                else:
+                    valid.append((number, item))
+            self.items = valid
+            writer = TaskBulkWriter({"create": [item for _, item in self.items]})
+            writer.is_valid()
+        if not self.items:
+            return 0
+        return len(writer.save(assigned_by=assigned_by)["create"])
+
+
+# ---------- job ----------
+
+
+def create_import(fh, filename, created_by=None):
+    """Zapisuje plik i kolejkuje import; `ImportFormatError` dla złego formatu."""
+    job = TaskImport(
+        format=detect_format(filename),
+        label=PurePath(filename).name,
+        created_by=created_by,
+    )
+    job.file.save(PurePath(filename).name, File(fh), save=False)
+    job.save()
+    return job
+
+
+def _lock_progress(job):
+    """Blokuje wiersz zlecenia; `ImportConflict`, jeśli postęp się przesunął."""
+    rows_done = (
+        TaskImport.objects.select_for_update()
+        .values_list("rows_done", flat=True)
+        .get(pk=job.pk)
+    )
+    if rows_done != job.rows_done:
+        raise ImportConflict(
+            f"Import #{job.pk} is being processed by another worker "
+            f"({rows_done} rows done, expected {job.rows_done})."
+        )
+
+
+def run_import(job: TaskImport, batch_size=IMPORT_BATCH_SIZE, on_progress=None):
+    """Wykonuje jeden import; ponowne uruchomienie kontynuuje po ostatniej partii."""
+    batch_size = max(1, min(batch_size, BULK_MAX_ITEMS))
+    with transaction.atomic():
+        _lock_progress(job)
+        job.status = TaskImport.Status.RUNNING
+        job.error = ""
+        job.save(update_fields=["status", "error", "updated_at"])
+
+    try:
+        with job.file.open("rb") as fh:
+            rows = itertools.islice(read_rows(fh, job.format), job.rows_done, None)
+            while True:
+                chunk = list(itertools.islice(rows, batch_size))
+                if not chunk:
+                    break
+                batch = _Batch(chunk)
+                with transaction.atomic():
+                    _lock_progress(job)
+                    batch.resolve()
+                    imported = batch.write(job.created_by)
+                    job.rows_done += len(chunk)
+                    job.imported += imported
+                    job.failed += len(batch.errors)
+                    room = MAX_STORED_ERRORS - len(job.errors)
+                    job.errors += [
+                        {"row": number, "errors": errors}
+                        for number, errors in sorted(batch.errors.items())[:room]
+                    ]
+                    job.save(
+                        update_fields=[
+                            "rows_done",
+                            "imported",
+                            "failed",
+                            "errors",
+                            "updated_at",
+                        ]
+                    )
+                if on_progress is not None:
+                    on_progress(job)
+    except ImportConflict:
+        raise
+    except Exception as exc:
+        job.status = TaskImport.Status.FAILED
+        job.error = str(exc)
+        job.save(update_fields=["status", "error", "updated_at"])
+        raise
+
+    job.status = TaskImport.Status.DONE
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "finished_at", "updated_at"])
+    return job
@@ -0,0 +1,122 @@
+import json
+from datetime import date, timedelta
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient
+from rest_framework.test import APIClient
+
+from api.models import Task, TaskAssignment, TaskScope
+
+User = get_user_model()
+
+
+def _task(project, **fields):
+    task = Task.objects.create(title=fields.pop("title", "t"), **fields)
+    TaskScope.objects.create(task=task, project=project)
+    return task
+
+
+def _json(res):
+    assert res.status_code == 200, res.content
+    return json.loads(res.content)
+
+
+@pytest.fixture
+def tasks(project, user):
+    today = date.today()
+    created = [
+        _task(
+            project,
+            title=f"t{i}",
+            status=Task.Status.values[i % 3],
+            priority=Task.Priority.values[i % 3],
+            start_date=today + timedelta(days=i),
+            due_date=today + timedelta(days=i + 2),
+        )
+        for i in range(5)
+    ]
+    TaskAssignment.objects.create(task=created[0], user=user)
+    return created
+
+
+@pytest.mark.django_db
+def test_task_list_matches_sync_cursor_pages(api_client, tasks):
+    sync = _json(api_client.get("/api/tasks/?pagination=cursor&page_size=2"))
+    res = _json(api_client.get("/api/async/tasks/?page_size=2"))
+    assert res["results"] == sync["results"]
+    assert res["next"] and res["previous"] is None
+
+    # Kursor z async listy prowadzi dalej po tej samej kolejności.
+    rest = _json(api_client.get(res["next"]))
+    sync_rest = _json(api_client.get(sync["next"]))
+    assert rest["results"] == sync_rest["results"]
+
+
+@pytest.mark.django_db
+def test_task_list_applies_filters_and_fields(api_client, tasks):
+    res = _json(api_client.get("/api/async/tasks/?status=done&fields=id,title"))
+    assert res["results"] == [
+        {"id": t.id, "title": t.title}
+        for t in reversed(tasks)
+        if t.status == Task.Status.DONE
+    ]
+
+
+@pytest.mark.django_db
+def test_board_and_timeline_match_sync(api_client, project, tasks):
+    for path in ("board/", "board/?column=todo", "timeline/?from={0}&to={1}"):
+        path = path.format(date.today(), date.today() + timedelta(days=30))
+        sync = _json(api_client.get(f"/api/projects/{project.id}/{path}"))
+        res = _json(api_client.get(f"/api/async/projects/{project.id}/{path}"))
+        assert res == sync, path
+
+
+@pytest.mark.django_db
+def test_user_list_matches_sync(api_client, user, tasks):
+    for i in range(3):
+        User.objects.create_user(username=f"u{i}", password="x")
+    sync = _json(api_client.get("/api/users/"))
+    res = _json(api_client.get("/api/async/users/"))
+    assert res["results"] == sync["results"]
+    me = next(u for u in res["results"] if u["id"] == user.id)
+    assert me["tasks_count"] == 1
+
+
+@pytest.mark.django_db
+def test_errors_match_sync(api_client, project):
+    cases = [
+        f"projects/{project.id}/board/?column=nope",
+        f"projects/{project.id}/timeline/?from=2024-01-02&to=2024-01-01",
+        "projects/999999/board/",
+    ]
+    for path in cases:
+        sync = api_client.get(f"/api/{path}")
+        res = api_client.get(f"/api/async/{path}")
+        assert (res.status_code, json.loads(res.content)) == (
+            sync.status_code,
+            sync.json(),
+        ), path
+
+
+@pytest.mark.django_db
+def test_anonymous_is_rejected(project):
+    client = APIClient()
+    for path in ("tasks/", "users/", f"projects/{project.id}/board/"):
+        res = client.get(f"/api/async/{path}")
+        assert res.status_code == 403, path
+    assert _json(client.get("/api/async/health/")) == {"status": "ok"}
+
+
+@pytest.mark.django_db
+def test_served_through_asgi_handler(user, project, tasks, settings):
+    settings.API_SERVER_TIMING = True
+    client = AsyncClient()
+    client.force_login(user)
+
+    res = async_to_sync(client.get)(f"/api/async/projects/{project.id}/board/")
+    assert _json(res)["project"] == project.id
+    # Zapytania z wątków sync_to_async też są liczone.
+    db = res["Server-Timing"].split(",")[0]
+    assert 'desc="0 queries"' not in db
@@ -0,0 +1,22 @@
+import pytest
+
+from api.benchmark_async import PAIRS, compare_handlers, session_cookie
+
+
+@pytest.mark.django_db(transaction=True)
+def test_compare_handlers_runs_both_paths(user, project):
+    # Handlery same zamykają połączenia, więc dane muszą być zatwierdzone.
+    pairs = [p for p in PAIRS if p.name in ("health", "projects-board")]
+    results = compare_handlers(
+        pairs,
+        {"project": project.id},
+        session_cookie(user),
+        requests=4,
+        workers=2,
+        concurrency=2,
+    )
+
+    assert set(results) == {"health", "projects-board"}
+    for name, kinds in results.items():
+        for kind, result in kinds.items():
+            assert (result["requests"], result["errors"]) == (4, 0), (name, kind)
@@ -0,0 +1,39 @@
+import re
+
+import pytest
+
+from api.benchmark import SCENARIOS, compare, load_baseline, run
+from api.management.commands.benchmark import DEFAULT_BASELINE
+from api.urls import router
+
+
+def test_scenarios_cover_every_router_endpoint():
+    prefixes = {re.match(r"/api/([^/?]+)", s.url).group(1) for s in SCENARIOS}
+    assert {prefix for prefix, _, _ in router.registry} <= prefixes
+
+
+@pytest.mark.django_db
+def test_query_counts_match_baseline():
+    baseline = load_baseline(DEFAULT_BASELINE)["xs"]
+    results = run("xs", repeat=1)
+
+    assert set(results) == set(baseline)
+    # Czasy i pamięć zależą od maszyny — tu pilnujemy tylko liczby zapytań.
+    assert compare(results, baseline, latency_tolerance=0, memory_tolerance=0) == []
+
+
+def test_compare_reports_regressions():
+    baseline = {
+        "tasks-list": {"status": 200, "queries": 4, "p50_ms": 10.0, "peak_kib": 100}
+    }
+    current = {
+        "tasks-list": {"status": 200, "queries": 5, "p50_ms": 40.0, "peak_kib": 90}
+    }
+
+    assert compare(current, baseline) == [
+        "tasks-list: queries 4 -> 5",
+        "tasks-list: p50 10.0 ms -> 40.0 ms",
+    ]
+    assert compare(current, baseline, latency_tolerance=0) == [
+        "tasks-list: queries 4 -> 5"
+    ]
@@ -0,0 +1,99 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.models import Task, TaskAssignment
+
+
+def _revalidate(api_client, url, etag):
+    return api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "url", ["/api/tasks/", "/api/projects/", "/api/fundings/", "/api/project-fundings/"]
+)
+def test_list_answers_304_while_unchanged(api_client, task_pf_scoped, url):
+    res = api_client.get(url)
+    assert res.status_code == 200
+    assert res["ETag"]
+    assert not res.has_header("Last-Modified")
+    assert res["Cache-Control"] == "private, no-cache"
+
+    with CaptureQueriesContext(connection) as ctx:
+        res = _revalidate(api_client, url, res["ETag"])
+    assert res.status_code == 304
+    assert not res.content
+    sqls = [q["sql"].lower() for q in ctx.captured_queries]
+    if url == "/api/project-fundings/":
+        # Bez cache_models: tylko agregaty walidatora, bez serializacji.
+        assert sqls and all("max(" in sql for sql in sqls)
+    else:
+        # ETag z generacji cache'u odpowiedzi — bez zapytań do bazy.
+        assert sqls == []
+
+
+@pytest.mark.django_db
+def test_task_detail_changes_etag_on_update(api_client, task_project_scoped):
+    url = f"/api/tasks/{task_project_scoped.id}/"
+    etag = api_client.get(url)["ETag"]
+    assert _revalidate(api_client, url, etag).status_code == 304
+
+    res = api_client.patch(url, {"title": "Renamed"}, format="json")
+    assert res.status_code == 200
+
+    res = _revalidate(api_client, url, etag)
+    assert res.status_code == 200
+    assert res.data["title"] == "Renamed"
+    assert res["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_list_ignores_if_modified_since(api_client, task_project_scoped, task_unscoped):
+    detail = api_client.get(f"/api/tasks/{task_project_scoped.id}/")
+    since = detail["Last-Modified"]
+    res = api_client.get(
+        f"/api/tasks/{task_project_scoped.id}/", HTTP_IF_MODIFIED_SINCE=since
+    )
+    assert res.status_code == 304
+
+    # Usunięcie nie przesuwa MAX(updated_at) listy — sama data dałaby 304.
+    Task.objects.filter(pk=task_unscoped.pk).delete()
+    res = api_client.get("/api/tasks/", HTTP_IF_MODIFIED_SINCE=since)
+    assert res.status_code == 200
+    assert [t["id"] for t in res.data["results"]] == [task_project_scoped.id]
+
+
+@pytest.mark.django_db
+def test_task_list_etag_follows_deletes_and_assignments(
+    api_client, user, task_project_scoped, task_unscoped
+):
+    url = "/api/tasks/"
+    etag = api_client.get(url)["ETag"]
+
+    TaskAssignment.objects.create(task=task_project_scoped, user=user)
+    res = _revalidate(api_client, url, etag)
+    assert res.status_code == 200
+    etag = res["ETag"]
+
+    Task.objects.filter(pk=task_unscoped.pk).delete()
+    res = _revalidate(api_client, url, etag)
+    assert res.status_code == 200
+    assert [t["id"] for t in res.data["results"]] == [task_project_scoped.id]
+
+
+@pytest.mark.django_db
+def test_project_etag_follows_its_tasks_only_when_requested(
+    api_client, project, task_project_scoped
+):
+    full = f"/api/projects/{project.id}/"
+    slim = f"/api/projects/{project.id}/?fields=id,name"
+    etags = {url: api_client.get(url)["ETag"] for url in (full, slim)}
+
+    task_project_scoped.title = "Renamed"
+    task_project_scoped.save()
+
+    assert _revalidate(api_client, slim, etags[slim]).status_code == 304
+    res = _revalidate(api_client, full, etags[full])
+    assert res.status_code == 200
+    assert "Renamed" in res.data["tasks"]
@@ -0,0 +1,46 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from api.index_advisor import endpoint_urls, seq_scans, shape
+from api.models import Task
+
+
+def test_shape_hides_literals():
+    assert shape("SELECT 1 FROM t WHERE a = 'x''y' AND b = 42") == (
+        "SELECT ? FROM t WHERE a = ? AND b = ?"
+    )
+
+
+def test_endpoints_without_ids_are_skipped():
+    urls = endpoint_urls({"today": "2025-01-01", "horizon": "2025-04-01", "user": 1})
+    assert "/api/tasks/" in urls
+    assert "/api/users/1/" in urls
+    assert not any("projects/{" in url or "project=" in url for url in urls)
+
+
+def test_seq_scans_walks_nested_plans():
+    plan = {
+        "Node Type": "Hash Join",
+        "Plans": [
+            {"Node Type": "Seq Scan", "Relation Name": "api_task"},
+            {"Node Type": "Hash", "Plans": [{"Node Type": "Index Scan"}]},
+        ],
+    }
+    assert [n["Relation Name"] for n in seq_scans(plan)] == ["api_task"]
+
+
+@pytest.mark.django_db
+def test_command_reports_seq_scans_and_keeps_no_writes(project, task_project_scoped):
+    out = StringIO()
+    call_command("index_advisor", "--min-rows", "0", "--json", stdout=out)
+    report = json.loads(out.getvalue())
+
+    statuses = {e["url"]: e["status"] for e in report["endpoints"]}
+    assert statuses[f"/api/projects/{project.id}/board/"] == 200
+    assert all(status == 200 for status in statuses.values())
+    # Na prawie pustej bazie planner wybiera skany sekwencyjne.
+    assert any(scan["relation"] == "api_task" for scan in report["seq_scans"])
+    assert Task.objects.count() == 1
@@ -0,0 +1,46 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.models import Funding, Project, ProjectFunding, Task, TaskScope
+
+
+def _make_projects(n):
+    for i in range(n):
+        project = Project.objects.create(name=f"P{i}")
+        funding = Funding.objects.create(name=f"F{i}")
+        pf = ProjectFunding.objects.create(project=project, funding=funding)
+        for scope in ({"project": project}, {"funding": funding}):
+            t = Task.objects.create(title=f"{i}-{next(iter(scope))}")
+            TaskScope.objects.create(task=t, **scope)
+        t = Task.objects.create(title=f"{i}-pf")
+        TaskScope.objects.create(task=t, project_funding=pf, funding_scoped=True)
+
+
+def _count_queries(api_client, url):
+    with CaptureQueriesContext(connection) as ctx:
+        res = api_client.get(url)
+    assert res.status_code == 200
+    return len(ctx.captured_queries)
+
+
+@pytest.mark.parametrize(
+    "url", ["/api/projects/", "/api/fundings/", "/api/project-fundings/"]
+)
+@pytest.mark.django_db
+def test_list_query_count_does_not_grow_with_page(api_client, url):
+    _make_projects(2)
+    small = _count_queries(api_client, url)
+
+    _make_projects(6)
+    large = _count_queries(api_client, url)
+
+    assert large == small
+
+
+@pytest.mark.django_db
+def test_project_list_tasks_include_direct_and_pf_tasks(api_client):
+    _make_projects(3)
+    res = api_client.get("/api/projects/?ordering=name")
+    by_name = {p["name"]: p["tasks"] for p in res.data["results"]}
+    assert by_name["P1"] == ["1-project", "1-pf"]
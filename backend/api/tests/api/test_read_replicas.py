@@ -0,0 +1,161 @@
+import time
+
+import pytest
+from django.db import connections, transaction
+from rest_framework.test import APIClient
+
+from api import replicas
+from api.models import Project, ProjectStats
+from api.stats import get_stats
+
+REPLICA = "replica_test"
+BROKEN = "replica_broken"
+
+# Dwie "repliki" jako mirrory bazy testowej (jak w settings przy
+# DB_REPLICA_HOSTS), zarejestrowane przed utworzeniem baz testowych. To osobne
+# połączenia: dane testu siedzą w niezatwierdzonej transakcji "default", więc
+# replika ich nie widzi — jak replika z opóźnieniem.
+for _alias in (REPLICA, BROKEN):
+    connections.settings.setdefault(
+        _alias, {**connections.settings["default"], "TEST": {"MIRROR": "default"}}
+    )
+
+replica_db = pytest.mark.django_db(databases=["default", REPLICA, BROKEN])
+
+
+@pytest.fixture(scope="module", autouse=True)
+def close_replica_connections():
+    """Otwarte połączenia blokowałyby usunięcie bazy testowej."""
+    yield
+    for alias in (REPLICA, BROKEN):
+        connections[alias].close()
+
+
+@pytest.fixture
+def replica(settings):
+    # BROKEN na czas testu: nowe połączenie na port, na którym nic nie słucha.
+    original = connections[BROKEN]
+    connections[BROKEN] = type(original)(
+        {
+            **original.settings_dict,
+            "PORT": "1",
+            "OPTIONS": {**original.settings_dict["OPTIONS"], "connect_timeout": 1},
+        },
+        alias=BROKEN,
+    )
+    settings.API_READ_REPLICAS = [REPLICA]
+    replicas._down_until.clear()
+    yield REPLICA
+    connections[BROKEN] = original
+    replicas._down_until.clear()
+
+
+def _names(res):
+    assert res.status_code == 200, res.data
+    return [p["name"] for p in res.data["results"]]
+
+
+@replica_db
+def test_reads_go_to_replica_and_writes_pin_client_to_primary(
+    api_client, project, replica
+):
+    res = api_client.get("/api/projects/")
+    assert res[replicas.ROUTE_HEADER] == replica
+    # Replika nie widzi jeszcze niezatwierdzonego projektu.
+    assert _names(res) == []
+
+    res = api_client.patch(
+        f"/api/projects/{project.id}/", {"name": "Renamed"}, format="json"
+    )
+    assert res.status_code == 200
+    assert replicas.ROUTE_HEADER not in res
+    assert api_client.cookies[replicas.settings.API_REPLICA_PIN_COOKIE].value
+
+    res = api_client.get("/api/projects/")
+    assert replicas.ROUTE_HEADER not in res
+    assert _names(res) == ["Renamed"]
+
+
+@replica_db
+def test_replica_reads_are_cached_briefly_and_pinned_reads_skip_hits(
+    api_client, user, project, replica, settings
+):
+    other = APIClient()
+    other.force_authenticate(user)
+    # Generacja Project jest już po zapisie, ale replika go jeszcze nie ma.
+    settings.API_REPLICA_STICKY_SECONDS = 0
+    res = other.get("/api/projects/")
+    assert res[replicas.ROUTE_HEADER] == replica
+    assert _names(res) == []
+    # Odpowiedź z repliki żyje najwyżej API_REPLICA_STICKY_SECONDS.
+    assert other.get("/api/projects/")["X-Cache"] == "miss"
+
+    settings.API_REPLICA_STICKY_SECONDS = 60
+    other.get("/api/projects/")
+    res = other.get("/api/projects/")
+    assert res["X-Cache"] == "hit"
+    assert _names(res) == []
+
+    api_client.cookies[settings.API_REPLICA_PIN_COOKIE] = str(int(time.time()) + 60)
+    res = api_client.get("/api/projects/")
+    assert replicas.ROUTE_HEADER not in res
+    assert res["X-Cache"] == "miss"
+    assert _names(res) == [project.name]
+
+    # Odpowiedź z primary trafia do cache, także dla innych klientów.
+    res = other.get("/api/projects/")
+    assert res["X-Cache"] == "hit"
+    assert _names(res) == [project.name]
+
+
+@replica_db
+def test_pin_expires(api_client, project, replica, settings):
+    api_client.cookies[settings.API_REPLICA_PIN_COOKIE] = "1"  # dawno minął
+    res = api_client.get("/api/projects/")
+    assert res[replicas.ROUTE_HEADER] == replica
+
+
+@replica_db
+def test_unavailable_replica_falls_back(api_client, project, replica, settings):
+    settings.API_READ_REPLICAS = [BROKEN]
+    res = api_client.get("/api/projects/")
+    assert replicas.ROUTE_HEADER not in res
+    assert _names(res) == [project.name]
+    # Zapamiętana jako niedostępna — kolejne żądanie nawet nie próbuje.
+    assert BROKEN in replicas._down_until
+
+    settings.API_READ_REPLICAS = [BROKEN, REPLICA]
+    res = api_client.get("/api/projects/")
+    assert res[replicas.ROUTE_HEADER] == REPLICA
+
+
+@replica_db
+def test_transactions_in_safe_requests_read_from_primary(project, replica):
+    route = replicas._Route(replica, len(connections["default"].atomic_blocks))
+    token = replicas._route.set(route)
+    try:
+        assert not Project.objects.filter(pk=project.pk).exists()
+        with transaction.atomic():
+            assert Project.objects.filter(pk=project.pk).exists()
+    finally:
+        replicas._route.reset(token)
+
+
+@pytest.mark.django_db
+def test_no_replicas_configured(api_client, project):
+    res = api_client.get("/api/projects/")
+    assert replicas.ROUTE_HEADER not in res
+    assert _names(res) == [project.name]
+
+
+@replica_db
+def test_stats_recomputed_on_primary_are_read_back_from_primary(project, replica):
+    ProjectStats.objects.filter(project=project).delete()
+    depth = len(connections["default"].atomic_blocks)
+    token = replicas._route.set(replicas._Route(replica, depth))
+    try:
+        # Replika nie ma ani projektu, ani przeliczonego właśnie wiersza.
+        row = get_stats(project=project)
+    finally:
+        replicas._route.reset(token)
+    assert row.project_id == project.pk
@@ -0,0 +1,142 @@
+import pytest
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from api.effective_scope import sync_link_tasks
+from api.models import Project, Task, TaskAssignment, TaskScope
+from api.response_cache import (
+    GENERATION_PREFIX,
+    bump_generation,
+    check_backend,
+    generations,
+)
+
+
+def _get(api_client, url):
+    res = api_client.get(url)
+    assert res.status_code == 200
+    return res
+
+
+@pytest.mark.django_db
+def test_second_read_is_served_from_cache(api_client, user, task_project_scoped):
+    TaskAssignment.objects.create(task=task_project_scoped, user=user)
+    url = "/api/users/?fields=id,tasks_count"
+
+    first = _get(api_client, url)
+    assert first["X-Cache"] == "miss"
+
+    with CaptureQueriesContext(connection) as ctx:
+        second = _get(api_client, url)
+    assert second["X-Cache"] == "hit"
+    assert second.data == first.data
+    assert len(ctx.captured_queries) == 0
+
+
+@pytest.mark.django_db
+def test_query_params_are_normalized(api_client, task_project_scoped):
+    _get(api_client, "/api/tasks/?ordering=title&search=Project&page_size=")
+    res = _get(api_client, "/api/tasks/?search=Project&ordering=title")
+    assert res["X-Cache"] == "hit"
+
+
+@pytest.mark.django_db
+def test_writes_invalidate_dependent_endpoints(api_client, user, task_project_scoped):
+    users_url = f"/api/users/{user.id}/"
+    projects_url = "/api/projects/"
+    for url in (users_url, projects_url, "/api/tasks/"):
+        _get(api_client, url)
+
+    TaskAssignment.objects.create(task=task_project_scoped, user=user)
+    res = _get(api_client, users_url)
+    assert res["X-Cache"] == "miss"
+    assert res.data["tasks_count"] == 1
+    # Projekty nie czytają przypisań.
+    assert _get(api_client, projects_url)["X-Cache"] == "hit"
+
+    task_project_scoped.title = "Renamed"
+    task_project_scoped.save()
+    res = _get(api_client, projects_url)
+    assert res["X-Cache"] == "miss"
+    assert res.data["results"][0]["tasks"] == ["Renamed"]
+
+
+@pytest.mark.django_db
+def test_bulk_writes_invalidate_task_list(api_client, project):
+    _get(api_client, "/api/tasks/")
+
+    res = api_client.post(
+        "/api/tasks/bulk/",
+        {"create": [{"title": "new", "project": project.id}]},
+        format="json",
+    )
+    assert res.status_code == 200, res.data
+
+    res = _get(api_client, "/api/tasks/")
+    assert res["X-Cache"] == "miss"
+    assert [t["title"] for t in res.data["results"]] == ["new"]
+
+
+@pytest.mark.django_db
+def test_link_move_invalidates_task_list(
+    api_client, user, project, project_funding, task_pf_scoped
+):
+    url = f"/api/tasks/?project={project.id}"
+    assert [t["id"] for t in _get(api_client, url).data["results"]] == [
+        task_pf_scoped.id
+    ]
+
+    project_funding.project = Project.objects.create(name="Inny", owner=user)
+    project_funding.save()
+    res = _get(api_client, url)
+    assert res["X-Cache"] == "miss"
+    assert res.data["results"] == []
+
+    # Samo przepięcie tasków (QuerySet.update) też unieważnia cache tasków.
+    (before,) = generations([Task])
+    sync_link_tasks(project_funding)
+    assert generations([Task])[0] > before
+
+
+@pytest.mark.django_db
+def test_evicted_generation_does_not_restart_from_old_value():
+    (before,) = generations([TaskScope])
+    cache.delete("api:gen:api.taskscope")
+    bump_generation(TaskScope)
+    (after,) = generations([TaskScope])
+    assert after > before
+
+
+@pytest.mark.django_db
+def test_task_detail_is_not_cached(api_client, task_project_scoped):
+    url = f"/api/tasks/{task_project_scoped.id}/"
+    _get(api_client, url)
+    assert "X-Cache" not in _get(api_client, url)
+    assert Task.objects.filter(pk=task_project_scoped.pk).exists()
+
+
+@pytest.mark.django_db
+def test_disabled_cache_passes_reads_through(api_client, task_project_scoped):
+    key = f"{GENERATION_PREFIX}api.task"
+    before = cache.get(key)
+    with override_settings(API_RESPONSE_CACHE=False):
+        api_client.get("/api/tasks/")
+        res = api_client.get("/api/tasks/")
+        bump_generation(Task)
+
+    assert "X-Cache" not in res
+    assert cache.get(key) == before
+
+
+def test_local_cache_backend_is_refused_outside_debug():
+    locmem = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    with override_settings(DEBUG=False, CACHES=locmem, API_RESPONSE_CACHE=True):
+        with pytest.raises(ImproperlyConfigured):
+            check_backend()
+    with override_settings(DEBUG=False, CACHES=locmem, API_RESPONSE_CACHE=False):
+        check_backend()
+    with override_settings(DEBUG=True, CACHES=locmem, API_RESPONSE_CACHE=True):
+        check_backend()
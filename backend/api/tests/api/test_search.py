@@ -0,0 +1,66 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.models import Funding, Project, Task
+
+
+def _ids(res):
+    assert res.status_code == 200
+    return [row["id"] for row in res.data["results"]]
+
+
+@pytest.mark.django_db
+def test_task_search_ranks_title_above_description(api_client):
+    in_description = Task.objects.create(
+        title="Zakup sprzętu", description="Faktura za nagłośnienie"
+    )
+    in_title = Task.objects.create(title="Nagłośnienie sceny", description="")
+    Task.objects.create(title="Plakat", description="Druk")
+
+    res = api_client.get("/api/tasks/?search=nagłośn")
+    assert _ids(res) == [in_title.id, in_description.id]
+
+
+@pytest.mark.django_db
+def test_search_requires_every_term(api_client):
+    both = Task.objects.create(title="Raport końcowy", description="dla grantu")
+    Task.objects.create(title="Raport częściowy")
+
+    assert _ids(api_client.get("/api/tasks/?search=rap grant")) == [both.id]
+
+
+@pytest.mark.django_db
+def test_short_fields_still_match_substrings(api_client, user):
+    funding = Funding.objects.create(name="Grant", agreement_number="POIR.01.02-00")
+    Funding.objects.create(name="Inny", agreement_number="KPO/2024")
+    project = Project.objects.create(name="Festiwal", owner=user)
+
+    assert _ids(api_client.get("/api/fundings/?search=01.02")) == [funding.id]
+    assert _ids(api_client.get("/api/projects/?search=stiw")) == [project.id]
+
+
+@pytest.mark.django_db
+def test_project_search_uses_indexes(api_client):
+    """Żadnego OR-a po złączeniu (np. z właścicielem): plan to same indeksy."""
+    with CaptureQueriesContext(connection) as ctx:
+        _ids(api_client.get("/api/projects/?search=festiw"))
+    # Zapytanie paginatora: to samo WHERE co lista, bez złączeń.
+    (sql,) = [
+        q["sql"]
+        for q in ctx.captured_queries
+        if q["sql"].startswith('SELECT COUNT(*) AS "__count" FROM "api_project"')
+    ]
+
+    with connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        cursor.execute(f"EXPLAIN {sql}")
+        plan = "\n".join(row[0] for row in cursor.fetchall())
+        cursor.execute("SELECT 1 FROM pg_indexes WHERE indexname = 'project_name_trgm'")
+        has_trigram = cursor.fetchone() is not None
+    assert "auth_user" not in plan
+    if not has_trigram:
+        pytest.skip("brak pg_trgm: podciągi w nazwie skanują tabelę")
+    assert "Seq Scan" not in plan
+    assert "project_search_vector_gin" in plan
+    assert "project_name_trgm" in plan
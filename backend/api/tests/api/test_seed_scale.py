@@ -0,0 +1,84 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Count
+
+from api.models import Project, ProjectStats, Task, TaskAssignment, TaskScope
+from api.synthetic import SyntheticDataGenerator
+
+
+def _generate(seed=7):
+    return SyntheticDataGenerator(
+        projects=20, tasks_per_project=15, users=10, fundings=4, seed=seed
+    ).run()
+
+
+@pytest.mark.django_db
+def test_scale_seed_counts_and_skew():
+    summary = _generate()
+
+    assert summary["projects"] == 20
+    assert Task.objects.count() == summary["tasks"] == 300
+    assert TaskScope.objects.count() == 300
+    assert TaskAssignment.objects.exists()
+
+    sizes = sorted(
+        Project.objects.annotate(n=Count("effective_tasks")).values_list(
+            "n", flat=True
+        ),
+        reverse=True,
+    )
+    # Kilka dużych projektów, długi ogon małych (część tasków trafia tylko do
+    # fundingu, stąd <=).
+    assert sizes[0] <= summary["largest_project"]
+    assert sizes[0] > 5 * sizes[-1]
+
+
+@pytest.mark.django_db
+def test_scale_seed_keeps_denormalized_data_consistent():
+    _generate()
+
+    for task in Task.objects.select_related("scope__project_funding"):
+        scope = task.scope
+        link = scope.project_funding
+        assert task.effective_project_id == (
+            link.project_id if link else scope.project_id
+        )
+        assert task.effective_funding_id == (
+            link.funding_id if link else scope.funding_id
+        )
+
+    stats = ProjectStats.objects.filter(project__isnull=False)
+    assert stats.count() == 20
+    total = sum(s.todo_count + s.doing_count + s.done_count for s in stats)
+    assert total == Task.objects.filter(effective_project__isnull=False).count()
+
+
+@pytest.mark.django_db
+def test_scale_seed_is_deterministic():
+    _generate()
+    first = list(Task.objects.order_by("pk").values_list("title", "status", "due_date"))
+    Task.objects.all().delete()
+
+    _generate()
+    second = list(
+        Task.objects.order_by("pk").values_list("title", "status", "due_date")
+    )
+    assert first == second
+
+
+@pytest.mark.django_db
+def test_seed_demo_scale_command():
+    out = StringIO()
+    call_command(
+        "seed_demo",
+        "--scale",
+        "--projects=3",
+        "--tasks-per-project=4",
+        "--users=2",
+        "--fundings=1",
+        stdout=out,
+    )
+    assert Task.objects.count() == 12
+    assert "SEED SCALE DONE" in out.getvalue()
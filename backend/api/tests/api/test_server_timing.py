@@ -0,0 +1,55 @@
+import json
+import logging
+import re
+
+import pytest
+
+from api.models import Task, TaskScope
+
+
+def _timings(response):
+    return {
+        name: (float(dur), desc)
+        for name, dur, desc in re.findall(
+            r'(\w+);dur=([\d.]+)(?:;desc="([^"]*)")?', response["Server-Timing"]
+        )
+    }
+
+
+@pytest.mark.django_db
+def test_server_timing_header_reports_queries_and_serializers(
+    api_client, settings, task_project_scoped
+):
+    settings.API_SERVER_TIMING = True
+
+    res = api_client.get("/api/tasks/")
+    assert res.status_code == 200
+    timings = _timings(res)
+    assert set(timings) == {"db", "ser", "sig", "total"}
+    queries = int(timings["db"][1].split()[0])
+    assert queries > 0
+    assert timings["ser"][0] <= timings["total"][0]
+
+
+@pytest.mark.django_db
+def test_signal_time_and_log_line(api_client, settings, project, caplog):
+    settings.API_SERVER_TIMING = True
+    settings.API_SERVER_TIMING_LOG = True
+    task = Task.objects.create(title="t")
+    TaskScope.objects.create(task=task, project=project)
+
+    with caplog.at_level(logging.INFO, logger="api.timing"):
+        res = api_client.patch(f"/api/tasks/{task.id}/", {"status": "done"})
+    assert res.status_code == 200
+    assert _timings(res)["sig"][0] > 0
+
+    line = json.loads(caplog.records[-1].getMessage())
+    assert line["view"] == "task-detail"
+    assert line["method"] == "PATCH"
+    assert line["queries"] > 0
+
+
+@pytest.mark.django_db
+def test_disabled_by_setting(api_client, settings):
+    settings.API_SERVER_TIMING = False
+    assert "Server-Timing" not in api_client.get("/api/projects/")
@@ -0,0 +1,117 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.models import Project, Task, TaskAssignment
+
+User = get_user_model()
+
+
+def _results(data):
+    if isinstance(data, dict) and "results" in data:
+        return data["results"]
+    return data
+
+
+@pytest.mark.django_db
+def test_project_pick_list_returns_only_requested_fields(api_client, project):
+    with CaptureQueriesContext(connection) as ctx:
+        res = api_client.get(
+            "/api/projects/?ordering=name&page_size=100&fields=id,name"
+        )
+    assert res.status_code == 200
+    assert _results(res.data) == [{"id": project.id, "name": project.name}]
+
+    sql = "\n".join(q["sql"] for q in ctx.captured_queries)
+    assert "api_taskscope" not in sql
+    assert '"api_project"."description"' not in sql
+
+
+@pytest.mark.django_db
+def test_task_fields_skip_unrequested_relations(
+    api_client, task_project_scoped, project
+):
+    with CaptureQueriesContext(connection) as ctx:
+        res = api_client.get(
+            f"/api/tasks/?project={project.id}&fields=id,title,project_name"
+        )
+    assert res.status_code == 200
+    assert _results(res.data) == [
+        {
+            "id": task_project_scoped.id,
+            "title": task_project_scoped.title,
+            "project_name": project.name,
+        }
+    ]
+    sql = "\n".join(q["sql"] for q in ctx.captured_queries)
+    assert "auth_user" not in sql
+
+
+@pytest.mark.django_db
+def test_task_list_query_count_is_constant_with_assignees(api_client, project):
+    def make(n):
+        for i in range(n):
+            t = Task.objects.create(title=f"t{i}")
+            u = User.objects.create_user(username=f"u{n}-{i}", password="x")
+            TaskAssignment.objects.create(task=t, user=u)
+
+    make(2)
+    with CaptureQueriesContext(connection) as small:
+        api_client.get("/api/tasks/")
+    make(5)
+    with CaptureQueriesContext(connection) as large:
+        api_client.get("/api/tasks/")
+    assert len(large.captured_queries) == len(small.captured_queries)
+
+
+@pytest.mark.django_db
+def test_expand_replaces_ids_with_nested_objects(api_client, project_funding):
+    res = api_client.get(f"/api/project-fundings/{project_funding.id}/?expand=project")
+    assert res.status_code == 200
+    assert res.data["project"]["id"] == project_funding.project_id
+    assert res.data["project"]["name"] == project_funding.project.name
+    assert res.data["funding"] == project_funding.funding_id
+
+
+@pytest.mark.django_db
+def test_expand_task_assignments(api_client, user, task_unscoped):
+    TaskAssignment.objects.create(task=task_unscoped, user=user)
+    res = api_client.get(f"/api/tasks/{task_unscoped.id}/?expand=assignments")
+    assert [a["user"] for a in res.data["assignments"]] == [user.id]
+
+    res = api_client.get(f"/api/tasks/{task_unscoped.id}/")
+    assert "assignments" not in res.data
+
+
+@pytest.mark.django_db
+def test_user_list_skips_count_annotations_when_not_requested(api_client, user):
+    with CaptureQueriesContext(connection) as ctx:
+        res = api_client.get("/api/users/?fields=id,username")
+    assert _results(res.data)[0] == {"id": user.id, "username": user.username}
+    assert all("COUNT(DISTINCT" not in q["sql"] for q in ctx.captured_queries)
+
+
+@pytest.mark.django_db
+def test_fields_param_is_ignored_for_writes(api_client):
+    res = api_client.post(
+        "/api/tasks/?fields=id",
+        {"title": "Write", "status": Task.Status.TODO},
+        format="json",
+    )
+    assert res.status_code == 201
+    assert Task.objects.get(pk=res.data["id"]).title == "Write"
+
+
+@pytest.mark.django_db
+def test_expand_param_is_ignored_for_writes(api_client, project_funding, project):
+    other = Project.objects.create(name="Inny", owner=project.owner)
+    res = api_client.patch(
+        f"/api/project-fundings/{project_funding.id}/?expand=project",
+        {"project": other.id},
+        format="json",
+    )
+    assert res.status_code == 200, res.data
+    assert res.data["project"] == other.id
+    project_funding.refresh_from_db()
+    assert project_funding.project_id == other.id
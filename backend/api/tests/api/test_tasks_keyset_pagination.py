@@ -0,0 +1,110 @@
+from datetime import date, timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.models import Task, TaskScope
+
+
+def _titles(data):
+    return [t["title"] for t in data["results"]]
+
+
+def _walk(api_client, url):
+    titles, pages = [], 0
+    while url:
+        res = api_client.get(url)
+        assert res.status_code == 200
+        titles += _titles(res.data)
+        url = res.data["next"]
+        pages += 1
+    return titles, pages
+
+
+@pytest.fixture
+def many_tasks(project):
+    tasks = []
+    for i in range(7):
+        t = Task.objects.create(
+            title=f"T{i}",
+            status=Task.Status.TODO,
+            priority=(i % 3) + 1,
+            due_date=date.today() + timedelta(days=i) if i % 2 else None,
+        )
+        TaskScope.objects.create(task=t, project=project)
+        tasks.append(t)
+    return tasks
+
+
+@pytest.mark.django_db
+def test_page_size_param_is_honoured_and_capped(api_client, many_tasks):
+    res = api_client.get("/api/tasks/?page_size=3")
+    assert res.status_code == 200
+    assert len(res.data["results"]) == 3
+    assert res.data["count"] == 7
+
+    res = api_client.get("/api/tasks/?page_size=100000")
+    assert len(res.data["results"]) == 7
+
+
+@pytest.mark.django_db
+def test_cursor_mode_walks_all_tasks_in_created_order(api_client, many_tasks):
+    titles, pages = _walk(api_client, "/api/tasks/?pagination=cursor&page_size=3")
+    assert titles == [t.title for t in reversed(many_tasks)]
+    assert pages == 3
+
+
+@pytest.mark.django_db
+def test_cursor_mode_response_has_no_count(api_client, many_tasks):
+    res = api_client.get("/api/tasks/?pagination=cursor&page_size=2")
+    assert set(res.data) == {"next", "previous", "results"}
+    assert res.data["previous"] is None
+
+
+@pytest.mark.parametrize(
+    "ordering", ["priority", "-priority", "due_date", "-due_date", "title"]
+)
+@pytest.mark.django_db
+def test_cursor_mode_supports_ordering_fields(api_client, many_tasks, ordering):
+    titles, _ = _walk(
+        api_client, f"/api/tasks/?pagination=cursor&ordering={ordering}&page_size=2"
+    )
+    assert len(titles) == len(many_tasks)
+    assert len(set(titles)) == len(many_tasks)
+
+
+@pytest.mark.django_db
+def test_cursor_previous_link_returns_previous_page(api_client, many_tasks):
+    first = api_client.get("/api/tasks/?pagination=cursor&page_size=3")
+    second = api_client.get(first.data["next"])
+    back = api_client.get(second.data["previous"])
+    assert _titles(back.data) == _titles(first.data)
+
+
+@pytest.mark.django_db
+def test_cursor_mode_respects_filters(api_client, project, many_tasks, task_unscoped):
+    titles, _ = _walk(
+        api_client, f"/api/tasks/?pagination=cursor&project={project.id}&page_size=4"
+    )
+    assert task_unscoped.title not in titles
+    assert len(titles) == len(many_tasks)
+
+
+@pytest.mark.django_db
+def test_invalid_or_foreign_cursor_returns_404(api_client, many_tasks):
+    assert api_client.get("/api/tasks/?cursor=garbage").status_code == 404
+
+    first = api_client.get("/api/tasks/?pagination=cursor&page_size=2")
+    next_url = first.data["next"] + "&ordering=priority"
+    assert api_client.get(next_url).status_code == 404
+
+
+@pytest.mark.django_db
+def test_cursor_page_does_not_use_offset(api_client, many_tasks):
+    first = api_client.get("/api/tasks/?pagination=cursor&page_size=2")
+    with CaptureQueriesContext(connection) as ctx:
+        api_client.get(first.data["next"])
+    task_queries = [q["sql"] for q in ctx.captured_queries if '"api_task"' in q["sql"]]
+    assert task_queries
+    assert all("OFFSET" not in sql for sql in task_queries)
@@ -3,6 +3,7 @@ from datetime import date, timedelta
 from uuid import uuid4
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from rest_framework.test import APIClient
 
 from api.models import Project, Funding, FundingTask, ProjectFunding, Task, TaskScope
@@ -10,6 +11,14 @@ from api.models import Project, Funding, FundingTask, ProjectFunding, Task, Task
 User = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Rollback bazy między testami nie cofa liczników generacji cache."""
+    cache.clear()
+    yield
+    cache.clear()
+
+
 @pytest.fixture
 def user(db):
     return User.objects.create_user(username="tester", password="pass12345")
@@ -0,0 +1,150 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from api import cleanup
+from api.cleanup import (
+    CleanupConflict,
+    delete_generated_tasks,
+    run_cleanup,
+    schedule_cleanup,
+)
+from api.models import (
+    FundingTask,
+    ProjectFunding,
+    ProjectFundingCleanup,
+    Task,
+    TaskAssignment,
+    TaskScope,
+)
+
+
+@pytest.fixture
+def linked(project, funding, user):
+    for i in range(7):
+        FundingTask.objects.create(funding=funding, title=f"tmpl {i}")
+    pf = ProjectFunding.objects.create(project=project, funding=funding)
+    for task in Task.objects.filter(scope__project_funding=pf)[:3]:
+        TaskAssignment.objects.create(task=task, user=user)
+    return pf
+
+
+@pytest.mark.django_db
+def test_delete_generated_tasks_in_batches(linked):
+    progress = []
+    deleted = delete_generated_tasks(
+        linked.pk, batch_size=3, on_progress=progress.append
+    )
+
+    assert deleted == 7
+    assert progress == [3, 6, 7]
+    assert not Task.objects.filter(scope__project_funding=linked).exists()
+    assert not TaskAssignment.objects.exists()
+    assert not TaskScope.objects.filter(project_funding=linked).exists()
+
+
+@pytest.mark.django_db
+def test_api_delete_unlinks_funding_with_generated_tasks(api_client, linked, project):
+    own = Task.objects.create(title="project task")
+    TaskScope.objects.create(task=own, project=project)
+
+    res = api_client.delete(f"/api/project-fundings/{linked.id}/")
+
+    assert res.status_code == 204
+    assert not ProjectFunding.objects.filter(pk=linked.pk).exists()
+    assert list(Task.objects.values_list("title", flat=True)) == ["project task"]
+
+
+@pytest.mark.django_db
+def test_api_delete_refuses_when_manual_tasks_are_scoped(api_client, linked):
+    manual = Task.objects.create(title="manual")
+    TaskScope.objects.create(task=manual, project_funding=linked, funding_scoped=False)
+
+    res = api_client.delete(f"/api/project-fundings/{linked.id}/")
+
+    assert res.status_code == 400
+    assert ProjectFunding.objects.filter(pk=linked.pk).exists()
+
+
+@pytest.mark.django_db
+def test_deferred_delete_returns_job_and_worker_finishes_it(api_client, linked):
+    res = api_client.delete(f"/api/project-fundings/{linked.id}/?defer=1")
+
+    assert res.status_code == 202
+    assert res.data["status"] == ProjectFundingCleanup.Status.PENDING
+    assert res.data["total"] == 7
+    assert ProjectFunding.objects.filter(pk=linked.pk).exists()
+
+    call_command("run_cleanup_jobs", batch_size=2, stdout=StringIO())
+
+    job = api_client.get(f"/api/project-funding-cleanups/{res.data['id']}/").data
+    assert job["status"] == ProjectFundingCleanup.Status.DONE
+    assert job["deleted"] == 7
+    assert not ProjectFunding.objects.filter(pk=linked.pk).exists()
+    assert not Task.objects.exists()
+
+
+@pytest.mark.django_db
+def test_deferred_delete_reuses_open_job(api_client, linked):
+    first = api_client.delete(f"/api/project-fundings/{linked.id}/?defer=1").data
+    second = api_client.delete(f"/api/project-fundings/{linked.id}/?defer=1").data
+
+    assert second["id"] == first["id"]
+    assert ProjectFundingCleanup.objects.count() == 1
+
+    ProjectFundingCleanup.objects.filter(pk=first["id"]).update(
+        status=ProjectFundingCleanup.Status.FAILED, error="boom"
+    )
+    job = schedule_cleanup(linked)
+    assert job.pk == first["id"]
+    assert (job.status, job.error) == (ProjectFundingCleanup.Status.PENDING, "")
+
+
+@pytest.mark.django_db
+def test_second_worker_does_not_repeat_committed_batches(linked, monkeypatch):
+    job = schedule_cleanup(linked)
+    stale = ProjectFundingCleanup.objects.get(pk=job.pk)
+    batches = []
+
+    def delete_tasks(ids, using):
+        if len(batches) == 1:
+            # Drugi worker z tym samym (już nieaktualnym) stanem zlecenia.
+            with pytest.raises(CleanupConflict):
+                run_cleanup(stale, batch_size=2)
+        batches.append(ids)
+        real_delete_tasks(ids, using)
+
+    real_delete_tasks = cleanup.delete_tasks
+    monkeypatch.setattr(cleanup, "delete_tasks", delete_tasks)
+    run_cleanup(job, batch_size=3)
+
+    job.refresh_from_db()
+    assert job.status == ProjectFundingCleanup.Status.DONE
+    assert job.deleted == 7
+    assert [len(ids) for ids in batches] == [3, 3, 1]
+    assert not ProjectFunding.objects.filter(pk=linked.pk).exists()
+    assert not Task.objects.exists()
+
+
+@pytest.mark.django_db
+def test_resume_skips_jobs_running_elsewhere(linked):
+    job = schedule_cleanup(linked)
+    ProjectFundingCleanup.objects.filter(pk=job.pk).update(
+        status=ProjectFundingCleanup.Status.RUNNING
+    )
+
+    out = StringIO()
+    call_command("run_cleanup_jobs", "--resume", stdout=out)
+    assert "Przetworzono zleceń: 0" in out.getvalue()
+    assert ProjectFunding.objects.filter(pk=linked.pk).exists()
+
+    ProjectFundingCleanup.objects.filter(pk=job.pk).update(
+        updated_at=timezone.now() - timedelta(hours=1)
+    )
+    call_command("run_cleanup_jobs", "--resume", stdout=out)
+    job.refresh_from_db()
+    assert job.status == ProjectFundingCleanup.Status.DONE
+    assert not ProjectFunding.objects.filter(pk=linked.pk).exists()
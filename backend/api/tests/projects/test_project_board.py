@@ -0,0 +1,96 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.models import Task, TaskAssignment, TaskScope
+
+
+def _task(project, status, priority, title="t"):
+    task = Task.objects.create(title=title, status=status, priority=priority)
+    TaskScope.objects.create(task=task, project=project)
+    return task
+
+
+def _column(data, status):
+    return next(c for c in data["columns"] if c["status"] == status)
+
+
+@pytest.mark.django_db
+def test_board_groups_tasks_by_status_with_counts(
+    api_client, user, project, task_pf_scoped
+):
+    high = _task(project, Task.Status.TODO, Task.Priority.HIGH, "high")
+    low = _task(project, Task.Status.TODO, Task.Priority.LOW, "low")
+    doing = _task(project, Task.Status.DOING, Task.Priority.MEDIUM, "doing")
+    TaskAssignment.objects.create(task=doing, user=user)
+
+    res = api_client.get(f"/api/projects/{project.id}/board/")
+    assert res.status_code == 200
+    assert [c["status"] for c in res.data["columns"]] == ["todo", "doing", "done"]
+
+    todo = _column(res.data, "todo")
+    assert todo["count"] == 3
+    assert [c["id"] for c in todo["results"]] == [high.id, task_pf_scoped.id, low.id]
+    assert set(todo["results"][0]) == {
+        "id",
+        "title",
+        "description",
+        "status",
+        "priority",
+        "due_date",
+        "est_hours",
+        "assignees",
+    }
+    assert _column(res.data, "doing")["results"][0]["assignees"] == [
+        {"id": user.id, "username": user.username}
+    ]
+    assert _column(res.data, "done") == {
+        "status": "done",
+        "label": "Done",
+        "count": 0,
+        "next": None,
+        "previous": None,
+        "results": [],
+    }
+
+
+@pytest.mark.django_db
+def test_board_columns_page_independently(api_client, project):
+    todo = [_task(project, Task.Status.TODO, Task.Priority.MEDIUM) for _ in range(5)]
+    _task(project, Task.Status.DONE, Task.Priority.LOW)
+
+    res = api_client.get(f"/api/projects/{project.id}/board/?page_size=2")
+    first = _column(res.data, "todo")
+    assert [c["id"] for c in first["results"]] == [todo[4].id, todo[3].id]
+    assert "column=todo" in first["next"]
+    assert _column(res.data, "done")["next"] is None
+
+    res = api_client.get(first["next"])
+    assert res.status_code == 200
+    assert res.data["status"] == "todo"
+    assert [c["id"] for c in res.data["results"]] == [todo[2].id, todo[1].id]
+    assert res.data["previous"] is not None
+
+
+@pytest.mark.django_db
+def test_board_query_count_is_constant(api_client, user, project):
+    def run():
+        with CaptureQueriesContext(connection) as ctx:
+            api_client.get(f"/api/projects/{project.id}/board/")
+        return len(ctx.captured_queries)
+
+    for status in Task.Status.values:
+        _task(project, status, Task.Priority.LOW)
+    small = run()
+    for status in Task.Status.values:
+        for _ in range(4):
+            TaskAssignment.objects.create(
+                task=_task(project, status, Task.Priority.HIGH), user=user
+            )
+    assert run() == small
+
+
+@pytest.mark.django_db
+def test_board_rejects_unknown_column(api_client, project):
+    res = api_client.get(f"/api/projects/{project.id}/board/?column=later")
+    assert res.status_code == 400
@@ -0,0 +1,205 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api import stats
+from api.cleanup import unlink_project_funding
+from api.models import ProjectStats, Task, TaskAssignment, TaskScope
+from api.stats import recompute_stats
+
+STAT_FIELDS = [
+    "todo_count",
+    "doing_count",
+    "done_count",
+    "overdue_count",
+    "cost_by_currency",
+    "est_hours",
+    "worked_hours",
+]
+
+
+def _snapshot(**lookup):
+    return ProjectStats.objects.filter(**lookup).values(*STAT_FIELDS).get()
+
+
+def assert_matches_rebuild(project, project_funding=None):
+    """Incrementally maintained rows must equal a rebuild from scratch."""
+    incremental = [_snapshot(project=project)]
+    if project_funding is not None:
+        incremental.append(_snapshot(project_funding=project_funding))
+    recompute_stats(
+        project_ids=[project.pk],
+        project_funding_ids=[project_funding.pk] if project_funding else [],
+    )
+    rebuilt = [_snapshot(project=project)]
+    if project_funding is not None:
+        rebuilt.append(_snapshot(project_funding=project_funding))
+    assert incremental == rebuilt
+
+
+def _task(scope, **fields):
+    task = Task.objects.create(title=fields.pop("title", "t"), **fields)
+    TaskScope.objects.create(task=task, **scope)
+    return task
+
+
+@pytest.mark.django_db
+def test_task_lifecycle_updates_project_stats(project, user):
+    past = date.today() - timedelta(days=2)
+    task = _task(
+        {"project": project},
+        status=Task.Status.TODO,
+        due_date=past,
+        cost_amount=Decimal("100.50"),
+        est_hours=Decimal("4"),
+    )
+    _task(
+        {"project": project},
+        status=Task.Status.DONE,
+        cost_currency="EUR",
+        cost_amount=Decimal("10"),
+    )
+
+    row = _snapshot(project=project)
+    assert (row["todo_count"], row["done_count"], row["overdue_count"]) == (1, 1, 1)
+    assert row["cost_by_currency"] == {"EUR": "10.00", "PLN": "100.50"}
+    assert row["est_hours"] == Decimal("4")
+
+    task.status = Task.Status.DONE
+    task.cost_amount = Decimal("50")
+    task.save()
+    assignment = TaskAssignment.objects.create(task=task, user=user, worked_hours=3)
+    assignment.worked_hours = Decimal("5.5")
+    assignment.save()
+
+    row = _snapshot(project=project)
+    assert (row["todo_count"], row["done_count"], row["overdue_count"]) == (0, 2, 0)
+    assert row["cost_by_currency"] == {"EUR": "10.00", "PLN": "50.00"}
+    assert row["worked_hours"] == Decimal("5.5")
+    assert_matches_rebuild(project)
+
+    task.delete()
+    row = _snapshot(project=project)
+    assert row["done_count"] == 1
+    assert row["worked_hours"] == 0
+    assert row["cost_by_currency"] == {"EUR": "10.00"}
+    assert_matches_rebuild(project)
+
+
+@pytest.mark.django_db
+def test_link_tasks_count_for_link_and_project(funding_task, project_funding, user):
+    project = project_funding.project
+    generated = Task.objects.get(scope__project_funding=project_funding)
+    manual = _task(
+        {"project_funding": project_funding},
+        status=Task.Status.DOING,
+        est_hours=Decimal("2"),
+    )
+    TaskAssignment.objects.create(task=manual, user=user, worked_hours=1)
+
+    link_row = _snapshot(project_funding=project_funding)
+    assert (link_row["todo_count"], link_row["doing_count"]) == (1, 1)
+    assert _snapshot(project=project)["doing_count"] == 1
+    assert_matches_rebuild(project, project_funding)
+
+    # Przeniesienie taska z powiązania bezpośrednio do projektu.
+    scope = manual.scope
+    scope.project_funding = None
+    scope.project = project
+    scope.save()
+    assert _snapshot(project_funding=project_funding)["doing_count"] == 0
+    assert _snapshot(project=project)["doing_count"] == 1
+    assert_matches_rebuild(project, project_funding)
+
+    scope.delete()
+    assert _snapshot(project=project)["worked_hours"] == 0
+    assert_matches_rebuild(project, project_funding)
+
+    unlink_project_funding(project_funding)
+    assert not Task.objects.filter(pk=generated.pk).exists()
+    assert _snapshot(project=project)["todo_count"] == 0
+
+
+@pytest.mark.django_db
+def test_bulk_endpoint_keeps_stats_in_sync(api_client, project):
+    keep = _task({"project": project}, status=Task.Status.TODO)
+    gone = _task({"project": project}, status=Task.Status.TODO)
+
+    res = api_client.post(
+        "/api/tasks/bulk/",
+        {
+            "create": [{"title": "new", "status": "doing", "project": project.id}],
+            "update": [{"id": keep.id, "status": "done"}],
+            "delete": [gone.id],
+        },
+        format="json",
+    )
+    assert res.status_code == 200, res.data
+
+    row = _snapshot(project=project)
+    assert (row["todo_count"], row["doing_count"], row["done_count"]) == (0, 1, 1)
+    assert_matches_rebuild(project)
+
+
+@pytest.mark.django_db
+def test_task_patch_locks_row_and_rolls_back_with_stats(
+    api_client, project, user, monkeypatch
+):
+    task = Task.objects.create(title="t", status=Task.Status.TODO)
+    TaskScope.objects.create(task=task, project=project)
+    TaskAssignment.objects.create(task=task, user=user)
+
+    with CaptureQueriesContext(connection) as ctx:
+        res = api_client.patch(
+            f"/api/tasks/{task.id}/", {"status": "doing"}, format="json"
+        )
+    assert res.status_code == 200
+    task_reads = [
+        q["sql"]
+        for q in ctx.captured_queries
+        if q["sql"].startswith("SELECT") and '"api_task"."status"' in q["sql"]
+    ]
+    # Statystyki i obciążenie dzielą jeden odczyt taska, pod blokadą.
+    assert len([sql for sql in task_reads if "FOR UPDATE" in sql]) == 1
+    assert_matches_rebuild(project)
+
+    def fail(self):
+        raise RuntimeError("stats down")
+
+    monkeypatch.setattr(stats.StatsDelta, "apply", fail)
+    with pytest.raises(RuntimeError):
+        api_client.patch(f"/api/tasks/{task.id}/", {"status": "done"}, format="json")
+
+    # Zapis taska i liczniki idą w jednej transakcji.
+    task.refresh_from_db()
+    assert task.status == Task.Status.DOING
+
+
+@pytest.mark.django_db
+def test_stats_endpoint_refreshes_stale_overdue(api_client, project):
+    _task({"project": project}, due_date=date.today() - timedelta(days=1))
+    ProjectStats.objects.filter(project=project).update(
+        overdue_count=0, overdue_as_of=date.today() - timedelta(days=3)
+    )
+
+    res = api_client.get(f"/api/projects/{project.id}/stats/")
+    assert res.status_code == 200
+    assert res.data["overdue_count"] == 1
+    assert res.data["status_counts"] == {"todo": 1, "doing": 0, "done": 0}
+    assert res.data["task_count"] == 1
+
+
+@pytest.mark.django_db
+def test_rebuild_command_repairs_rows(project, funding_task, project_funding):
+    _task({"project": project}, status=Task.Status.DONE)
+    ProjectStats.objects.all().delete()
+
+    call_command("rebuild_project_stats", "--workers", "1")
+
+    assert _snapshot(project=project)["done_count"] == 1
+    assert _snapshot(project_funding=project_funding)["todo_count"] == 1
+    assert _snapshot(project=project)["todo_count"] == 1
@@ -0,0 +1,72 @@
+from datetime import date
+
+import pytest
+
+from api.models import Task, TaskAssignment, TaskScope
+
+
+def _task(project, title, start=None, due=None):
+    task = Task.objects.create(title=title, start_date=start, due_date=due)
+    TaskScope.objects.create(task=task, project=project)
+    return task
+
+
+def _url(project, **params):
+    query = "&".join(f"{k}={v}" for k, v in params.items())
+    return f"/api/projects/{project.id}/timeline/?{query}"
+
+
+@pytest.mark.django_db
+def test_timeline_returns_tasks_overlapping_window(api_client, user, project):
+    inside = _task(project, "inside", date(2025, 3, 5), date(2025, 3, 10))
+    spanning = _task(project, "spanning", date(2025, 1, 1), date(2025, 12, 31))
+    touching = _task(project, "touching", date(2025, 2, 20), date(2025, 3, 1))
+    _task(project, "before", date(2025, 1, 1), date(2025, 2, 28))
+    _task(project, "after", date(2025, 4, 1), date(2025, 4, 2))
+    _task(project, "no start", None, date(2025, 3, 5))
+    TaskAssignment.objects.create(task=inside, user=user)
+
+    res = api_client.get(_url(project, **{"from": "2025-03-01", "to": "2025-03-31"}))
+    assert res.status_code == 200
+    assert res.data["columns"][0] == "id"
+    assert [row[0] for row in res.data["rows"]] == [
+        spanning.id,
+        touching.id,
+        inside.id,
+    ]
+    row = dict(zip(res.data["columns"], res.data["rows"][-1]))
+    assert row["title"] == "inside"
+    assert row["start_date"] == date(2025, 3, 5)
+    assert row["assignee_ids"] == [user.id]
+
+
+@pytest.mark.django_db
+def test_unscheduled_bucket_is_paginated(api_client, project):
+    _task(project, "scheduled", date(2025, 1, 1), date(2025, 1, 2))
+    loose = [_task(project, f"loose {i}") for i in range(3)]
+    partial = _task(project, "partial", date(2025, 1, 1), None)
+
+    res = api_client.get(_url(project, **{"from": "2025-01-01", "to": "2025-01-31"}))
+    res = api_client.get(res.data["unscheduled"] + "?page_size=2")
+    assert res.status_code == 200
+    assert [row[0] for row in res.data["results"]] == [partial.id, loose[2].id]
+
+    res = api_client.get(res.data["next"])
+    assert [row[0] for row in res.data["results"]] == [loose[1].id, loose[0].id]
+    assert res.data["next"] is None
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "params",
+    [
+        {},
+        {"from": "2025-03-01"},
+        {"from": "2025-03-40", "to": "2025-04-01"},
+        {"from": "2025-04-01", "to": "2025-03-01"},
+        {"from": "2020-01-01", "to": "2025-01-01"},
+    ],
+)
+def test_timeline_validates_window(api_client, project, params):
+    res = api_client.get(_url(project, **params))
+    assert res.status_code == 400
@@ -117,7 +117,7 @@ def test_user_serializer_includes_profile_and_counts(user):
 
 
 @pytest.mark.django_db
-def test_user_detail_serializer_returns_tasks_list(user, project):
+def test_user_detail_serializer_links_to_tasks_instead_of_listing_them(user, project):
     UserProfile.objects.create(user=user)
 
     task = Task.objects.create(
@@ -128,10 +128,10 @@ def test_user_detail_serializer_returns_tasks_list(user, project):
     TaskScope.objects.create(task=task, project=project)
     TaskAssignment.objects.create(task=task, user=user)
 
-    ser = UserDetailSerializer(instance=user)
-    tasks = ser.data["tasks"]
-    ids = {t["id"] for t in tasks}
-    assert task.id in ids
+    req = APIRequestFactory().get(f"/api/users/{user.id}/")
+    data = UserDetailSerializer(instance=user, context={"request": req}).data
+    assert "tasks" not in data
+    assert data["tasks_url"] == f"http://testserver/api/users/{user.id}/tasks/"
 
 
 @pytest.mark.django_db
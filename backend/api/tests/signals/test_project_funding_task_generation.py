@@ -0,0 +1,64 @@
+from datetime import date, timedelta
+
+import pytest
+from django.db import IntegrityError, connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from api.models import FundingTask, ProjectFunding, Task, TaskScope
+from api.signals import generate_project_funding_tasks, template_origin
+
+
+def _pf_tasks(pf):
+    return Task.objects.filter(scope__project_funding=pf).order_by("id")
+
+
+@pytest.mark.django_db
+def test_link_generates_template_and_funding_tasks(
+    project, funding, funding_task, funding_global_task
+):
+    start = date.today() + timedelta(days=3)
+    pf = ProjectFunding.objects.create(
+        project=project, funding=funding, allocation_start=start
+    )
+
+    tasks = list(_pf_tasks(pf).select_related("scope"))
+    assert [t.title for t in tasks] == [funding_task.title, funding_global_task.title]
+    assert tasks[0].template_id == funding_task.id
+    assert tasks[0].due_date == start + timedelta(days=funding_task.default_due_days)
+    assert all(t.scope.funding_scoped for t in tasks)
+
+
+@pytest.mark.django_db
+def test_generation_query_count_does_not_depend_on_template_count(project, funding):
+    for i in range(25):
+        FundingTask.objects.create(funding=funding, title=f"tmpl {i}")
+
+    with CaptureQueriesContext(connection) as ctx:
+        pf = ProjectFunding.objects.create(project=project, funding=funding)
+
+    assert _pf_tasks(pf).count() == 25
+    assert len(ctx.captured_queries) < 15
+
+
+@pytest.mark.django_db
+def test_regeneration_is_idempotent(project_funding, funding):
+    FundingTask.objects.create(funding=funding, title="Late template")
+
+    created = generate_project_funding_tasks(project_funding)
+    assert [t.title for t in created] == ["Late template"]
+
+    assert generate_project_funding_tasks(project_funding) == []
+    assert _pf_tasks(project_funding).count() == 1
+
+
+@pytest.mark.django_db
+def test_origin_key_is_unique_per_project_funding(funding_task, project_funding):
+    task = Task.objects.create(title="dup")
+    with transaction.atomic():
+        with pytest.raises(IntegrityError):
+            TaskScope.objects.create(
+                task=task,
+                project_funding=project_funding,
+                funding_scoped=True,
+                origin_key=template_origin(funding_task.id),
+            )
@@ -1,6 +1,11 @@
 import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
-from api.models import Task, TaskScope
+from api.models import ProjectStats, Task, TaskAssignment, TaskScope, UserWorkload
+
+User = get_user_model()
 
 
 def _results(data):
@@ -34,3 +39,118 @@ def test_create_task_assignment_sets_assigned_by(api_client, user, project):
     assert res2.status_code == 200
     payload = _results(res2.data)
     assert any(a.get("id") == data["id"] for a in payload)
+
+
+@pytest.fixture
+def three_tasks():
+    return [
+        Task.objects.create(title=f"bulk {i}", status=Task.Status.TODO)
+        for i in range(3)
+    ]
+
+
+@pytest.mark.django_db
+def test_bulk_assign_adds_every_pair_once(api_client, user, three_tasks):
+    other = User.objects.create_user(username="other", password="x")
+    TaskAssignment.objects.create(task=three_tasks[0], user=user, worked_hours=2)
+
+    res = api_client.post(
+        "/api/task-assignments/bulk/",
+        {"tasks": [t.id for t in three_tasks], "users": [user.id, other.id]},
+        format="json",
+    )
+    assert res.status_code == 200
+    assert TaskAssignment.objects.count() == 6
+    kept = TaskAssignment.objects.get(task=three_tasks[0], user=user)
+    assert kept.worked_hours == 2
+    assert (
+        TaskAssignment.objects.get(task=three_tasks[1], user=other).assigned_by == user
+    )
+
+
+@pytest.mark.django_db
+def test_bulk_assign_remove_and_set(api_client, user, three_tasks):
+    other = User.objects.create_user(username="other", password="x")
+    for t in three_tasks:
+        TaskAssignment.objects.create(task=t, user=user)
+
+    res = api_client.post(
+        "/api/task-assignments/bulk/",
+        {"tasks": [three_tasks[0].id], "users": [user.id], "mode": "remove"},
+        format="json",
+    )
+    assert res.status_code == 200
+    assert not TaskAssignment.objects.filter(task=three_tasks[0]).exists()
+
+    res = api_client.post(
+        "/api/task-assignments/bulk/",
+        {"tasks": [t.id for t in three_tasks[1:]], "users": [other.id], "mode": "set"},
+        format="json",
+    )
+    assert res.status_code == 200
+    assert set(TaskAssignment.objects.values_list("task_id", "user_id")) == {
+        (three_tasks[1].id, other.id),
+        (three_tasks[2].id, other.id),
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("mode", ["add", "remove", "set"])
+def test_bulk_assign_query_count_does_not_grow_with_pairs(api_client, project, mode):
+    newcomer = User.objects.create_user(username="newcomer", password="x")
+
+    def run(n):
+        users = [
+            User.objects.create_user(username=f"u{n}-{i}", password="x")
+            for i in range(n)
+        ]
+        tasks = [Task.objects.create(title=f"t{n}-{i}") for i in range(n)]
+        for task in tasks:
+            TaskScope.objects.create(task=task, project=project)
+            if mode != "add":
+                for u in users:
+                    TaskAssignment.objects.create(task=task, user=u, worked_hours=1)
+        payload = {
+            "tasks": [t.id for t in tasks],
+            "users": [newcomer.id] if mode == "set" else [u.id for u in users],
+            "mode": mode,
+        }
+        with CaptureQueriesContext(connection) as ctx:
+            res = api_client.post("/api/task-assignments/bulk/", payload, format="json")
+        assert res.status_code == 200, res.data
+        return len(ctx.captured_queries)
+
+    assert run(2) == run(6)
+    expected = {"add": 40, "remove": 0, "set": 8}[mode]
+    assert TaskAssignment.objects.count() == expected
+    assert ProjectStats.objects.get(project=project).worked_hours == 0
+    assert UserWorkload.objects.get(user=newcomer).todo_count == (
+        8 if mode == "set" else 0
+    )
+
+
+@pytest.mark.django_db
+def test_bulk_assign_rejects_unknown_ids(api_client, user, three_tasks):
+    res = api_client.post(
+        "/api/task-assignments/bulk/",
+        {"tasks": [three_tasks[0].id, 999999], "users": [user.id]},
+        format="json",
+    )
+    assert res.status_code == 400
+    assert "tasks" in res.data
+    assert not TaskAssignment.objects.exists()
+
+
+@pytest.mark.django_db
+def test_task_patch_keeps_existing_assignment_rows(api_client, user, three_tasks):
+    task = three_tasks[0]
+    original = TaskAssignment.objects.create(task=task, user=user, worked_hours=3)
+
+    res = api_client.patch(
+        f"/api/tasks/{task.id}/",
+        {"assignee_ids": [user.id, user.id, 999999]},
+        format="json",
+    )
+    assert res.status_code == 200
+    assert list(TaskAssignment.objects.filter(task=task)) == [original]
+    assert TaskAssignment.objects.get(pk=original.pk).worked_hours == 3
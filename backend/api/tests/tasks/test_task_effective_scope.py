@@ -0,0 +1,106 @@
+import pytest
+
+from api.models import Funding, Project, Task, TaskScope
+
+
+def _effective(task):
+    return (
+        Task.objects.filter(pk=task.pk)
+        .values_list("effective_project_id", "effective_funding_id")
+        .get()
+    )
+
+
+def _list_ids(api_client, **params):
+    query = "&".join(f"{k}={v}" for k, v in params.items())
+    res = api_client.get(f"/api/tasks/?{query}")
+    assert res.status_code == 200
+    return {t["id"] for t in res.data["results"]}
+
+
+@pytest.mark.django_db
+def test_effective_ids_follow_every_kind_of_scope(
+    api_client,
+    funding_task,
+    project,
+    funding,
+    task_project_scoped,
+    funding_global_task,
+    task_pf_scoped,
+    task_unscoped,
+):
+    generated = set(
+        Task.objects.filter(scope__origin_key__contains=":").values_list(
+            "pk", flat=True
+        )
+    )
+    assert len(generated) == 2  # szablon + kopia taska fundingu
+
+    assert _effective(task_project_scoped) == (project.id, None)
+    assert _effective(funding_global_task) == (None, funding.id)
+    assert _effective(task_pf_scoped) == (project.id, funding.id)
+    for pk in generated:
+        assert _effective(Task(pk=pk)) == (project.id, funding.id)
+    assert _effective(task_unscoped) == (None, None)
+
+    assert _list_ids(api_client, project=project.id) == {
+        task_project_scoped.id,
+        task_pf_scoped.id,
+        *generated,
+    }
+    assert _list_ids(api_client, funding=funding.id, status="todo") == {
+        funding_global_task.id,
+        task_pf_scoped.id,
+        *generated,
+    }
+
+
+@pytest.mark.django_db
+def test_scope_changes_and_stale_saves(project, funding, task_project_scoped):
+    stale = Task.objects.get(pk=task_project_scoped.pk)
+
+    scope = task_project_scoped.scope
+    scope.project = None
+    scope.funding = funding
+    scope.save()
+    assert _effective(task_project_scoped) == (None, funding.id)
+
+    # Instancja wczytana przed zmianą scope'u nie nadpisuje kolumn.
+    stale.title = "Renamed"
+    stale.save()
+    assert _effective(stale) == (None, funding.id)
+
+    scope.delete()
+    assert _effective(task_project_scoped) == (None, None)
+
+
+@pytest.mark.django_db
+def test_moving_link_moves_its_tasks(project_funding, task_pf_scoped):
+    other_project = Project.objects.create(name="Inny")
+    other_funding = Funding.objects.create(name="Inny grant")
+
+    project_funding.project = other_project
+    project_funding.funding = other_funding
+    project_funding.save()
+
+    assert _effective(task_pf_scoped) == (other_project.id, other_funding.id)
+
+
+@pytest.mark.django_db
+def test_bulk_endpoint_sets_effective_ids(api_client, project, project_funding):
+    moved = Task.objects.create(title="moved")
+    TaskScope.objects.create(task=moved, project=project)
+
+    res = api_client.post(
+        "/api/tasks/bulk/",
+        {
+            "create": [{"title": "new", "project_funding": project_funding.id}],
+            "update": [{"id": moved.id, "funding": project_funding.funding_id}],
+        },
+        format="json",
+    )
+    assert res.status_code == 200, res.data
+
+    created = Task.objects.get(title="new")
+    assert _effective(created) == (project.id, project_funding.funding_id)
+    assert _effective(moved) == (None, project_funding.funding_id)
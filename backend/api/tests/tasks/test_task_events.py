@@ -0,0 +1,310 @@
+import asyncio
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+from django.test import AsyncClient
+from rest_framework.test import APIClient
+
+from api import events
+from api.cleanup import delete_generated_tasks
+from api.models import Project, ProjectFunding, Task, TaskAssignment, TaskScope
+
+User = get_user_model()
+
+
+@pytest.fixture
+def broker(monkeypatch):
+    """Świeży InMemoryBroker (ten z poprzednich testów ma stare zdarzenia)."""
+    monkeypatch.setattr(events, "_brokers", {})
+    return events.get_broker()
+
+
+@pytest.fixture
+def commit(django_capture_on_commit_callbacks):
+    """Blok, po którym wykonują się callbacki on_commit (publikacja)."""
+    return lambda: django_capture_on_commit_callbacks(execute=True)
+
+
+def _read(broker, project, after=0):
+    return [
+        event for _, event in broker.read(events.channel_name(project.pk), after, 0)
+    ]
+
+
+def _stream(user, project, headers=None):
+    """Cały strumień przez handler ASGI (pod WSGI endpoint zwraca 404)."""
+    client = AsyncClient()
+    client.force_login(user)
+
+    async def read():
+        res = await client.get(f"/api/projects/{project.pk}/events/", headers=headers)
+        assert res.status_code == 200
+        assert res["Content-Type"].startswith("text/event-stream")
+        return b"".join([part async for part in res.streaming_content]).decode()
+
+    return async_to_sync(read)()
+
+
+def _messages(text):
+    return [
+        (int(block.split("\n")[0][4:]), json.loads(block.split("\n")[1][6:]))
+        for block in text.split("\n\n")
+        if block.startswith("id: ") and "\ndata: " in block
+    ]
+
+
+@pytest.mark.django_db
+def test_task_api_writes_publish_compact_events(
+    api_client, broker, commit, project, user
+):
+    with commit():
+        res = api_client.post(
+            "/api/tasks/",
+            {"title": "Nowy", "project": project.id, "assignee_ids": [user.id]},
+            format="json",
+        )
+    assert res.status_code == 201
+    task_id = res.data["id"]
+
+    (created,) = _read(broker, project)
+    assert created["type"] == "task.created"
+    assert created["task"] == task_id and created["project"] == project.id
+    assert created["fields"]["title"] == "Nowy"
+    assert created["fields"]["scope_project"] == project.id
+    assert created["fields"]["assignees"] == [
+        {"id": user.id, "username": user.username}
+    ]
+
+    with commit():
+        res = api_client.patch(
+            f"/api/tasks/{task_id}/", {"status": "done", "title": "Nowy"}, format="json"
+        )
+    assert res.status_code == 200
+    updated = _read(broker, project, after=1)
+    assert updated == [
+        {
+            "type": "task.updated",
+            "task": task_id,
+            "project": project.id,
+            "version": res.data["updated_at"],
+            "fields": {"status": "done"},
+        }
+    ]
+
+    with commit():
+        assert api_client.delete(f"/api/tasks/{task_id}/").status_code == 204
+    assert _read(broker, project, after=2) == [
+        {"type": "task.deleted", "task": task_id, "project": project.id}
+    ]
+
+
+@pytest.mark.django_db
+def test_scope_move_is_delete_and_create(
+    broker, commit, user, project, task_project_scoped
+):
+    other = Project.objects.create(name="Inny", owner=user)
+    scope = task_project_scoped.scope
+    scope.project = other
+    with commit():
+        scope.save()
+
+    assert [e["type"] for e in _read(broker, project)] == ["task.deleted"]
+    (created,) = _read(broker, other)
+    assert created["type"] == "task.created"
+    assert created["fields"]["scope_project"] == other.id
+
+
+@pytest.mark.django_db
+def test_assignment_changes_and_noop_saves(
+    broker, commit, user, project, task_project_scoped
+):
+    with commit():
+        assignment = TaskAssignment.objects.create(task=task_project_scoped, user=user)
+    (event,) = _read(broker, project)
+    assert event["fields"] == {
+        "assignees": [{"id": user.id, "username": user.username}]
+    }
+
+    # Godziny nie są częścią zdarzenia, zapis bez zmian też nic nie wysyła.
+    assignment.worked_hours = 3
+    with commit():
+        assignment.save()
+        Task.objects.get(pk=task_project_scoped.pk).save()
+    assert _read(broker, project, after=1) == []
+
+    with commit():
+        assignment.delete()
+    (event,) = _read(broker, project, after=1)
+    assert event["fields"] == {"assignees": []}
+
+
+@pytest.mark.django_db
+def test_bulk_endpoint_publishes_one_event_per_task(
+    api_client, broker, commit, user, project, task_project_scoped
+):
+    doomed = Task.objects.create(title="do usunięcia")
+    TaskScope.objects.create(task=doomed, project=project)
+    TaskAssignment.objects.create(task=doomed, user=user)
+
+    with commit():
+        res = api_client.post(
+            "/api/tasks/bulk/",
+            {
+                "create": [{"title": "a", "project": project.id}],
+                "update": [
+                    {
+                        "id": task_project_scoped.id,
+                        "priority": 1,
+                        "assignee_ids": [user.id],
+                    }
+                ],
+                "delete": [doomed.id],
+            },
+            format="json",
+        )
+    assert res.status_code == 200, res.data
+
+    received = _read(broker, project)
+    by_type = {e["type"]: e for e in received}
+    assert len(received) == len(by_type) == 3
+    assert by_type["task.created"]["task"] == res.data["create"][0]["id"]
+    assert by_type["task.updated"]["fields"] == {
+        "priority": 1,
+        "assignees": [{"id": user.id, "username": user.username}],
+    }
+    assert by_type["task.deleted"]["task"] == doomed.id
+
+
+@pytest.mark.django_db
+def test_link_cleanup_and_rollback(broker, commit, project, funding, funding_task):
+    with commit():
+        project_funding = ProjectFunding.objects.create(
+            project=project, funding=funding
+        )
+    generated = list(
+        Task.objects.filter(scope__project_funding=project_funding).values_list(
+            "pk", flat=True
+        )
+    )
+    assert generated
+    # Stan zbudowany w pamięci przy generowaniu == stan z bazy.
+    state = events.collect(generated)
+    assert {e["task"]: e["fields"] for e in _read(broker, project)} == {
+        pk: state[pk]["fields"] for pk in generated
+    }
+    after = broker.last_id(events.channel_name(project.pk))
+
+    with commit(), pytest.raises(RuntimeError):
+        with events.batch(generated):
+            Task.objects.filter(pk__in=generated).update(title="x")
+            raise RuntimeError
+    assert _read(broker, project, after) == []
+
+    with commit():
+        delete_generated_tasks(project_funding.pk, batch_size=1)
+    assert [(e["type"], e["task"]) for e in _read(broker, project, after)] == [
+        ("task.deleted", pk) for pk in sorted(generated)
+    ]
+
+
+@pytest.mark.django_db
+def test_no_queries_when_disabled(settings, django_assert_num_queries):
+    settings.API_EVENTS_BROKER = ""
+    task = Task.objects.create(title="t")
+    with django_assert_num_queries(0):
+        assert events.before([task.pk]) == {}
+        with events.batch([task.pk]):
+            pass
+
+
+@pytest.mark.django_db
+def test_stream_replays_and_resets(user, broker, settings, project):
+    settings.API_EVENTS_STREAM_SECONDS = 0.2
+    settings.API_EVENTS_KEEPALIVE_SECONDS = 0.05
+    channel = events.channel_name(project.pk)
+    broker.publish(channel, [{"type": "task.deleted", "task": 1}])
+    broker.publish(channel, [{"type": "task.deleted", "task": 2}])
+
+    text = _stream(user, project, headers={"Last-Event-ID": "1"})
+    assert text.startswith("retry: ")
+    assert ": keepalive" in text
+    assert _messages(text) == [(2, {"type": "task.deleted", "task": 2})]
+
+    # Bez Last-Event-ID: tylko nowe zdarzenia.
+    assert _messages(_stream(user, project)) == []
+
+    text = _stream(user, project, headers={"Last-Event-ID": "7"})
+    assert _messages(text) == [(2, {"type": "reset"})]
+
+
+@pytest.mark.django_db
+def test_stream_errors(api_client, broker, settings, project):
+    assert APIClient().get(f"/api/projects/{project.pk}/events/").status_code == 403
+    assert api_client.get("/api/projects/999999/events/").status_code == 404
+    # WSGI: strumień trzymałby wątek przez całe połączenie.
+    assert api_client.get(f"/api/projects/{project.pk}/events/").status_code == 404
+    settings.API_EVENTS_BROKER = ""
+    assert api_client.get(f"/api/projects/{project.pk}/events/").status_code == 404
+
+
+def test_single_process_broker_is_refused_outside_debug(settings, monkeypatch):
+    monkeypatch.setattr(events, "_brokers", {})
+    settings.DEBUG = False
+    settings.API_EVENTS_BROKER = "api.events.InMemoryBroker"
+    with pytest.raises(ImproperlyConfigured):
+        events.check_broker()
+
+    # CacheBroker na locmem też widzi tylko jeden proces.
+    settings.API_EVENTS_BROKER = "api.events.CacheBroker"
+    with pytest.raises(ImproperlyConfigured):
+        events.check_broker()
+
+    settings.CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.redis.RedisCache"}
+    }
+    monkeypatch.setattr(events, "_brokers", {})
+    events.check_broker()
+
+    settings.API_EVENTS_BROKER = ""
+    events.check_broker()
+
+
+def test_in_memory_broker_buffer(settings):
+    settings.API_EVENTS_BUFFER = 2
+    broker = events.InMemoryBroker()
+    broker.publish("c", [{"n": 1}, {"n": 2}, {"n": 3}])
+    assert broker.last_id("c") == 3
+    assert broker.read("c", 1, 0) == [(2, {"n": 2}), (3, {"n": 3})]
+    assert broker.read("c", 3, 0) == []
+    for stale in (0, 4):
+        with pytest.raises(events.StaleCursor):
+            broker.read("c", stale, 0)
+
+
+def test_async_read_waits_for_events():
+    broker = events.InMemoryBroker()
+
+    async def read():
+        waiting = asyncio.ensure_future(broker.aread("c", 0, 5))
+        await asyncio.sleep(0.05)
+        broker.publish("c", [{"n": 1}])
+        return await waiting, await broker.aread("c", 1, 0.05)
+
+    assert async_to_sync(read)() == ([(1, {"n": 1})], [])
+
+
+def test_cache_broker(settings):
+    settings.API_EVENTS_BUFFER = 2
+    broker = events.CacheBroker()
+    broker.publish("c", [{"n": 1}])
+    broker.publish("c", [{"n": 2}, {"n": 3}])
+    assert broker.last_id("c") == 3
+    assert broker.read("c", 1, 0) == [(2, {"n": 2}), (3, {"n": 3})]
+    assert broker.read("c", 3, 0) == []
+    broker.cache.delete(broker._event_key("c", 2))
+    for stale in (0, 1, 4):
+        with pytest.raises(events.StaleCursor):
+            broker.read("c", stale, 0)
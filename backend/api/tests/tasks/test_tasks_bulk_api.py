@@ -0,0 +1,142 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.models import ProjectStats, Task, TaskAssignment, TaskScope, UserWorkload
+
+User = get_user_model()
+
+URL = "/api/tasks/bulk/"
+
+
+@pytest.mark.django_db
+def test_bulk_create_update_delete_in_one_request(
+    api_client, user, project, project_funding, task_unscoped, task_project_scoped
+):
+    other = User.objects.create_user(username="other", password="x")
+    res = api_client.post(
+        URL,
+        {
+            "create": [
+                {"title": "A", "project": project.id, "assignee_ids": [user.id]},
+                {"title": "B", "project_funding": project_funding.id},
+            ],
+            "update": [
+                {
+                    "id": task_unscoped.id,
+                    "status": Task.Status.DONE,
+                    "project": project.id,
+                    "assignee_ids": [other.id],
+                }
+            ],
+            "delete": [task_project_scoped.id],
+        },
+        format="json",
+    )
+    assert res.status_code == 200, res.data
+
+    a_id, b_id = (item["id"] for item in res.data["create"])
+    assert TaskScope.objects.get(task_id=a_id).project_id == project.id
+    assert TaskScope.objects.get(task_id=b_id).project_funding_id == project_funding.id
+    assert TaskAssignment.objects.get(task_id=a_id).assigned_by == user
+
+    task_unscoped.refresh_from_db()
+    assert task_unscoped.status == Task.Status.DONE
+    assert task_unscoped.scope.project_id == project.id
+    assert list(task_unscoped.assignees.values_list("id", flat=True)) == [other.id]
+
+    assert res.data["delete"] == [
+        {"index": 0, "id": task_project_scoped.id, "status": "deleted"}
+    ]
+    assert not Task.objects.filter(pk=task_project_scoped.id).exists()
+
+
+@pytest.mark.django_db
+def test_bulk_reports_per_item_errors_and_writes_nothing(api_client, task_unscoped):
+    res = api_client.post(
+        URL,
+        {
+            "create": [
+                {"title": "ok"},
+                {"status": "todo"},
+                {"title": "bad scope", "project": 999999},
+                {"title": "two scopes", "project": 1, "funding": 1},
+            ],
+            "update": [{"id": 999999, "title": "x"}],
+            "delete": [task_unscoped.id],
+        },
+        format="json",
+    )
+    assert res.status_code == 400
+    create_errors = res.data["create"]
+    assert create_errors[0] == {}
+    assert "title" in create_errors[1]
+    assert "project" in create_errors[2]
+    assert "non_field_errors" in create_errors[3]
+    assert "id" in res.data["update"][0]
+    assert res.data["delete"] == [{}]
+
+    assert list(Task.objects.values_list("id", flat=True)) == [task_unscoped.id]
+
+
+@pytest.mark.django_db
+def test_bulk_rejects_inverted_dates(api_client, task_unscoped):
+    res = api_client.post(
+        URL,
+        {
+            "update": [
+                {
+                    "id": task_unscoped.id,
+                    "start_date": "2025-02-01",
+                    "due_date": "2025-01-01",
+                }
+            ]
+        },
+        format="json",
+    )
+    assert res.status_code == 400
+    assert "non_field_errors" in res.data["update"][0]
+
+
+@pytest.mark.django_db
+def test_bulk_query_count_does_not_grow_with_items(api_client, project):
+    users = [User.objects.create_user(username=f"b{i}", password="x") for i in range(3)]
+
+    def run(n):
+        existing = [Task.objects.create(title=f"e{i}") for i in range(n)]
+        doomed = [Task.objects.create(title=f"d{i}") for i in range(n)]
+        # Przypisania z godzinami: update je zdejmuje, delete usuwa z taskiem.
+        for task in existing + doomed:
+            TaskScope.objects.create(task=task, project=project)
+            for u in users[1:]:
+                TaskAssignment.objects.create(task=task, user=u, worked_hours=2)
+        payload = {
+            "create": [
+                {"title": f"n{i}", "project": project.id, "assignee_ids": [users[0].id]}
+                for i in range(n)
+            ],
+            "update": [
+                {"id": t.id, "priority": 3, "assignee_ids": [users[0].id]}
+                for t in existing
+            ],
+            "delete": [t.id for t in doomed],
+        }
+        with CaptureQueriesContext(connection) as ctx:
+            res = api_client.post(URL, payload, format="json")
+        assert res.status_code == 200, res.data
+        return len(ctx.captured_queries)
+
+    assert run(3) == run(30)
+    stats = ProjectStats.objects.get(project=project)
+    assert stats.worked_hours == 0
+    assert stats.todo_count == Task.objects.filter(effective_project=project).count()
+    assert not TaskAssignment.objects.filter(user__in=users[1:]).exists()
+    assert UserWorkload.objects.get(user=users[1]).todo_count == 0
+    assert UserWorkload.objects.get(user=users[0]).todo_count == 66
+
+
+@pytest.mark.django_db
+def test_bulk_requires_operations(api_client):
+    res = api_client.post(URL, {}, format="json")
+    assert res.status_code == 400
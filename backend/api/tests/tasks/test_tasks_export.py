@@ -0,0 +1,93 @@
+import csv
+import io
+import json
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.models import Task, TaskAssignment, TaskScope
+
+
+def _body(res):
+    return b"".join(res.streaming_content).decode()
+
+
+@pytest.fixture
+def exported_task(user, project, task_project_scoped):
+    other = type(user).objects.create_user(username="anna", password="x")
+    task_project_scoped.cost_amount = Decimal("123.45")
+    task_project_scoped.receipt_note = "Faktura, nr 1"
+    task_project_scoped.save()
+    TaskAssignment.objects.create(
+        task=task_project_scoped, user=user, worked_hours=Decimal("2.5")
+    )
+    TaskAssignment.objects.create(
+        task=task_project_scoped, user=other, worked_hours=Decimal("1.5")
+    )
+    return task_project_scoped
+
+
+@pytest.mark.django_db
+def test_csv_export_streams_filtered_rows(
+    api_client, project, exported_task, funding_global_task
+):
+    res = api_client.get(f"/api/tasks/export/?format=csv&project={project.id}")
+
+    assert res.status_code == 200
+    assert res.streaming
+    assert res["Content-Type"].startswith("text/csv")
+    assert "attachment" in res["Content-Disposition"]
+
+    rows = list(csv.DictReader(io.StringIO(_body(res))))
+    assert [int(r["id"]) for r in rows] == [exported_task.id]
+    row = rows[0]
+    assert row["project"] == project.name
+    assert row["cost_amount"] == "123.45"
+    assert row["receipt_note"] == "Faktura, nr 1"
+    assert row["assignees"] == "anna, tester"
+    assert Decimal(row["worked_hours"]) == Decimal("4.0")
+
+
+@pytest.mark.django_db
+def test_ndjson_export_uses_list_filters(
+    api_client, funding, exported_task, funding_global_task, task_pf_scoped
+):
+    res = api_client.get(f"/api/tasks/export/?format=ndjson&funding={funding.id}")
+
+    assert res.status_code == 200
+    assert res["Content-Type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in _body(res).splitlines()]
+    # Razem z kopią taska fundingu wygenerowaną dla project_funding.
+    assert {line["id"] for line in lines} == set(
+        Task.objects.filter(effective_funding=funding).values_list("pk", flat=True)
+    )
+    assert {funding_global_task.id, task_pf_scoped.id} <= {line["id"] for line in lines}
+    assert exported_task.id not in {line["id"] for line in lines}
+    assert lines[0]["funding"] == funding.name
+    assert lines[0]["assignees"] == []
+    assert lines[0]["worked_hours"] is None
+
+
+@pytest.mark.django_db
+def test_export_query_count_does_not_depend_on_rows(api_client, project, user):
+    def queries():
+        with CaptureQueriesContext(connection) as ctx:
+            _body(api_client.get("/api/tasks/export/?format=csv"))
+        return len(ctx.captured_queries)
+
+    task = Task.objects.create(title="pierwszy")
+    TaskScope.objects.create(task=task, project=project)
+    few = queries()
+
+    for i in range(30):
+        task = Task.objects.create(title=f"task {i}")
+        TaskScope.objects.create(task=task, project=project)
+        TaskAssignment.objects.create(task=task, user=user)
+    assert queries() == few
+
+
+@pytest.mark.django_db
+def test_export_requires_authentication(client):
+    assert client.get("/api/tasks/export/?format=csv").status_code in (401, 403)
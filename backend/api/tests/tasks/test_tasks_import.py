@@ -0,0 +1,198 @@
+import io
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from api import task_import
+from api.models import ProjectStats, Task, TaskAssignment, TaskImport
+from api.task_import import ImportConflict, create_import, run_import
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+
+
+def _csv(*lines):
+    return ("\n".join(lines) + "\n").encode()
+
+
+def _upload(api_client, content, name="plan.csv", **params):
+    query = "&".join(f"{k}={v}" for k, v in params.items())
+    return api_client.post(
+        f"/api/task-imports/?{query}",
+        {"file": SimpleUploadedFile(name, content)},
+        format="multipart",
+    )
+
+
+@pytest.mark.django_db
+def test_csv_import_resolves_references_and_reports_bad_rows(
+    api_client, user, project, funding, project_funding
+):
+    content = _csv(
+        "title;status;due_date;cost_amount;project;funding;assignees",
+        f"Plakat;todo;2025-03-01;120.50;{project.name};;tester",
+        f"Raport;doing;;;{project.id};{funding.name};",
+        "Bez scope'u;done;;;;;",
+        "Zły user;todo;;;;;nikt",
+        "Zły status;zrobione;;;;;",
+        ";;;;;;",
+    )
+    res = _upload(api_client, content)
+
+    assert res.status_code == 201, res.data
+    assert res.data["status"] == "done"
+    assert res.data["rows_done"] == 6
+    assert res.data["imported"] == 3
+    assert res.data["failed"] == 2
+    assert [e["row"] for e in res.data["errors"]] == [5, 6]
+    assert "assignees" in res.data["errors"][0]["errors"]
+    assert "status" in res.data["errors"][1]["errors"]
+
+    poster = Task.objects.get(title="Plakat")
+    assert poster.effective_project_id == project.id
+    assert str(poster.cost_amount) == "120.50"
+    assert list(poster.assignees.all()) == [user]
+
+    report = Task.objects.get(title="Raport")
+    assert report.scope.project_funding_id == project_funding.id
+    assert report.effective_funding_id == funding.id
+
+    assert Task.objects.get(title="Bez scope'u").effective_project_id is None
+    assert ProjectStats.objects.get(project=project).doing_count >= 1
+
+
+@pytest.mark.django_db
+def test_import_resumes_after_last_committed_batch(user, project, monkeypatch):
+    lines = ["title,project"] + [f"Task {i},{project.id}" for i in range(5)]
+    job = create_import(io.BytesIO(_csv(*lines)), "plan.csv", created_by=user)
+
+    write = task_import._Batch.write
+    calls = []
+
+    def crash_on_second_batch(batch, assigned_by):
+        calls.append(1)
+        if len(calls) == 2:
+            raise RuntimeError("worker killed")
+        return write(batch, assigned_by)
+
+    monkeypatch.setattr(task_import._Batch, "write", crash_on_second_batch)
+    with pytest.raises(RuntimeError):
+        run_import(job, batch_size=2)
+
+    job.refresh_from_db()
+    assert job.status == TaskImport.Status.FAILED
+    assert (job.rows_done, job.imported) == (2, 2)
+    assert Task.objects.count() == 2
+
+    monkeypatch.setattr(task_import._Batch, "write", write)
+    run_import(job, batch_size=2)
+
+    job.refresh_from_db()
+    assert job.status == TaskImport.Status.DONE
+    assert (job.rows_done, job.imported) == (5, 5)
+    assert sorted(Task.objects.values_list("title", flat=True)) == [
+        f"Task {i}" for i in range(5)
+    ]
+
+
+@pytest.mark.django_db
+def test_second_worker_does_not_repeat_committed_batches(user, project):
+    lines = ["title,project"] + [f"Task {i},{project.id}" for i in range(5)]
+    job = create_import(io.BytesIO(_csv(*lines)), "plan.csv", created_by=user)
+    stale = TaskImport.objects.get(pk=job.pk)
+
+    def take_over(job):
+        # Drugi worker z tym samym (już nieaktualnym) stanem zadania.
+        with pytest.raises(ImportConflict):
+            run_import(stale, batch_size=2)
+
+    run_import(job, batch_size=2, on_progress=take_over)
+
+    job.refresh_from_db()
+    assert job.status == TaskImport.Status.DONE
+    assert (job.rows_done, job.imported) == (5, 5)
+    assert Task.objects.count() == 5
+
+
+@pytest.mark.django_db
+def test_resume_skips_imports_running_elsewhere(user):
+    job = create_import(io.BytesIO(_csv("title", "Jeden")), "plan.csv", created_by=user)
+    TaskImport.objects.filter(pk=job.pk).update(status=TaskImport.Status.RUNNING)
+
+    out = StringIO()
+    call_command("import_tasks", "--queue", "--resume", stdout=out)
+    assert "Przetworzono importów: 0" in out.getvalue()
+    assert not Task.objects.exists()
+
+    TaskImport.objects.filter(pk=job.pk).update(
+        updated_at=timezone.now() - timedelta(hours=1)
+    )
+    call_command("import_tasks", "--queue", "--resume", stdout=out)
+    job.refresh_from_db()
+    assert job.status == TaskImport.Status.DONE
+    assert Task.objects.get().title == "Jeden"
+
+
+@pytest.mark.django_db
+def test_batch_query_count_does_not_depend_on_rows(user, project, funding):
+    def queries(rows):
+        lines = ["title,project,assignees"] + [
+            f"T{i},{project.name},tester" for i in range(rows)
+        ]
+        job = create_import(io.BytesIO(_csv(*lines)), "plan.csv", created_by=user)
+        with CaptureQueriesContext(connection) as ctx:
+            run_import(job, batch_size=100)
+        assert job.imported == rows
+        return len(ctx.captured_queries)
+
+    assert queries(3) == queries(40)
+    assert TaskAssignment.objects.filter(user=user).count() == 43
+
+
+@pytest.mark.django_db
+def test_deferred_import_is_run_by_the_command(api_client, project):
+    res = _upload(api_client, _csv("title", "Jeden", "Dwa"), defer=1)
+    assert res.status_code == 202
+    assert res.data["status"] == "pending"
+    assert not Task.objects.exists()
+
+    out = StringIO()
+    call_command("import_tasks", "--queue", stdout=out)
+
+    job = TaskImport.objects.get(pk=res.data["id"])
+    assert job.status == TaskImport.Status.DONE
+    assert job.imported == 2
+    assert "Przetworzono importów: 1" in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_rejects_unsupported_files(api_client):
+    assert _upload(api_client, b"title\nx\n", name="plan.txt").status_code == 400
+    res = _upload(api_client, _csv("nazwa", "x"))
+    assert res.status_code == 400
+    assert "title" in str(res.data["file"])
+
+
+@pytest.mark.django_db
+def test_xlsx_import(api_client, project):
+    openpyxl = pytest.importorskip("openpyxl")
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    sheet.append(["Title", "Priority", "Project"])
+    sheet.append(["Z arkusza", 3, project.id])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+
+    res = _upload(api_client, buffer.getvalue(), name="plan.xlsx")
+
+    assert res.status_code == 201, res.data
+    task = Task.objects.get(title="Z arkusza")
+    assert (task.priority, task.effective_project_id) == (3, project.id)
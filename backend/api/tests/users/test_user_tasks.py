@@ -0,0 +1,87 @@
+from datetime import date, timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.models import Task, TaskAssignment, TaskScope
+
+User = get_user_model()
+
+URL = "/api/users/{}/tasks/"
+
+
+def _assigned(user, scope=None, **fields):
+    task = Task.objects.create(title=fields.pop("title", "t"), **fields)
+    if scope:
+        TaskScope.objects.create(task=task, **scope)
+    TaskAssignment.objects.create(task=task, user=user)
+    return task
+
+
+def _ids(res):
+    assert res.status_code == 200, res.data
+    return [row["id"] for row in res.data["results"]]
+
+
+@pytest.mark.django_db
+def test_cursor_pages_walk_all_tasks_newest_first(api_client, user, project):
+    tasks = [_assigned(user, {"project": project}, title=f"t{i}") for i in range(5)]
+    _assigned(user)  # bez scope
+
+    res = api_client.get(URL.format(user.id), {"page_size": 4})
+    first = _ids(res)
+    assert len(first) == 4
+    second = _ids(api_client.get(res.data["next"]))
+    assert len(second) == 2
+    assert res.data["previous"] is None
+
+    assert first[1:] == [t.id for t in reversed(tasks)][:3]
+    assert set(first + second) == set(
+        TaskAssignment.objects.filter(user=user).values_list("task_id", flat=True)
+    )
+
+    unscoped = next(row for row in res.data["results"] if row["id"] == first[0])
+    assert unscoped["project_id"] is None
+    assert unscoped["project_funding_id"] is None
+
+
+@pytest.mark.django_db
+def test_filters(api_client, user, project):
+    today = date.today()
+    todo = _assigned(user, {"project": project}, due_date=today)
+    _assigned(user, {"project": project}, status=Task.Status.DONE, due_date=today)
+    late = _assigned(user, status=Task.Status.DOING, due_date=today + timedelta(9))
+
+    url = URL.format(user.id)
+    assert set(_ids(api_client.get(url, {"status": "todo,doing"}))) == {
+        todo.id,
+        late.id,
+    }
+    assert len(_ids(api_client.get(url, {"project": project.id}))) == 2
+    res = api_client.get(url, {"due_from": today + timedelta(1)})
+    assert _ids(res) == [late.id]
+    res = api_client.get(url, {"due_to": today, "status": "todo"})
+    assert _ids(res) == [todo.id]
+
+    assert api_client.get(url, {"status": "bogus"}).status_code == 400
+    assert api_client.get(url, {"due_to": "soon"}).status_code == 400
+    assert api_client.get(url, {"project": "x"}).status_code == 400
+
+
+@pytest.mark.django_db
+def test_only_this_users_tasks_and_fixed_queries(api_client, user, project):
+    other = User.objects.create_user(username="other", password="x")
+    mine = _assigned(user, {"project": project})
+    _assigned(other, {"project": project})
+    assert _ids(api_client.get(URL.format(user.id))) == [mine.id]
+
+    for _ in range(20):
+        _assigned(user, {"project": project})
+    with CaptureQueriesContext(connection) as ctx:
+        assert len(_ids(api_client.get(URL.format(user.id)))) == 20
+    # user (404) + jedna strona przypisań z taskami i scope.
+    assert len(ctx.captured_queries) == 2
+
+    assert api_client.get(URL.format(999999)).status_code == 404
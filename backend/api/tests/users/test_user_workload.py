@@ -0,0 +1,187 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.cleanup import unlink_project_funding
+from api.models import Task, TaskAssignment, TaskScope, UserWorkload
+from api.workload import recompute_workload
+
+User = get_user_model()
+
+FIELDS = ["todo_count", "doing_count", "done_count", "overdue_count", "worked_hours"]
+
+
+def _snapshot(user):
+    return UserWorkload.objects.filter(user=user).values(*FIELDS).get()
+
+
+def assert_matches_rebuild(*users):
+    """Liczniki utrzymywane przyrostowo muszą się zgadzać z przeliczeniem."""
+    incremental = [_snapshot(u) for u in users]
+    recompute_workload([u.pk for u in users])
+    assert incremental == [_snapshot(u) for u in users]
+
+
+def _task(project, **fields):
+    task = Task.objects.create(title=fields.pop("title", "t"), **fields)
+    TaskScope.objects.create(task=task, project=project)
+    return task
+
+
+@pytest.mark.django_db
+def test_new_user_gets_empty_row(user):
+    assert _snapshot(user) == {
+        "todo_count": 0,
+        "doing_count": 0,
+        "done_count": 0,
+        "overdue_count": 0,
+        "worked_hours": Decimal("0"),
+    }
+
+
+@pytest.mark.django_db
+def test_assignment_and_status_changes_update_counters(project, user):
+    other = User.objects.create_user(username="other", password="x")
+    past = date.today() - timedelta(days=2)
+    task = _task(project, status=Task.Status.TODO, due_date=past)
+    assignment = TaskAssignment.objects.create(task=task, user=user, worked_hours=2)
+    TaskAssignment.objects.create(task=task, user=other)
+
+    row = _snapshot(user)
+    assert (row["todo_count"], row["overdue_count"]) == (1, 1)
+    assert row["worked_hours"] == Decimal("2")
+
+    task.status = Task.Status.DONE
+    task.save()
+    assignment.worked_hours = Decimal("3.5")
+    assignment.save()
+
+    row = _snapshot(user)
+    assert (row["todo_count"], row["done_count"], row["overdue_count"]) == (0, 1, 0)
+    assert row["worked_hours"] == Decimal("3.5")
+    assert _snapshot(other)["done_count"] == 1
+    assert_matches_rebuild(user, other)
+
+    # Przepięcie przypisania na innego użytkownika.
+    third = User.objects.create_user(username="third", password="x")
+    assignment.user = third
+    assignment.save()
+    assert _snapshot(user)["done_count"] == 0
+    assert _snapshot(third)["worked_hours"] == Decimal("3.5")
+    assert_matches_rebuild(user, other, third)
+
+    task.delete()
+    assert _snapshot(other)["done_count"] == 0
+    assert _snapshot(third)["worked_hours"] == 0
+    assert_matches_rebuild(user, other, third)
+
+
+@pytest.mark.django_db
+def test_bulk_paths_keep_counters_in_sync(api_client, project, user):
+    other = User.objects.create_user(username="other", password="x")
+    keep = _task(project, status=Task.Status.TODO)
+    TaskAssignment.objects.create(task=keep, user=user)
+
+    res = api_client.post(
+        "/api/tasks/bulk/",
+        {
+            "create": [
+                {
+                    "title": "new",
+                    "status": "doing",
+                    "project": project.id,
+                    "assignee_ids": [user.id, other.id],
+                }
+            ],
+            "update": [{"id": keep.id, "status": "done", "assignee_ids": [other.id]}],
+        },
+        format="json",
+    )
+    assert res.status_code == 200, res.data
+
+    assert (_snapshot(user)["doing_count"], _snapshot(user)["done_count"]) == (1, 0)
+    assert (_snapshot(other)["doing_count"], _snapshot(other)["done_count"]) == (1, 1)
+    assert_matches_rebuild(user, other)
+
+    res = api_client.post(
+        "/api/task-assignments/bulk/",
+        {"tasks": [keep.id], "users": [user.id], "mode": "add"},
+        format="json",
+    )
+    assert res.status_code in (200, 201), res.data
+    assert _snapshot(user)["done_count"] == 1
+    assert_matches_rebuild(user, other)
+
+
+@pytest.mark.django_db
+def test_unlinking_removes_generated_tasks_from_counters(
+    funding_task, project_funding, user
+):
+    generated = Task.objects.get(scope__project_funding=project_funding)
+    TaskAssignment.objects.create(task=generated, user=user)
+    assert _snapshot(user)["todo_count"] == 1
+
+    unlink_project_funding(project_funding)
+    assert _snapshot(user)["todo_count"] == 0
+    assert_matches_rebuild(user)
+
+
+@pytest.mark.django_db
+def test_deleting_user_with_assignments(project, user):
+    other = User.objects.create_user(username="other", password="x")
+    TaskAssignment.objects.create(task=_task(project), user=other)
+
+    other.delete()
+    assert not UserWorkload.objects.filter(user_id=other.pk).exists()
+
+
+@pytest.mark.django_db
+def test_users_list_reads_counters_without_aggregation(api_client, project, user):
+    task = _task(project, status=Task.Status.DOING)
+    TaskAssignment.objects.create(task=task, user=user, worked_hours=4)
+    done = _task(project, status=Task.Status.DONE)
+    TaskAssignment.objects.create(task=done, user=user)
+    for i in range(5):
+        User.objects.create_user(username=f"u{i}", password="x")
+
+    with CaptureQueriesContext(connection) as ctx:
+        res = api_client.get("/api/users/")
+    assert res.status_code == 200
+    # Jedyny GROUP BY to raz dziennie przeliczany overdue (UPDATE).
+    reads = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("SELECT")]
+    assert reads and not any("GROUP BY" in sql for sql in reads)
+
+    me = next(u for u in res.data["results"] if u["id"] == user.id)
+    assert me["tasks_count"] == 2
+    assert me["done_tasks_count"] == 1
+    assert me["open_tasks_count"] == 1
+    assert me["overdue_tasks_count"] == 0
+    assert me["worked_hours"] == "4.00"
+
+
+@pytest.mark.django_db
+def test_listing_refreshes_stale_overdue(api_client, project, user):
+    task = _task(project, due_date=date.today() - timedelta(days=1))
+    TaskAssignment.objects.create(task=task, user=user)
+    UserWorkload.objects.filter(user=user).update(
+        overdue_count=0, overdue_as_of=date.today() - timedelta(days=3)
+    )
+
+    res = api_client.get(f"/api/users/{user.id}/")
+    assert res.status_code == 200
+    assert res.data["overdue_tasks_count"] == 1
+
+
+@pytest.mark.django_db
+def test_rebuild_command_repairs_rows(project, user):
+    TaskAssignment.objects.create(task=_task(project), user=user)
+    UserWorkload.objects.all().delete()
+
+    call_command("rebuild_user_workload", "--workers", "1")
+
+    assert _snapshot(user)["todo_count"] == 1
@@ -19,7 +19,7 @@ def test_list_users_includes_authenticated_user(api_client, user):
 
 
 @pytest.mark.django_db
-def test_user_detail_includes_tasks_list(api_client, user, project):
+def test_user_detail_carries_counts_and_tasks_link(api_client, user, project):
     task = Task.objects.create(
         title="User API task",
         status=Task.Status.TODO,
@@ -31,7 +31,12 @@ def test_user_detail_includes_tasks_list(api_client, user, project):
     res = api_client.get(f"/api/users/{user.id}/")
     assert res.status_code == 200
 
-    tasks = res.data.get("tasks", [])
-    assert isinstance(tasks, list)
-    ids = {t["id"] for t in tasks}
+    assert "tasks" not in res.data
+    assert res.data["tasks_count"] == 1
+    assert res.data["open_tasks_count"] == 1
+    assert res.data["tasks_url"].endswith(f"/api/users/{user.id}/tasks/")
+
+    res = api_client.get(res.data["tasks_url"])
+    assert res.status_code == 200
+    ids = {t["id"] for t in res.data["results"]}
     assert task.id in ids
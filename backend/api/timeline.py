@@ -0,0 +1,96 @@
+"""Zapytania osi czasu projektu (`/api/projects/{id}/timeline/`)."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+
+from django.contrib.postgres.fields import DateRangeField
+from django.db.backends.postgresql.psycopg_any import DateRange
+from django.db.models import F, Func, Q, Value
+
+from .models import Task, TaskAssignment
+
+TIMELINE_COLUMNS = (
+    "id",
+    "title",
+    "status",
+    "priority",
+    "start_date",
+    "due_date",
+    "assignee_ids",
+)
+ROW_FIELDS = TIMELINE_COLUMNS[:-1]
+TIMELINE_MAX_DAYS = 731
+
+SCHEDULED = Q(start_date__isnull=False, due_date__isnull=False)
+
+
+def date_span():
+    """`daterange(start_date, due_date, '[]')` — jak w wyrażeniu indeksu."""
+    return Func(
+        F("start_date"),
+        F("due_date"),
+        Value("[]"),
+        function="daterange",
+        output_field=DateRangeField(),
+    )
+
+
+def project_tasks(project_id):
+    return Task.objects.filter(effective_project_id=project_id)
+
+
+def scheduled_tasks(project_id, start, end):
+    """Zaplanowane taski projektu nachodzące na `[start, end]`."""
+    return (
+        project_tasks(project_id)
+        .filter(SCHEDULED)
+        .alias(span=date_span())
+        .filter(span__overlap=DateRange(start, end, "[]"))
+        .only(*ROW_FIELDS)
+        .order_by("start_date", "id")
+    )
+
+
+def unscheduled_tasks(project_id):
+    return project_tasks(project_id).exclude(SCHEDULED).only(*ROW_FIELDS, "created_at")
+
+
+def _assignee_pairs(tasks):
+    return (
+        TaskAssignment.objects.filter(task_id__in=[t.pk for t in tasks])
+        .order_by("task_id", "user_id")
+        .values_list("task_id", "user_id")
+    )
+
+
+def _rows(tasks, pairs):
+    assignees = defaultdict(list)
+    for task_id, user_id in pairs:
+        assignees[task_id].append(user_id)
+    return [
+        [
+            t.pk,
+            t.title,
+            t.status,
+            t.priority,
+            t.start_date,
+            t.due_date,
+            assignees[t.pk],
+        ]
+        for t in tasks
+    ]
+
+
+def to_rows(tasks):
+    """Zwięzłe wiersze `[id, title, status, priority, start, due, [user ids]]`."""
+    tasks = list(tasks)
+    return _rows(tasks, _assignee_pairs(tasks) if tasks else ())
+
+
+async def ato_rows(tasks):
+    """`to_rows` dla widoków async; `tasks` to queryset albo lista."""
+    if not isinstance(tasks, list):
+        tasks = [t async for t in tasks]
+    pairs = [pair async for pair in _assignee_pairs(tasks)] if tasks else ()
+    return _rows(tasks, pairs)
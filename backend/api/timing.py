@@ -0,0 +1,174 @@
+"""Czasy obsługi żądania w nagłówkach `Server-Timing`."""
+
+from __future__ import annotations
+
+import functools
+import json
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+logger = logging.getLogger("api.timing")
+
+_current = ContextVar("api_request_timings", default=None)
+
+
+class RequestTimings:
+    def __init__(self):
+        self.queries = 0
+        self.durations = {"db": 0.0, "ser": 0.0, "sig": 0.0}
+        self._depth = {}
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.durations["db"] += perf_counter() - start
+
+    @contextmanager
+    def measure(self, kind):
+        depth = self._depth.get(kind, 0)
+        self._depth[kind] = depth + 1
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self._depth[kind] = depth
+            if depth == 0:
+                self.durations[kind] += perf_counter() - start
+
+
+@contextmanager
+def measure(kind):
+    """Dolicza czas bloku do kategorii `kind` bieżącego żądania."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    with timings.measure(kind):
+        yield
+
+
+def measured(kind):
+    """Wersja dekoratora `measure`."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with measure(kind):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class TimedRepresentationMixin:
+    """Wlicza `to_representation` do czasu serializerów żądania."""
+
+    def to_representation(self, instance):
+        with measure("ser"):
+            return super().to_representation(instance)
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 1)
+
+
+def _record_query(execute, sql, params, many, context):
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    return timings.db_wrapper(execute, sql, params, many, context)
+
+
+def _install(connection):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+@receiver(connection_created)
+def _install_on_connect(sender, connection, **kwargs):
+    _install(connection)
+
+
+class ServerTimingMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not getattr(settings, "API_SERVER_TIMING", False):
+            return self.get_response(request)
+
+        # Connections opened before this module was imported.
+        for connection in connections.all():
+            _install(connection)
+        timings = RequestTimings()
+        token = _current.set(timings)
+        start = perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, timings, perf_counter() - start)
+
+    async def __acall__(self, request):
+        if not getattr(settings, "API_SERVER_TIMING", False):
+            return await self.get_response(request)
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        start = perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, timings, perf_counter() - start)
+
+    def _finish(self, request, response, timings, total):
+        durations = {name: _ms(value) for name, value in timings.durations.items()}
+        response["Server-Timing"] = ", ".join(
+            [
+                f'db;dur={durations["db"]};desc="{timings.queries} queries"',
+                f'ser;dur={durations["ser"]};desc="serializers"',
+                f'sig;dur={durations["sig"]};desc="signals"',
+                f"total;dur={_ms(total)}",
+            ]
+        )
+        origin = request.headers.get("Origin")
+        if origin and origin in getattr(settings, "CORS_ALLOWED_ORIGINS", ()):
+            # Cross-origin pages only see Server-Timing with this header.
+            response["Timing-Allow-Origin"] = origin
+
+        if getattr(settings, "API_SERVER_TIMING_LOG", False):
+            match = getattr(request, "resolver_match", None)
+            logger.info(
+                json.dumps(
+                    {
+                        "view": match.view_name if match else None,
+                        "method": request.method,
+                        "path": request.path,
+                        "status": response.status_code,
+                        "queries": timings.queries,
+                        **{f"{name}_ms": value for name, value in durations.items()},
+                        "total_ms": _ms(total),
+                    }
+                )
+            )
+        return response
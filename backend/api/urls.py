@@ -1,13 +1,16 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from . import async_views
 from .views import auth_csrf, auth_login, auth_logout, health, me
 from .views import (
     FundingViewSet,
     FundingTaskViewSet,
     ProjectViewSet,
     ProjectFundingViewSet,
+    ProjectFundingCleanupViewSet,
     TaskViewSet,
     TaskAssignmentViewSet,
+    TaskImportViewSet,
     UserViewSet,
 )
 
@@ -17,8 +20,14 @@ router.register(r"fundings", FundingViewSet, basename="funding")
 router.register(r"funding-tasks", FundingTaskViewSet, basename="fundingtask")
 router.register(r"projects", ProjectViewSet, basename="project")
 router.register(r"project-fundings", ProjectFundingViewSet, basename="projectfunding")
+router.register(
+    r"project-funding-cleanups",
+    ProjectFundingCleanupViewSet,
+    basename="projectfundingcleanup",
+)
 router.register(r"tasks", TaskViewSet, basename="task")
 router.register(r"task-assignments", TaskAssignmentViewSet, basename="task-assignment")
+router.register(r"task-imports", TaskImportViewSet, basename="task-import")
 router.register(r"users", UserViewSet, basename="user")
 
 urlpatterns = [
@@ -27,5 +36,19 @@ urlpatterns = [
     path("auth/csrf/", auth_csrf, name="auth_csrf"),
     path("auth/login/", auth_login, name="auth_login"),
     path("auth/logout/", auth_logout, name="auth_logout"),
+    # Async (ASGI) warianty list i widoków do odczytu, patrz api.async_views
+    path("async/health/", async_views.health, name="async-health"),
+    path("async/tasks/", async_views.TaskListView.as_view(), name="async-task-list"),
+    path(
+        "async/projects/<int:pk>/board/",
+        async_views.ProjectBoardView.as_view(),
+        name="async-project-board",
+    ),
+    path(
+        "async/projects/<int:pk>/timeline/",
+        async_views.ProjectTimelineView.as_view(),
+        name="async-project-timeline",
+    ),
+    path("async/users/", async_views.UserListView.as_view(), name="async-user-list"),
     path("", include(router.urls)),
 ]
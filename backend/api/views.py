@@ -1,30 +1,75 @@
 from django.contrib.auth import authenticate, login, logout
 from django.views.decorators.csrf import ensure_csrf_cookie, csrf_protect
-from django.db.models import Q, Count
-from rest_framework.decorators import api_view, permission_classes
+from django.db import transaction
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Q, F, Prefetch, Value
+from django.db.models.functions import Coalesce, Left
+from django.utils.dateparse import parse_date
+from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
-from rest_framework import viewsets, permissions
+from rest_framework.reverse import reverse
+from rest_framework import mixins, viewsets, permissions
 from rest_framework.throttling import ScopedRateThrottle
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.generics import get_object_or_404
 from .models import (
     Funding,
     FundingTask,
     Project,
     ProjectFunding,
+    ProjectFundingCleanup,
     Task,
     TaskAssignment,
+    TaskImport,
+    TaskScope,
     UserProfile,
+    UserWorkload,
 )
 from .serializers import (
     FundingSerializer,
     FundingTaskSerializer,
     ProjectSerializer,
     ProjectFundingSerializer,
+    ProjectFundingCleanupSerializer,
+    ProjectStatsSerializer,
     TaskSerializer,
+    TaskCardSerializer,
     TaskAssignmentSerializer,
+    TaskAssignmentBulkSerializer,
+    TaskImportSerializer,
     UserSerializer,
     UserDetailSerializer,
+    UserTaskSerializer,
+    requested_expand,
+    requested_fields,
 )
+from .pagination import BoardColumnPagination, KeysetPagination, UserTaskPagination
+from .assignments import add_assignees, remove_assignees, sync_assignees
+from .bulk import TaskBulkWriter
+from .export import CSVRenderer, NDJSONRenderer, export_response
+from .events import (
+    EventStreamRenderer,
+    channel_name,
+    get_broker,
+    last_event_id,
+    stream_response,
+)
+from .task_import import ImportFormatError, create_import, run_import
+from .conditional import ConditionalGetMixin
+from .response_cache import CachedResponseMixin
+from .cleanup import blocking_tasks_exist, schedule_cleanup, unlink_project_funding
+from .stats import STATUS_FIELDS, ZERO, get_stats
+from .workload import refresh_overdue
+from .timeline import (
+    TIMELINE_COLUMNS,
+    TIMELINE_MAX_DAYS,
+    scheduled_tasks,
+    to_rows,
+    unscheduled_tasks,
+)
+from rest_framework import status
+from rest_framework.exceptions import NotFound, ValidationError
 from django_filters.rest_framework import DjangoFilterBackend
 
 from django.contrib.auth import get_user_model
@@ -113,18 +158,191 @@ class IsAuthenticated(permissions.IsAuthenticated):
     pass
 
 
+# ─────────────────────────────
+# Paginacja kursorowa (opt-in)
+# ─────────────────────────────
+class KeysetPaginationMixin:
+    """
+    Pozwala klientowi przełączyć listę na paginację kursorową:
+    `?pagination=cursor` (pierwsza strona) albo `?cursor=...` (kolejne).
+    Bez tych parametrów działa domyślna paginacja stronicowa.
+    """
+
+    keyset_pagination_class = KeysetPagination
+
+    def uses_keyset_pagination(self):
+        request = getattr(self, "request", None)
+        if request is None:
+            return False
+        params = request.query_params
+        return params.get("pagination") == "cursor" or "cursor" in params
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            if self.uses_keyset_pagination():
+                self._paginator = self.keyset_pagination_class()
+            elif self.pagination_class is None:
+                self._paginator = None
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+
+# ─────────────────────────────
+# Zapisy w jednej transakcji
+# ─────────────────────────────
+class AtomicWriteMixin:
+    """
+    Zapis obiektu i nałożone przez sygnały zmiany liczników (ProjectStats,
+    UserWorkload) commitują się razem albo wcale.
+    """
+
+    def create(self, request, *args, **kwargs):
+        with transaction.atomic():
+            return super().create(request, *args, **kwargs)
+
+    def update(self, request, *args, **kwargs):
+        with transaction.atomic():
+            return super().update(request, *args, **kwargs)
+
+    def destroy(self, request, *args, **kwargs):
+        with transaction.atomic():
+            return super().destroy(request, *args, **kwargs)
+
+
+# ─────────────────────────────
+# Sparse fieldsets (?fields= / ?expand=)
+# ─────────────────────────────
+class SparseFieldsetMixin:
+    """
+    Dopasowuje queryset do pól, które serializer faktycznie zwróci.
+
+    - `field_select_related` / `field_prefetch_related`: pole serializera ->
+      relacje potrzebne do jego wyrenderowania (lista albo callable),
+      dociągane tylko gdy pole jest w odpowiedzi,
+    - rozwijane pola (`?expand=`) biorą relacje z `Meta.expandable_fields`,
+    - przy `?fields=` queryset dostaje `.only()` z kolumnami tych pól.
+    """
+
+    field_select_related = {}
+    field_prefetch_related = {}
+
+    def get_queryset(self):
+        return self.optimize_queryset(super().get_queryset())
+
+    def _serializer_meta(self):
+        return self.get_serializer_class().Meta
+
+    def get_response_fields(self):
+        """Nazwy pól, które trafią do odpowiedzi (po ?fields= i ?expand=)."""
+        meta = self._serializer_meta()
+        names = set(meta.fields)
+        expand = requested_expand(self.request) & set(
+            getattr(meta, "expandable_fields", {})
+        )
+        only = requested_fields(self.request)
+        if only is not None:
+            names &= only
+            expand &= only
+        return names, expand
+
+    def wants_field(self, name):
+        names, expand = self.get_response_fields()
+        return name in names or name in expand
+
+    def optimize_queryset(self, qs):
+        names, expand = self.get_response_fields()
+        expandable = getattr(self._serializer_meta(), "expandable_fields", {})
+
+        select, prefetch = [], []
+        for name in sorted(names):
+            select += _resolve(self.field_select_related.get(name, ()))
+            prefetch += _resolve(self.field_prefetch_related.get(name, ()))
+        for name in sorted(expand):
+            select += expandable[name].get("select_related", [])
+            prefetch += expandable[name].get("prefetch_related", [])
+
+        if select:
+            qs = qs.select_related(*dict.fromkeys(select))
+        if prefetch:
+            qs = qs.prefetch_related(*prefetch)
+        if requested_fields(self.request) is not None:
+            qs = qs.only(*self._only_columns(qs.model, names | expand, select))
+        return qs
+
+    def _only_columns(self, model, names, select):
+        concrete = {f.name for f in model._meta.concrete_fields}
+        columns = {model._meta.pk.name}
+        serializer_fields = self.get_serializer_class()().fields
+        for name in names:
+            field = serializer_fields.get(name)
+            if field is None or field.source == "*":
+                continue
+            head = field.source.split(".")[0]
+            if head in concrete:
+                columns.add(head)
+        for path in select:
+            columns.add(path.split("__")[0])
+        for name in getattr(self, "ordering_fields", None) or ():
+            if name in concrete:
+                columns.add(name)
+        return columns
+
+
+def _resolve(relations):
+    return list(relations() if callable(relations) else relations)
+
+
+def _query_date(request, name, required=True):
+    """Parametr `?name=YYYY-MM-DD`; zły (albo brak wymaganego) -> 400."""
+    raw = request.query_params.get(name)
+    if not raw and not required:
+        return None
+    try:
+        value = parse_date(raw) if raw else None
+    except ValueError:
+        value = None
+    if value is None:
+        raise ValidationError({name: "Expected a date in YYYY-MM-DD format."})
+    return value
+
+
+def _tasks_of(*lookups):
+    """Dla `conditional_related`: taski powiązane z obiektami z querysetu."""
+
+    def related(queryset):
+        ids = queryset.order_by().values("pk")
+        condition = Q()
+        for lookup in lookups:
+            condition |= Q(**{f"{lookup}__in": ids})
+        return Task.objects.filter(condition)
+
+    return related
+
+
 # ─────────────────────────────
 # ViewSety
 # ─────────────────────────────
 
 
-class FundingViewSet(viewsets.ModelViewSet):
+class FundingViewSet(
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    SparseFieldsetMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Funding.objects.all().order_by("-created_at")
     serializer_class = FundingSerializer
     permission_classes = [IsAuthenticated]
-    search_fields = ["name", "funder", "program", "agreement_number", "description"]
+    # Pełnotekstowo po `search_vector`, podciągowo po krótkich polach.
+    search_vector_field = "search_vector"
+    search_fields = ["name", "agreement_number"]
     ordering_fields = ["created_at", "start_date", "end_date", "amount_total", "name"]
     ordering = ["-created_at"]
+    field_prefetch_related = {"tasks": FundingSerializer.task_prefetches}
+    conditional_related = {"tasks": _tasks_of("scope__funding")}
+    cache_models = (Funding, ProjectFunding, Task, TaskScope)
 
     def get_queryset(self):
         qs = super().get_queryset()
@@ -136,13 +354,14 @@ class FundingViewSet(viewsets.ModelViewSet):
         return qs
 
 
-class FundingTaskViewSet(viewsets.ModelViewSet):
-    queryset = FundingTask.objects.select_related("funding").all().order_by("id")
+class FundingTaskViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
+    queryset = FundingTask.objects.all().order_by("id")
     serializer_class = FundingTaskSerializer
     permission_classes = [IsAuthenticated]
     search_fields = ["title", "description", "funding__name"]
     ordering_fields = ["id", "default_priority", "default_status", "default_due_days"]
     ordering = ["id"]
+    field_select_related = {"funding_name": ["funding"]}
 
     def get_queryset(self):
         qs = super().get_queryset()
@@ -152,13 +371,23 @@ class FundingTaskViewSet(viewsets.ModelViewSet):
         return qs
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(
+    AtomicWriteMixin,
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    SparseFieldsetMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Project.objects.all().order_by("-created_at")
     serializer_class = ProjectSerializer
     permission_classes = [IsAuthenticated]
-    search_fields = ["name", "description", "owner__username"]
+    search_vector_field = "search_vector"
+    search_fields = ["name"]
     ordering_fields = ["created_at", "start_date", "end_date", "name", "status"]
     ordering = ["-created_at"]
+    field_prefetch_related = {"tasks": ProjectSerializer.task_prefetches}
+    conditional_related = {"tasks": _tasks_of("effective_project")}
+    cache_models = (Project, ProjectFunding, Task, TaskScope, User)
 
     def perform_create(self, serializer):
         user = self.request.user
@@ -171,18 +400,163 @@ class ProjectViewSet(viewsets.ModelViewSet):
 
         serializer.save(owner=owner)
 
+    @action(detail=True, methods=["get"])
+    def stats(self, request, pk=None):
+        """
+        Liczniki tasków projektu (wg statusu, po terminie), koszty wg waluty i
+        godziny — z tabeli ProjectStats, bez przeliczania tasków.
+        """
+        project = self.get_object()
+        return Response(ProjectStatsSerializer(get_stats(project=project)).data)
+
+    board_excerpt_length = 160
+
+    def board_column_queryset(self, project, column):
+        return (
+            Task.objects.filter(effective_project_id=project.pk, status=column)
+            .annotate(
+                description_excerpt=Left("description", self.board_excerpt_length)
+            )
+            .only("id", "title", "status", "priority", "due_date", "est_hours")
+            .prefetch_related(
+                Prefetch("assignees", queryset=User.objects.only("id", "username"))
+            )
+        )
+
+    @action(detail=True, methods=["get"])
+    def board(self, request, pk=None):
+        """
+        Tablica Kanban: taski projektu pogrupowane wg statusu, w kolumnie od
+        najwyższego priorytetu. Każda kolumna ma licznik (z ProjectStats) i
+        własny kursor; `?column=<status>&cursor=...` zwraca następną stronę
+        tylko tej kolumny.
+        """
+        project = self.get_object()
+        statuses = self.board_statuses(request)
+        counts = get_stats(project=project)
+        columns = []
+        for status_value, label in statuses:
+            paginator = BoardColumnPagination(status_value)
+            cards = paginator.paginate_queryset(
+                self.board_column_queryset(project, status_value), request
+            )
+            columns.append(
+                self.board_column(paginator, status_value, label, counts, cards)
+            )
+        return Response(self.board_data(request, project, columns))
+
+    def board_statuses(self, request):
+        """(status, etykieta) kolumn odpowiedzi; `?column=` zawęża do jednej."""
+        column = request.query_params.get("column")
+        if column is not None and column not in Task.Status.values:
+            raise ValidationError({"column": f"Unknown status: {column}."})
+        return [
+            (value, label)
+            for value, label in Task.Status.choices
+            if column is None or value == column
+        ]
+
+    def board_column(self, paginator, status_value, label, counts, cards):
+        return {
+            "status": status_value,
+            "label": label,
+            "count": getattr(counts, STATUS_FIELDS[status_value]),
+            "next": paginator.get_next_link(),
+            "previous": paginator.get_previous_link(),
+            "results": TaskCardSerializer(cards, many=True).data,
+        }
+
+    def board_data(self, request, project, columns):
+        if request.query_params.get("column") is not None:
+            return columns[0]
+        return {"project": project.pk, "columns": columns}
+
+    @action(detail=True, methods=["get"])
+    def timeline(self, request, pk=None):
+        """
+        Taski projektu z oboma datami, których przedział [start_date, due_date]
+        nachodzi na okno `?from=&to=` (maks. TIMELINE_MAX_DAYS dni). Wiersze to
+        tablice w kolejności `columns`; taski bez dat są w osobnym,
+        stronicowanym koszyku `timeline/unscheduled/`.
+        """
+        project = self.get_object()
+        start, end = self.timeline_window(request)
+        rows = to_rows(scheduled_tasks(project.pk, start, end))
+        return Response(self.timeline_data(request, project, start, end, rows))
+
+    def timeline_window(self, request):
+        """Okno `?from=&to=` po walidacji."""
+        start = _query_date(request, "from")
+        end = _query_date(request, "to")
+        if start > end:
+            raise ValidationError({"to": "Must not be earlier than `from`."})
+        if (end - start).days > TIMELINE_MAX_DAYS:
+            raise ValidationError(
+                {"to": f"Window may span at most {TIMELINE_MAX_DAYS} days."}
+            )
+        return start, end
+
+    def timeline_data(self, request, project, start, end, rows):
+        return {
+            "project": project.pk,
+            "from": start,
+            "to": end,
+            "columns": TIMELINE_COLUMNS,
+            "rows": rows,
+            "unscheduled": reverse(
+                "project-timeline-unscheduled",
+                args=[project.pk],
+                request=request,
+            ),
+        }
 
-class ProjectFundingViewSet(viewsets.ModelViewSet):
-    queryset = (
-        ProjectFunding.objects.select_related("project", "funding")
-        .all()
-        .order_by("-created_at")
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="timeline/unscheduled",
+        url_name="timeline-unscheduled",
+    )
+    def timeline_unscheduled(self, request, pk=None):
+        project = self.get_object()
+        paginator = KeysetPagination()
+        tasks = paginator.paginate_queryset(unscheduled_tasks(project.pk), request)
+        response = paginator.get_paginated_response(to_rows(tasks))
+        response.data["columns"] = TIMELINE_COLUMNS
+        return response
+
+    @action(
+        detail=True,
+        methods=["get"],
+        renderer_classes=[EventStreamRenderer, JSONRenderer],
     )
+    def events(self, request, pk=None):
+        """
+        Strumień Server-Sent Events ze zmianami tasków projektu
+        (`task.created|updated|deleted`, tylko zmienione pola + wersja).
+        Wznawia po `Last-Event-ID` (albo `?last_event_id=`); gdy tych zdarzeń
+        już nie ma, wysyła `reset` — klient ma wtedy pobrać dane od nowa.
+        Tylko pod ASGI: pod WSGI strumień zająłby wątek na całe połączenie.
+        """
+        project = self.get_object()
+        broker = get_broker()
+        if broker is None:
+            raise NotFound("Live events are disabled.")
+        if not isinstance(request._request, ASGIRequest):
+            raise NotFound("Live events require the ASGI server (core.asgi).")
+        return stream_response(broker, channel_name(project.pk), last_event_id(request))
+
+
+class ProjectFundingViewSet(
+    AtomicWriteMixin, ConditionalGetMixin, SparseFieldsetMixin, viewsets.ModelViewSet
+):
+    queryset = ProjectFunding.objects.all().order_by("-created_at")
     serializer_class = ProjectFundingSerializer
     permission_classes = [IsAuthenticated]
     search_fields = ["project__name", "funding__name", "note"]
     ordering_fields = ["created_at", "allocation_start", "allocation_end", "is_primary"]
     ordering = ["-created_at"]
+    field_prefetch_related = {"tasks": ProjectFundingSerializer.task_prefetches}
+    conditional_related = {"tasks": _tasks_of("scope__project_funding")}
 
     def get_queryset(self):
         qs = super().get_queryset()
@@ -194,19 +568,61 @@ class ProjectFundingViewSet(viewsets.ModelViewSet):
             qs = qs.filter(funding_id=funding_id)
         return qs
 
+    def destroy(self, request, *args, **kwargs):
+        """
+        Odpięcie finansowania: najpierw usuwamy wygenerowane taski partiami,
+        potem sam ProjectFunding. `?defer=1` -> zlecamy to workerowi
+        (`manage.py run_cleanup_jobs`) i od razu zwracamy 202 z postępem.
+        """
+        instance = self.get_object()
+        if blocking_tasks_exist(instance.pk):
+            raise ValidationError(
+                "ProjectFunding has manually scoped tasks; move or delete them first."
+            )
 
-class TaskViewSet(viewsets.ModelViewSet):
-    queryset = (
-        Task.objects.all()
-        .order_by("-created_at")
-        .select_related("template")
-        .prefetch_related(
-            "assignees", "scope__project", "scope__funding", "scope__project_funding"
+        if request.query_params.get("defer") in ("1", "true", "True"):
+            job = schedule_cleanup(instance)
+            return Response(
+                ProjectFundingCleanupSerializer(job).data,
+                status=status.HTTP_202_ACCEPTED,
+            )
+
+        unlink_project_funding(instance)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @action(detail=True, methods=["get"])
+    def stats(self, request, pk=None):
+        project_funding = self.get_object()
+        return Response(
+            ProjectStatsSerializer(get_stats(project_funding=project_funding)).data
         )
-    )
+
+
+class ProjectFundingCleanupViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Podgląd postępu odroczonego odpinania finansowań.
+    """
+
+    queryset = ProjectFundingCleanup.objects.all()
+    serializer_class = ProjectFundingCleanupSerializer
+    permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ["project_funding", "status"]
+
+
+class TaskViewSet(
+    AtomicWriteMixin,
+    ConditionalGetMixin,
+    CachedResponseMixin,
+    KeysetPaginationMixin,
+    SparseFieldsetMixin,
+    viewsets.ModelViewSet,
+):
+    queryset = Task.objects.all().order_by("-created_at")
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated]
-    search_fields = ["title", "description"]
+    search_vector_field = "search_vector"
+    search_fields = ["title"]
     ordering_fields = [
         "created_at",
         "updated_at",
@@ -216,6 +632,35 @@ class TaskViewSet(viewsets.ModelViewSet):
         "title",
     ]
     ordering = ["-created_at"]
+    # project_name / funding_name pochodzą z powiązanych obiektów.
+    conditional_timestamps = (
+        "updated_at",
+        "scope__project__updated_at",
+        "scope__funding__updated_at",
+    )
+    cache_models = (
+        Task,
+        TaskScope,
+        TaskAssignment,
+        Project,
+        Funding,
+        ProjectFunding,
+        User,
+        UserProfile,
+    )
+    cached_actions = ("list",)
+    field_select_related = {
+        "scope_project": ["scope"],
+        "scope_funding": ["scope"],
+        "scope_project_funding": ["scope"],
+        "project_name": ["scope__project"],
+        "funding_name": ["scope__funding"],
+    }
+    field_prefetch_related = {
+        "assignees": lambda: [
+            Prefetch("assignees", queryset=User.objects.select_related("profile"))
+        ],
+    }
 
     def get_queryset(self):
         qs = super().get_queryset()
@@ -227,15 +672,9 @@ class TaskViewSet(viewsets.ModelViewSet):
         status_ = self.request.query_params.get("status")
 
         if project_id:
-            qs = qs.filter(
-                Q(scope__project_id=project_id)
-                | Q(scope__project_funding__project_id=project_id)
-            )
+            qs = qs.filter(effective_project_id=project_id)
         if funding_id:
-            qs = qs.filter(
-                Q(scope__funding_id=funding_id)
-                | Q(scope__project_funding__funding_id=funding_id)
-            )
+            qs = qs.filter(effective_funding_id=funding_id)
         if project_funding_id:
             qs = qs.filter(scope__project_funding_id=project_funding_id)
         if unassigned in ("1", "true", "True"):
@@ -248,43 +687,199 @@ class TaskViewSet(viewsets.ModelViewSet):
             qs = qs.filter(status=status_)
         return qs
 
-
-class TaskAssignmentViewSet(viewsets.ModelViewSet):
-    queryset = TaskAssignment.objects.select_related(
-        "task",
-        "user",
-        "assigned_by",
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        """
+        Hurtowe create/update/delete tasków w jednej transakcji.
+        Błędy -> 400 z listami błędów per pozycja, nic nie zostaje zapisane.
+        """
+        writer = TaskBulkWriter(request.data, context=self.get_serializer_context())
+        if not writer.is_valid():
+            return Response(writer.errors, status=status.HTTP_400_BAD_REQUEST)
+        return Response(writer.save(), status=status.HTTP_200_OK)
+
+    @action(
+        detail=False,
+        methods=["get"],
+        renderer_classes=[CSVRenderer, NDJSONRenderer],
     )
+    def export(self, request):
+        """
+        Pełny eksport tasków (`?format=csv|ndjson`) z tymi samymi filtrami co
+        lista, razem z kosztami, rachunkami, osobami i przepracowanymi
+        godzinami. Strumieniowany kursorem po stronie serwera, bez paginacji.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        return export_response(queryset, request.accepted_renderer.format)
+
+
+class TaskAssignmentViewSet(
+    AtomicWriteMixin, SparseFieldsetMixin, viewsets.ModelViewSet
+):
+    queryset = TaskAssignment.objects.all()
     serializer_class = TaskAssignmentSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ["task", "user"]
+    field_select_related = {
+        "user_detail": ["user__profile"],
+        "assigned_by_username": ["assigned_by"],
+    }
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        """
+        Przypisania hurtowe: `{"tasks": [..], "users": [..], "mode": "add"}`.
+        Jeden DELETE i/lub jeden INSERT niezależnie od liczby par.
+        """
+        serializer = TaskAssignmentBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        task_ids, user_ids, mode = data["tasks"], data["users"], data["mode"]
+        assigned_by = request.user if request.user.is_authenticated else None
+
+        with transaction.atomic():
+            if mode == "add":
+                add_assignees(task_ids, user_ids, assigned_by=assigned_by)
+            elif mode == "remove":
+                remove_assignees(task_ids, user_ids)
+            else:
+                sync_assignees(
+                    {task_id: user_ids for task_id in task_ids},
+                    assigned_by=assigned_by,
+                )
+
+        return Response({"mode": mode, "tasks": task_ids, "users": user_ids})
+
+
+class TaskImportViewSet(mixins.CreateModelMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Import tasków z pliku CSV/XLSX (multipart, pole `file`). Kolumny: title,
+    description, status, priority, start_date, due_date, cost_amount,
+    cost_currency, receipt_url, receipt_note, est_hours, project i funding
+    (id albo nazwa; oba naraz -> ich ProjectFunding), assignees (loginy).
+    Błędne wiersze lądują w `errors`, reszta się importuje. `?defer=1` ->
+    import robi worker (`manage.py import_tasks --queue`), a odpowiedź 202
+    pozwala śledzić postęp pod `/api/task-imports/{id}/`.
+    """
 
+    queryset = TaskImport.objects.all()
+    serializer_class = TaskImportSerializer
+    permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ["status", "created_by"]
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        upload = serializer.validated_data["file"]
+        try:
+            job = create_import(upload, upload.name, created_by=request.user)
+        except ImportFormatError as exc:
+            raise ValidationError({"file": [str(exc)]})
+
+        if request.query_params.get("defer") in ("1", "true", "True"):
+            return Response(
+                self.get_serializer(job).data, status=status.HTTP_202_ACCEPTED
+            )
 
-class UserViewSet(viewsets.ReadOnlyModelViewSet):
+        try:
+            run_import(job)
+        except ImportFormatError as exc:
+            raise ValidationError({"file": [str(exc)]})
+        return Response(self.get_serializer(job).data, status=status.HTTP_201_CREATED)
+
+
+class UserViewSet(
+    CachedResponseMixin, SparseFieldsetMixin, viewsets.ReadOnlyModelViewSet
+):
     """
     Do listy userów i szczegółów (karta usera).
     """
 
     permission_classes = [IsAuthenticated]
+    queryset = User.objects.all().order_by("id")
+    field_select_related = {"profile": ["profile"]}
+    # Liczniki czytamy z UserWorkload (api.workload), a lista zadań usera
+    # zależy od tasków, scope'ów i przypisań.
+    cache_models = (User, UserProfile, UserWorkload, Task, TaskScope, TaskAssignment)
+    cached_actions = ("list", "retrieve", "tasks")
+
+    # pole serializera -> wyrażenie na wierszu UserWorkload
+    WORKLOAD_FIELDS = {
+        "tasks_count": F("workload__todo_count")
+        + F("workload__doing_count")
+        + F("workload__done_count"),
+        "done_tasks_count": F("workload__done_count"),
+        "open_tasks_count": F("workload__todo_count") + F("workload__doing_count"),
+        "overdue_tasks_count": F("workload__overdue_count"),
+        "worked_hours": F("workload__worked_hours"),
+    }
 
     def get_queryset(self):
-        qs = (
-            User.objects.all()
-            .select_related("profile")
-            .annotate(
-                tasks_count=Count("tasks", distinct=True),
-                done_tasks_count=Count(
-                    "tasks",
-                    filter=Q(tasks__status=Task.Status.DONE),
-                    distinct=True,
-                ),
-            )
-            .order_by("id")
-        )
+        """
+        Liczniki to zwykły odczyt jednego wiersza UserWorkload na usera (LEFT
+        JOIN po unikalnym indeksie), bez GROUP BY po przypisaniach.
+        """
+        qs = super().get_queryset()
+        if self.wants_field("overdue_tasks_count"):
+            refresh_overdue()
+        for name, expression in self.WORKLOAD_FIELDS.items():
+            if self.wants_field(name):
+                zero = Value(ZERO) if name == "worked_hours" else Value(0)
+                qs = qs.annotate(**{name: Coalesce(expression, zero)})
         return qs
 
     def get_serializer_class(self):
         if self.action == "retrieve":
             return UserDetailSerializer
         return UserSerializer
+
+    @action(detail=True, methods=["get"])
+    def tasks(self, request, pk=None):
+        """
+        Zadania usera (z jego przypisań), od najnowszego przypisania, z
+        paginacją kursorową po indeksie `(user, assigned_at, id)`. Filtry:
+        `?status=todo,doing`, `?project=<id>` (efektywny projekt),
+        `?due_from=` / `?due_to=` (YYYY-MM-DD, włącznie).
+        """
+        return self._cached(self._tasks, request, pk=pk)
+
+    def _tasks(self, request, pk=None):
+        user = get_object_or_404(User.objects.only("pk"), pk=pk)
+        params = request.query_params
+        qs = (
+            TaskAssignment.objects.filter(user=user)
+            .select_related("task")
+            .annotate(
+                scope_project_id=F("task__scope__project_id"),
+                scope_funding_id=F("task__scope__funding_id"),
+                scope_project_funding_id=F("task__scope__project_funding_id"),
+            )
+        )
+
+        statuses = [v for v in params.get("status", "").split(",") if v]
+        unknown = sorted(set(statuses) - set(Task.Status.values))
+        if unknown:
+            raise ValidationError({"status": f"Unknown status: {', '.join(unknown)}."})
+        if statuses:
+            qs = qs.filter(task__status__in=statuses)
+
+        project_id = params.get("project")
+        if project_id:
+            if not project_id.isdigit():
+                raise ValidationError({"project": "Expected a project id."})
+            qs = qs.filter(task__effective_project_id=project_id)
+
+        due_from = _query_date(request, "due_from", required=False)
+        due_to = _query_date(request, "due_to", required=False)
+        if due_from:
+            qs = qs.filter(task__due_date__gte=due_from)
+        if due_to:
+            qs = qs.filter(task__due_date__lte=due_to)
+
+        paginator = UserTaskPagination()
+        rows = paginator.paginate_queryset(qs, request)
+        return paginator.get_paginated_response(
+            UserTaskSerializer(rows, many=True).data
+        )
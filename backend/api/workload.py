@@ -0,0 +1,232 @@
+"""Przyrostowe utrzymanie UserWorkload."""
+
+from __future__ import annotations
+
+from collections import Counter, defaultdict
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Task, TaskAssignment, UserWorkload
+from .response_cache import bump_generation
+from .stats import STATUS_FIELDS, ZERO
+
+User = get_user_model()
+
+ASSIGNMENT_FIELDS = ("user_id", "worked_hours", "task__status", "task__due_date")
+OVERDUE_REFRESHED_KEY = "workload:overdue-refreshed"
+UPDATE_FIELDS = [*STATUS_FIELDS.values(), "overdue_count", "worked_hours", "updated_at"]
+
+
+def collect(task_ids) -> WorkloadDelta:
+    """Wkład wszystkich przypisań podanych tasków."""
+    if not task_ids:
+        return WorkloadDelta()
+    return delta_of(
+        TaskAssignment.objects.filter(task_id__in=list(task_ids)).values(
+            *ASSIGNMENT_FIELDS
+        )
+    )
+
+
+def delta_of(rows) -> WorkloadDelta:
+    """Wkład przypisań podanych jako wiersze ``ASSIGNMENT_FIELDS``."""
+    delta = WorkloadDelta()
+    for row in rows:
+        delta.add_task(
+            [row["user_id"]],
+            {"status": row["task__status"], "due_date": row["task__due_date"]},
+        )
+        delta.add_worked(row["user_id"], row["worked_hours"])
+    return delta
+
+
+class _Bucket:
+    """Oczekująca zmiana jednego wiersza obciążenia."""
+
+    def __init__(self):
+        self.counts = Counter()
+        self.due_dates = []  # (due_date, sign) of open tasks
+        self.worked_hours = ZERO
+
+    def add_task(self, values, sign):
+        status = values["status"]
+        self.counts[status] += sign
+        if status != Task.Status.DONE and values["due_date"]:
+            self.due_dates.append((values["due_date"], sign))
+
+    def merge(self, other, sign):
+        for status, count in other.counts.items():
+            self.counts[status] += sign * count
+        self.due_dates += [(due, sign * s) for due, s in other.due_dates]
+        self.worked_hours += sign * other.worked_hours
+
+    def is_empty(self):
+        due = Counter()
+        for date, sign in self.due_dates:
+            due[date] += sign
+        return (
+            not any(self.counts.values())
+            and not any(due.values())
+            and not self.worked_hours
+        )
+
+    def apply_to(self, row: UserWorkload):
+        for status, count in self.counts.items():
+            field = STATUS_FIELDS.get(status)
+            if field:
+                setattr(row, field, getattr(row, field) + count)
+        for due, sign in self.due_dates:
+            if due < row.overdue_as_of:
+                row.overdue_count += sign
+        row.worked_hours += self.worked_hours
+
+
+class WorkloadDelta:
+    """Zebrane zmiany obciążenia dowolnej liczby użytkowników."""
+
+    def __init__(self):
+        self.buckets = defaultdict(_Bucket)
+
+    def add_task(self, user_ids, values, sign=1):
+        if values is None:
+            return
+        for user_id in user_ids:
+            self.buckets[user_id].add_task(values, sign)
+
+    def add_worked(self, user_id, hours, sign=1):
+        if hours:
+            self.buckets[user_id].worked_hours += sign * Decimal(hours)
+
+    def __sub__(self, other: WorkloadDelta) -> WorkloadDelta:
+        result = WorkloadDelta()
+        for user_id, bucket in self.buckets.items():
+            result.buckets[user_id].merge(bucket, 1)
+        for user_id, bucket in other.buckets.items():
+            result.buckets[user_id].merge(bucket, -1)
+        return result
+
+    def __neg__(self) -> WorkloadDelta:
+        return WorkloadDelta() - self
+
+    def apply(self):
+        """Zapisuje zmiany; brakujące wiersze są przeliczane."""
+        pending = {
+            user_id: bucket
+            for user_id, bucket in self.buckets.items()
+            if not bucket.is_empty()
+        }
+        if not pending:
+            return
+        # One locking SELECT and one UPDATE for all rows, however many users
+        # the write touched; no savepoint, a failure aborts the caller anyway.
+        with transaction.atomic(savepoint=False):
+            rows = {
+                row.user_id: row
+                for row in UserWorkload.objects.select_for_update()
+                .filter(user_id__in=pending)
+                .order_by("pk")
+            }
+            now = timezone.now()
+            for user_id, row in rows.items():
+                pending[user_id].apply_to(row)
+                row.updated_at = now
+            UserWorkload.objects.bulk_update(rows.values(), UPDATE_FIELDS)
+            # Called after the write, so a rebuild already includes it.
+            recompute_workload(set(pending) - set(rows))
+        bump_generation(UserWorkload)
+
+
+# ---------- rebuild ----------
+
+
+def create_empty_workload(user):
+    """Wyzerowany wiersz dla właśnie utworzonego użytkownika."""
+    return UserWorkload.objects.create(user=user, overdue_as_of=timezone.localdate())
+
+
+def _overdue_q(today, prefix=""):
+    return ~Q(**{f"{prefix}status": Task.Status.DONE}) & Q(
+        **{f"{prefix}due_date__lt": today}
+    )
+
+
+def recompute_workload(user_ids):
+    """Przelicza od zera obciążenie podanych użytkowników."""
+    today = timezone.localdate()
+    user_ids = list(user_ids)
+    if not user_ids:
+        return
+    ids = list(User.objects.filter(pk__in=user_ids).values_list("pk", flat=True))
+    if not ids:
+        return
+    totals = {
+        pk: {
+            **{field: 0 for field in STATUS_FIELDS.values()},
+            "overdue_count": 0,
+            "overdue_as_of": today,
+            "worked_hours": ZERO,
+        }
+        for pk in ids
+    }
+    counts = {
+        field: Count("pk", filter=Q(task__status=status))
+        for status, field in STATUS_FIELDS.items()
+    }
+    for row in (
+        TaskAssignment.objects.filter(user_id__in=ids)
+        .order_by()
+        .values("user_id")
+        .annotate(
+            **counts,
+            overdue_count=Count("pk", filter=_overdue_q(today, "task__")),
+            worked_total=Sum("worked_hours"),
+        )
+    ):
+        entry = totals[row["user_id"]]
+        for field in (*STATUS_FIELDS.values(), "overdue_count"):
+            entry[field] = row[field]
+        entry["worked_hours"] = row["worked_total"] or ZERO
+
+    fields = list(next(iter(totals.values())))
+    UserWorkload.objects.bulk_create(
+        [UserWorkload(user_id=pk, **values) for pk, values in totals.items()],
+        update_conflicts=True,
+        unique_fields=["user"],
+        update_fields=[*fields, "updated_at"],
+    )
+    bump_generation(UserWorkload)
+
+
+# ---------- read ----------
+
+
+def refresh_overdue():
+    """Przelicza `overdue_count` wierszy sprzed dzisiaj (raz dziennie, jeden UPDATE)."""
+    today = timezone.localdate()
+    if cache.get(OVERDUE_REFRESHED_KEY) == today.isoformat():
+        return 0
+    overdue = (
+        TaskAssignment.objects.filter(user_id=OuterRef("user_id"))
+        .filter(_overdue_q(today, "task__"))
+        .order_by()
+        .values("user_id")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    updated = UserWorkload.objects.filter(overdue_as_of__lt=today).update(
+        overdue_count=Coalesce(
+            Subquery(overdue, output_field=IntegerField()), Value(0)
+        ),
+        overdue_as_of=today,
+        updated_at=timezone.now(),
+    )
+    if updated:
+        bump_generation(UserWorkload)
+    cache.set(OVERDUE_REFRESHED_KEY, today.isoformat(), 24 * 60 * 60)
+    return updated
@@ -30,6 +30,11 @@ SECRET_KEY = os.getenv("SECRET_KEY", "dev-insecure")  # w DEV może mieć fallba
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = os.getenv("DEBUG", "True") == "True"
 
+# Nagłówki Server-Timing (zapytania/DB, serializery, sygnały) i opcjonalnie
+# jedna linia JSON na request w loggerze "api.timing" (api/timing.py).
+API_SERVER_TIMING = os.getenv("API_SERVER_TIMING", str(DEBUG)) == "True"
+API_SERVER_TIMING_LOG = os.getenv("API_SERVER_TIMING_LOG", "False") == "True"
+
 # ALLOWED_HOSTS z CSV -> lista
 ALLOWED_HOSTS = os.getenv("ALLOWED_HOSTS", "127.0.0.1,localhost").split(",")
 
@@ -43,6 +48,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "corsheaders",
     "api.apps.ApiConfig",
@@ -51,11 +57,13 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
+    "api.timing.ServerTimingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "api.replicas.ReplicaMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -68,11 +76,11 @@ REST_FRAMEWORK = {
         "rest_framework.authentication.SessionAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "api.pagination.StandardPageNumberPagination",
     "PAGE_SIZE": 20,
     "DEFAULT_FILTER_BACKENDS": (
-        "rest_framework.filters.SearchFilter",
-        "rest_framework.filters.OrderingFilter",
+        "api.search.RankedSearchFilter",
+        "api.search.RankedOrderingFilter",
     ),
 }
 
@@ -142,6 +150,82 @@ DATABASES = {
     }
 }
 
+# Repliki do odczytu (api/replicas.py): DB_REPLICA_HOSTS="host[:port],..." —
+# ta sama baza i użytkownik co "default". Odczyty (GET/HEAD/OPTIONS) viewsetów
+# API idą na losową działającą replikę; po udanym zapisie klient dostaje
+# cookie, które przez API_REPLICA_STICKY_SECONDS trzyma go na primary. Replika,
+# do której nie da się połączyć, jest pomijana przez API_REPLICA_RETRY_SECONDS.
+API_READ_REPLICAS = []
+_replica_hosts = [h.strip() for h in os.getenv("DB_REPLICA_HOSTS", "").split(",")]
+for _i, _host in enumerate(filter(None, _replica_hosts), start=1):
+    _host, _, _port = _host.partition(":")
+    _alias = f"replica{_i}"
+    DATABASES[_alias] = {
+        **DATABASES["default"],
+        "HOST": _host,
+        "PORT": _port or DATABASES["default"]["PORT"],
+        "OPTIONS": {"connect_timeout": int(os.getenv("DB_REPLICA_TIMEOUT", "2"))},
+        # Testy czytają z tej samej bazy testowej co "default".
+        "TEST": {"MIRROR": "default"},
+    }
+    API_READ_REPLICAS.append(_alias)
+
+DATABASE_ROUTERS = ["api.replicas.ReplicaRouter"]
+API_REPLICA_STICKY_SECONDS = int(os.getenv("API_REPLICA_STICKY_SECONDS", "15"))
+API_REPLICA_RETRY_SECONDS = int(os.getenv("API_REPLICA_RETRY_SECONDS", "30"))
+API_REPLICA_PIN_COOKIE = "api_read_primary_until"
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# DEV/testy: locmem (per proces). PROD: ustaw REDIS_URL, żeby wszystkie
+# workery współdzieliły cache i liczniki generacji (api/response_cache.py).
+# Rozmiar ogranicza MAX_ENTRIES (locmem) albo maxmemory + allkeys-lru (Redis).
+# Cache odpowiedzi API domyślnie działa tylko z Redisem albo z DEBUG; włączony
+# na locmem bez DEBUG zatrzymuje start aplikacji (każdy worker miałby własne
+# generacje i nie widziałby zapisów pozostałych).
+
+API_CACHE_TIMEOUT = int(os.getenv("API_CACHE_TIMEOUT", "300"))
+_response_cache = bool(os.getenv("REDIS_URL")) or DEBUG
+API_RESPONSE_CACHE = os.getenv("API_RESPONSE_CACHE", str(_response_cache)) == "True"
+
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+            "TIMEOUT": API_CACHE_TIMEOUT,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "TIMEOUT": API_CACHE_TIMEOUT,
+            "OPTIONS": {
+                "MAX_ENTRIES": int(os.getenv("API_CACHE_MAX_ENTRIES", "5000")),
+            },
+        }
+    }
+
+
+# Zdarzenia na żywo (api/events.py, /api/projects/{id}/events/)
+# Z REDIS_URL zdarzenia idą przez cache, więc widzą je wszystkie workery.
+# InMemoryBroker działa w obrębie jednego procesu — tylko z DEBUG (runserver,
+# testy); bez DEBUG taki broker zatrzymuje start aplikacji. Pusty
+# API_EVENTS_BROKER (domyślnie bez Redisa i DEBUG) wyłącza publikowanie,
+# a endpoint strumienia zwraca 404. Strumień działa tylko pod ASGI (core.asgi).
+
+_events_broker = ""
+if os.getenv("REDIS_URL"):
+    _events_broker = "api.events.CacheBroker"
+elif DEBUG:
+    _events_broker = "api.events.InMemoryBroker"
+API_EVENTS_BROKER = os.getenv("API_EVENTS_BROKER", _events_broker)
+API_EVENTS_BUFFER = int(os.getenv("API_EVENTS_BUFFER", "1000"))
+API_EVENTS_KEEPALIVE_SECONDS = int(os.getenv("API_EVENTS_KEEPALIVE_SECONDS", "15"))
+API_EVENTS_STREAM_SECONDS = int(os.getenv("API_EVENTS_STREAM_SECONDS", "300"))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -179,6 +263,11 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 
+# Pliki importu tasków (api.TaskImport) — trzymane do końca importu, żeby
+# przerwany import dało się wznowić.
+MEDIA_URL = "media/"
+MEDIA_ROOT = Path(os.getenv("MEDIA_ROOT", BASE_DIR / "media"))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
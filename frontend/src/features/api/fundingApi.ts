@@ -114,7 +114,7 @@ export const fundingsApi = createApi({
     // LEKKI PICK (do selectów)
     pickFundings: b.query<{ id: number; name: string }[], void>({
       query: () => ({
-        url: "/api/fundings/?ordering=name&page_size=100",
+        url: "/api/fundings/?ordering=name&page_size=100&fields=id,name",
         method: "GET",
       }),
       transformResponse: (
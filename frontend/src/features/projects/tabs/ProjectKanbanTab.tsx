@@ -9,12 +9,14 @@ import { useDispatch } from "react-redux";
 import type { AppDispatch } from "../../../app/store";
 import { useProject } from "../context/ProjectContext";
 import {
-  useListTasksQuery,
+  useGetProjectBoardQuery,
+  useLazyGetBoardColumnPageQuery,
   useUpdateTaskMutation,
   useCreateTaskMutation,
   tasksApi,
+  type BoardCard,
 } from "../../tasks/tasksApi";
-import type { Task } from "../../tasks/types";
+import { useProjectTaskEvents } from "../../tasks/useProjectTaskEvents";
 import toast from "react-hot-toast";
 import "./ProjectKanban.css";
 import AddTaskModal from "../../tasks/components/AddTaskModal";
@@ -176,13 +178,54 @@ export default function ProjectKanbanTab() {
   const [selectedPriorities, setSelectedPriorities] = useState<Priority[]>([]);
   const [openAdd, setOpenAdd] = useState(false);
 
-  const queryArg = useMemo(
-    () => ({ project: project.id, ordering: "-priority" as const }),
-    [project.id]
+  // Serwer grupuje taski wg statusu (od najwyższego priorytetu) i stronicuje
+  // każdą kolumnę osobno; liczniki kolumn też przychodzą z serwera. Zmiany
+  // innych użytkowników przychodzą strumieniem zdarzeń i łatają cache; pobranie
+  // przy montowaniu zostaje, bo strumienia może nie być (404) albo mógł się
+  // zerwać, gdy zakładka była zamknięta.
+  const { data, isLoading, isFetching } = useGetProjectBoardQuery(project.id, {
+    refetchOnMountOrArgChange: true,
+  });
+  useProjectTaskEvents(project.id);
+  const [fetchColumnPage, { isFetching: isFetchingMore }] =
+    useLazyGetBoardColumnPageQuery();
+
+  const tasks = useMemo(
+    () => (data?.columns ?? []).flatMap((c) => c.results),
+    [data]
   );
-  const { data, isLoading, isFetching } = useListTasksQuery(queryArg);
 
-  const tasks = useMemo(() => data?.results ?? [], [data]);
+  const columnMeta = useMemo(() => {
+    const meta: Record<ColKey, { count: number; next: string | null }> = {
+      todo: { count: 0, next: null },
+      doing: { count: 0, next: null },
+      done: { count: 0, next: null },
+    };
+    for (const c of data?.columns ?? []) {
+      meta[asColKey(c.status)] = { count: c.count, next: c.next };
+    }
+    return meta;
+  }, [data]);
+
+  async function loadMore(col: ColKey) {
+    const url = columnMeta[col].next;
+    if (!url) return;
+    try {
+      const page = await fetchColumnPage(url).unwrap();
+      dispatch(
+        tasksApi.util.updateQueryData("getProjectBoard", project.id, (draft) => {
+          const column = draft.columns.find((c) => c.status === col);
+          if (!column) return;
+          const known = new Set(column.results.map((t) => t.id));
+          column.results.push(...page.results.filter((t) => !known.has(t.id)));
+          column.next = page.next;
+          column.count = page.count;
+        })
+      );
+    } catch {
+      toast.error("Nie udało się wczytać kolejnych zadań.");
+    }
+  }
 
   const filtered = useMemo(() => {
     const q = search.trim().toLowerCase();
@@ -209,7 +252,7 @@ export default function ProjectKanbanTab() {
       return;
     }
 
-    const byId = new Map<number, Task>();
+    const byId = new Map<number, BoardCard>();
     for (const t of tasks) byId.set(t.id, t);
 
     setOrder((prev) => {
@@ -247,12 +290,12 @@ export default function ProjectKanbanTab() {
   }, [tasks, project.id]);
 
   const board = useMemo(() => {
-    const byId = new Map<number, Task>();
+    const byId = new Map<number, BoardCard>();
     for (const t of filtered) byId.set(t.id, t);
 
     const build = (col: ColKey) => {
       const ids = order[col];
-      const out: Task[] = [];
+      const out: BoardCard[] = [];
 
       for (const id of ids) {
         const t = byId.get(id);
@@ -321,11 +364,16 @@ export default function ProjectKanbanTab() {
 
     if (statusChanged) {
       patch = dispatch(
-        tasksApi.util.updateQueryData("listTasks", queryArg, (draft) => {
-          const items = draft?.results ?? [];
-          const idx = items.findIndex((t) => t.id === taskId);
+        tasksApi.util.updateQueryData("getProjectBoard", project.id, (draft) => {
+          const src = draft.columns.find((c) => c.status === srcCol);
+          const dst = draft.columns.find((c) => c.status === dstCol);
+          if (!src || !dst) return;
+          const idx = src.results.findIndex((t) => t.id === taskId);
           if (idx === -1) return;
-          items[idx] = { ...items[idx], status: dstCol };
+          const [card] = src.results.splice(idx, 1);
+          dst.results.push({ ...card, status: dstCol });
+          src.count -= 1;
+          dst.count += 1;
         })
       );
     }
@@ -428,18 +476,30 @@ export default function ProjectKanbanTab() {
                 title={STATUS_LABEL_PL.todo}
                 droppableId="todo"
                 tasks={board.todo}
+                count={columnMeta.todo.count}
+                hasMore={columnMeta.todo.next !== null}
+                loadingMore={isFetchingMore}
+                onLoadMore={() => loadMore("todo")}
               />,
               <Column
                 key="doing"
                 title={STATUS_LABEL_PL.doing}
                 droppableId="doing"
                 tasks={board.doing}
+                count={columnMeta.doing.count}
+                hasMore={columnMeta.doing.next !== null}
+                loadingMore={isFetchingMore}
+                onLoadMore={() => loadMore("doing")}
               />,
               <Column
                 key="done"
                 title={STATUS_LABEL_PL.done}
                 droppableId="done"
                 tasks={board.done}
+                count={columnMeta.done.count}
+                hasMore={columnMeta.done.next !== null}
+                loadingMore={isFetchingMore}
+                onLoadMore={() => loadMore("done")}
               />,
             ]}
           </ResizableKanbanGrid>
@@ -459,16 +519,24 @@ function Column({
   title,
   droppableId,
   tasks,
+  count,
+  hasMore,
+  loadingMore,
+  onLoadMore,
 }: {
   title: string;
   droppableId: ColKey;
-  tasks: Task[];
+  tasks: BoardCard[];
+  count: number;
+  hasMore: boolean;
+  loadingMore: boolean;
+  onLoadMore: () => void;
 }) {
   return (
     <>
       <div className="kanban-col-head">
         <span className="kanban-col-title">{title}</span>
-        <span className="kanban-col-count">{tasks.length}</span>
+        <span className="kanban-col-count">{count}</span>
       </div>
 
       <Droppable droppableId={droppableId}>
@@ -514,6 +582,17 @@ function Column({
             )}
 
             {provided.placeholder}
+
+            {hasMore && (
+              <button
+                type="button"
+                className="kanban-more"
+                onClick={onLoadMore}
+                disabled={loadingMore}
+              >
+                {loadingMore ? "Wczytywanie…" : "Pokaż więcej"}
+              </button>
+            )}
           </div>
         )}
       </Droppable>
@@ -1,6 +1,7 @@
 import { useMemo, useState } from "react";
 import { useProject } from "../context/ProjectContext";
 import { useListTasksQuery } from "../../tasks/tasksApi";
+import { useProjectTaskEvents } from "../../tasks/useProjectTaskEvents";
 import type { Task, TaskStatus, TaskPriority } from "../../tasks/types";
 
 import {
@@ -177,6 +178,7 @@ export default function ProjectOverviewTab() {
     project: project.id,
     ordering: "-created_at",
   });
+  useProjectTaskEvents(project.id);
 
   const tasks: Task[] = useMemo(() => data?.results ?? [], [data]);
   const todayStart = useMemo(() => startOfDay(new Date()), []);
@@ -11,6 +11,7 @@ import {
   tasksApi,
 } from "../../tasks/tasksApi";
 import type { Task, CreateTaskPayload } from "../../tasks/types";
+import { useProjectTaskEvents } from "../../tasks/useProjectTaskEvents";
 import EditTaskModal from "../../tasks/components/EditTaskModal";
 import AddTaskModal from "../../tasks/components/AddTaskModal";
 
@@ -190,6 +191,7 @@ export default function ProjectTimelineTab() {
   const queryArg = useMemo(() => ({ project: project.id }), [project.id]);
 
   const { data, isFetching } = useListTasksQuery(queryArg);
+  useProjectTaskEvents(project.id);
   const tasks: Task[] = useMemo(() => data?.results ?? [], [data]);
 
   const [updateTask] = useUpdateTaskMutation();
@@ -1,6 +1,6 @@
 import { createApi } from "@reduxjs/toolkit/query/react";
 import { axiosBaseQuery } from "../../app/axiosBaseQuery";
-import type { Task, CreateTaskPayload } from "./types";
+import type { Task, CreateTaskPayload, TaskStatus } from "./types";
 
 type Paged<T> = { count: number; next: string | null; previous: string | null; results: T[] };
 export type TasksListParams = {
@@ -16,6 +16,21 @@ export type TasksListParams = {
   priority?: "1" | "2" | "3";
 };
 
+// Tablica Kanban: lekkie karty pogrupowane wg statusu, kursor per kolumna.
+export type BoardCard = Pick<Task, "id" | "title" | "status" | "priority" | "due_date" | "est_hours"> & {
+  description: string;
+  assignees: { id: number; username: string }[];
+};
+export type BoardColumn = {
+  status: TaskStatus;
+  label: string;
+  count: number;
+  next: string | null;
+  previous: string | null;
+  results: BoardCard[];
+};
+export type ProjectBoard = { project: number; columns: BoardColumn[] };
+
 export const tasksApi = createApi({
   reducerPath: "tasksApi",
   baseQuery: axiosBaseQuery(),
@@ -43,10 +58,23 @@ export const tasksApi = createApi({
           : [{ type: "Task" as const, id: "LIST" }],
     }),
 
+    // KANBAN
+    getProjectBoard: b.query<ProjectBoard, number>({
+      query: (projectId) => ({ url: `/api/projects/${projectId}/board/`, method: "GET" }),
+      providesTags: [{ type: "Task", id: "BOARD" }],
+    }),
+    // następna strona jednej kolumny (URL z `next`)
+    getBoardColumnPage: b.query<BoardColumn, string>({
+      query: (url) => ({ url, method: "GET" }),
+    }),
+
     // CREATE
     createTask: b.mutation<Task, CreateTaskPayload>({
       query: (body) => ({ url: "/api/tasks/", method: "POST", data: body }),
-      invalidatesTags: [{ type: "Task", id: "LIST" }],
+      invalidatesTags: [
+        { type: "Task", id: "LIST" },
+        { type: "Task", id: "BOARD" },
+      ],
     }),
 
     // DELETE
@@ -55,7 +83,7 @@ export const tasksApi = createApi({
         url: `/api/tasks/${id}/`,
         method: "DELETE",
       }),
-      invalidatesTags: [{type: "Task", id: "LIST"}],
+      invalidatesTags: [{type: "Task", id: "LIST"}, {type: "Task", id: "BOARD"}],
     }),
     updateTask: b.mutation<Task, {id: number, patch: Partial<CreateTaskPayload>}>({
       query: ({ id, patch}) => ({
@@ -68,12 +96,12 @@ export const tasksApi = createApi({
 
     // LEKKIE LISTY DO SELECTÓW (nazwa + id)
     pickProjects: b.query<{ id: number; name: string }[], void>({
-      query: () => ({ url: "/api/projects/?ordering=name&page_size=100" }),
+      query: () => ({ url: "/api/projects/?ordering=name&page_size=100&fields=id,name" }),
       transformResponse: (data: Paged<{ id: number; name: string }>) => data.results,
       providesTags: ["ProjectPick"],
     }),
     pickFundings: b.query<{ id: number; name: string }[], void>({
-      query: () => ({ url: "/api/fundings/?ordering=name&page_size=100" }),
+      query: () => ({ url: "/api/fundings/?ordering=name&page_size=100&fields=id,name" }),
       transformResponse: (data: Paged<{ id: number; name: string }>) => data.results,
       providesTags: ["FundingPick"],
     }),
@@ -87,4 +115,6 @@ export const {
   usePickFundingsQuery,
   useDeleteTaskMutation,
   useUpdateTaskMutation,
+  useGetProjectBoardQuery,
+  useLazyGetBoardColumnPageQuery,
 } = tasksApi;
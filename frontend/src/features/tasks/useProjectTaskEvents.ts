@@ -0,0 +1,214 @@
+import { useEffect } from "react";
+import { useDispatch, useStore } from "react-redux";
+import type { Store } from "@reduxjs/toolkit";
+import type { AppDispatch, RootState } from "../../app/store";
+import { tasksApi, type BoardCard, type BoardColumn } from "./tasksApi";
+import type { Task, TaskStatus } from "./types";
+
+// Zdarzenia z /api/projects/{id}/events/ (api/events.py): `fields` to pola
+// TaskSerializera — przy `task.created` wszystkie, przy `task.updated` tylko
+// zmienione; `version` to nowe `updated_at`.
+type TaskFields = Partial<Omit<Task, "assignees">> & {
+  assignees?: BoardCard["assignees"];
+};
+type TaskEvent =
+  | {
+      type: "task.created" | "task.updated";
+      task: number;
+      project: number;
+      version: string;
+      fields: TaskFields;
+    }
+  | { type: "task.deleted"; task: number; project: number }
+  | { type: "reset" };
+
+const API_URL = import.meta.env.VITE_API_URL ?? "http://localhost:8000";
+const EXCERPT_LENGTH = 160; // ProjectViewSet.board_excerpt_length
+
+// Ostatnie id per projekt — po ponownym zamontowaniu zakładki strumień
+// zaczyna od miejsca, w którym skończył poprzedni.
+const lastEventIds = new Map<number, string>();
+
+function toCard(id: number, fields: TaskFields, card?: BoardCard): BoardCard {
+  const next = { ...card, id } as BoardCard;
+  for (const key of ["title", "status", "priority", "due_date", "est_hours"] as const) {
+    if (key in fields) (next[key] as unknown) = fields[key];
+  }
+  if (fields.description !== undefined) {
+    next.description = (fields.description ?? "").slice(0, EXCERPT_LENGTH);
+  }
+  if (fields.assignees) next.assignees = fields.assignees;
+  return next;
+}
+
+// Kolejność kolumny jak na serwerze: priorytet malejąco, potem id malejąco.
+function byPriority(a: BoardCard, b: BoardCard) {
+  return b.priority - a.priority || b.id - a.id;
+}
+
+function placeCard(column: BoardColumn, card: BoardCard) {
+  const last = column.results[column.results.length - 1];
+  // Karta za ostatnią wczytaną trafi na jedną z następnych stron.
+  if (column.next && last && byPriority(card, last) > 0) return;
+  column.results.push(card);
+  column.results.sort(byPriority);
+}
+
+/** Łata tablicę; `false`, gdy bez niewczytanej karty nie da się tego zrobić. */
+function patchBoard(draft: { columns: BoardColumn[] }, event: TaskEvent): boolean {
+  if (event.type === "reset") return false;
+  let current: BoardCard | undefined;
+  for (const column of draft.columns) {
+    const i = column.results.findIndex((c) => c.id === event.task);
+    if (i >= 0) [current] = column.results.splice(i, 1);
+  }
+  const columnOf = (status?: TaskStatus) =>
+    draft.columns.find((c) => c.status === status);
+
+  if (event.type === "task.deleted") {
+    const source = columnOf(current?.status);
+    if (source) source.count = Math.max(0, source.count - 1);
+    return !!current;
+  }
+  if (event.type === "task.updated" && !current) {
+    // Karta z dalszej strony kolumny: zmiana statusu albo priorytetu może ją
+    // przenieść między kolumnami lub na wczytaną stronę.
+    return !("status" in event.fields || "priority" in event.fields);
+  }
+  const card = toCard(event.task, event.fields, current);
+  const target = columnOf(card.status);
+  if (!target) return true;
+  if (current?.status !== card.status) {
+    target.count += 1;
+    const source = columnOf(current?.status);
+    if (source) source.count = Math.max(0, source.count - 1);
+  }
+  placeCard(target, card);
+  return true;
+}
+
+function handleEvent(
+  dispatch: AppDispatch,
+  store: Store<RootState>,
+  projectId: number,
+  event: TaskEvent
+) {
+  if (event.type === "reset") {
+    dispatch(
+      tasksApi.util.invalidateTags([
+        { type: "Task", id: "LIST" },
+        { type: "Task", id: "BOARD" },
+      ])
+    );
+    return;
+  }
+
+  let patched = true;
+  dispatch(
+    tasksApi.util.updateQueryData("getProjectBoard", projectId, (draft) => {
+      patched = patchBoard(draft, event);
+    })
+  );
+  if (!patched) {
+    dispatch(tasksApi.util.invalidateTags([{ type: "Task", id: "BOARD" }]));
+  }
+
+  if (event.type !== "task.updated" || event.fields.assignees) {
+    // Listy mają pełne dane osób, a o miejscu nowego taska decyduje
+    // sortowanie i stronicowanie serwera.
+    dispatch(
+      tasksApi.util.invalidateTags([
+        event.type === "task.updated"
+          ? { type: "Task", id: event.task }
+          : { type: "Task", id: "LIST" },
+      ])
+    );
+    return;
+  }
+  const state = store.getState();
+  for (const arg of tasksApi.util.selectCachedArgsForQuery(state, "listTasks")) {
+    if (!arg || arg.project !== projectId) continue;
+    dispatch(
+      tasksApi.util.updateQueryData("listTasks", arg, (draft) => {
+        const task = draft.results.find((t) => t.id === event.task);
+        if (task) Object.assign(task, event.fields, { updated_at: event.version });
+      })
+    );
+  }
+}
+
+// Jeden EventSource na projekt, współdzielony przez zakładki (Kanban,
+// przegląd, oś czasu). Zamykany z opóźnieniem, żeby przełączenie zakładki
+// (odmontowanie jednej, zamontowanie drugiej) nie zrywało strumienia.
+const CLOSE_DELAY_MS = 2000;
+type Connection = {
+  source: EventSource;
+  users: number;
+  closeTimer?: ReturnType<typeof setTimeout>;
+};
+const connections = new Map<number, Connection>();
+
+function connect(dispatch: AppDispatch, store: Store<RootState>, projectId: number) {
+  const url = new URL(`/api/projects/${projectId}/events/`, API_URL);
+  const last = lastEventIds.get(projectId);
+  if (last) url.searchParams.set("last_event_id", last);
+  const source = new EventSource(url, { withCredentials: true });
+  let opened = false;
+  source.onopen = () => {
+    opened = true;
+  };
+  source.onmessage = (message: MessageEvent<string>) => {
+    lastEventIds.set(projectId, message.lastEventId);
+    handleEvent(dispatch, store, projectId, JSON.parse(message.data) as TaskEvent);
+  };
+  source.onerror = () => {
+    // Zerwane połączenie przeglądarka wznawia sama (od Last-Event-ID);
+    // CLOSED = koniec (404 bez ASGI/brokera, błąd serwera). Wtedy kolejna
+    // zakładka spróbuje od nowa, a zmiany od zerwania pobieramy.
+    if (source.readyState !== EventSource.CLOSED) return;
+    if (connections.get(projectId)?.source === source) connections.delete(projectId);
+    if (opened) {
+      dispatch(
+        tasksApi.util.invalidateTags([
+          { type: "Task", id: "LIST" },
+          { type: "Task", id: "BOARD" },
+        ])
+      );
+    }
+  };
+  return source;
+}
+
+function subscribe(dispatch: AppDispatch, store: Store<RootState>, projectId: number) {
+  let connection = connections.get(projectId);
+  if (!connection) {
+    connection = { source: connect(dispatch, store, projectId), users: 0 };
+    connections.set(projectId, connection);
+  }
+  clearTimeout(connection.closeTimer);
+  connection.users += 1;
+
+  const current = connection;
+  return () => {
+    current.users -= 1;
+    if (current.users > 0) return;
+    current.closeTimer = setTimeout(() => {
+      current.source.close();
+      if (connections.get(projectId) === current) connections.delete(projectId);
+    }, CLOSE_DELAY_MS);
+  };
+}
+
+/**
+ * Subskrybuje strumień zdarzeń projektu i łata z niego cache tablicy Kanban
+ * i list tasków projektu zamiast pobierać je od nowa. Nowe/usunięte taski na
+ * listach i zmiany osób unieważniają tylko dotknięte zapytania (kolejność
+ * i strony list liczy serwer). `reset` = zdarzenia przepadły, więc pobieramy
+ * wszystko.
+ */
+export function useProjectTaskEvents(projectId: number) {
+  const dispatch = useDispatch<AppDispatch>();
+  const store = useStore<RootState>();
+
+  useEffect(() => subscribe(dispatch, store, projectId), [dispatch, store, projectId]);
+}